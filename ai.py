@@ -4,10 +4,23 @@
 зробив сам без готових бібліотек машинного навчання
 """
 
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from forecast import SimpleForecaster, format_eta
+
 class SimpleAI:
-    def __init__(self, data_manager):
-        """Ініціалізація простого AI для аналізу системних даних"""
+    def __init__(self, data_manager, clock=None, probes=True):
+        """Ініціалізація простого AI для аналізу системних даних
+
+        clock — функція поточного часу (для бектесту можна підставити свою),
+        probes — чи запускати диск-тест і вимір мережі при кожній оцінці
+        """
         self.data_manager = data_manager
+        self.clock = clock or time.time
+        self.probes = probes
         self.state = {
             'high_temp_start': None,
             'high_ram_start': None,
@@ -15,34 +28,96 @@ class SimpleAI:
         }
         from tests import SimpleTests
         self.tests = SimpleTests(data_manager)
+        self.forecaster = SimpleForecaster(data_manager.get_setting('forecast_windows_hours'))
+
+        # кеш результатів за номером знімка (обмежений LRU)
+        self.cache_size = 32
+        self._health_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._inflight = {}  # seq -> Future обчислення, що вже йде
+        # різні знімки оцінюються паралельно (монітор, діагностика, вкладка AI),
+        # тож лічильники self.state і forecaster змінюються лише під цим локом
+        self._state_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
 
     def predict_system_health(self, data):
+        """Повертає оцінку здоров'я; для одного знімка — той самий об'єкт результату"""
+        key = data.get('seq')
+        if key is None:
+            # без номера знімка ключа немає: id() словника може повторитися після його звільнення
+            with self._cache_lock:
+                self.cache_misses += 1
+            return self._compute_health(data)
+        # обчислення — поза локом, щоб різні знімки оцінювались паралельно;
+        # паралельні виклики для того самого знімка чекають один Future
+        with self._cache_lock:
+            cached = self._health_cache.get(key)
+            if cached is not None:
+                self._health_cache.move_to_end(key)
+                self.cache_hits += 1
+                return cached
+            pending = self._inflight.get(key)
+            owner = pending is None
+            if owner:
+                pending = self._inflight[key] = Future()
+                self.cache_misses += 1
+            else:
+                self.cache_hits += 1
+        if not owner:
+            return pending.result()
+        try:
+            result = self._compute_health(data)
+        except BaseException as e:
+            with self._cache_lock:
+                self._inflight.pop(key, None)
+            pending.set_exception(e)
+            raise
+        with self._cache_lock:
+            self._health_cache[key] = result
+            while len(self._health_cache) > self.cache_size:
+                self._health_cache.popitem(last=False)
+            self._inflight.pop(key, None)
+        pending.set_result(result)
+        return result
+
+    def cache_stats(self):
+        """Лічильники кешу прогнозів"""
+        with self._cache_lock:
+            return {
+                'hits': self.cache_hits,
+                'misses': self.cache_misses,
+                'size': len(self._health_cache),
+                'capacity': self.cache_size
+            }
+
+    def _compute_health(self, data):
         """Прогнозує здоров'я системи з часовими лічильниками"""
-        import time
         warnings = []
-        current_time = time.time()
+        current_time = self.clock()
         
         # Температура > 85°C або CPU > 80% протягом 30 хвилин
         temperature = data.get('temperature', 45)
         if temperature is None:
             temperature = 45
         temp_high = temperature > 85 or data['cpu_percent'] > 80
-        if temp_high:
-            if self.state['high_temp_start'] is None:
-                self.state['high_temp_start'] = current_time
-            elif (current_time - self.state['high_temp_start']) > 1800:  # 30 хвилин
-                warnings.append("Охолодіть систему! Висока температура більше 30 хвилин")
-        else:
-            self.state['high_temp_start'] = None
-        
-        # RAM > 90% протягом 15 хвилин
-        if data['ram_percent'] > 90:
-            if self.state['high_ram_start'] is None:
-                self.state['high_ram_start'] = current_time
-            elif (current_time - self.state['high_ram_start']) > 900:  # 15 хвилин
-                warnings.append("Закрийте програми або перезапустіть! Пам'ять переповнена")
-        else:
-            self.state['high_ram_start'] = None
+        with self._state_lock:
+            if temp_high:
+                if self.state['high_temp_start'] is None:
+                    self.state['high_temp_start'] = current_time
+                elif (current_time - self.state['high_temp_start']) > 1800:  # 30 хвилин
+                    warnings.append("Охолодіть систему! Висока температура більше 30 хвилин")
+            else:
+                self.state['high_temp_start'] = None
+
+            # RAM > 90% протягом 15 хвилин
+            if data['ram_percent'] > 90:
+                if self.state['high_ram_start'] is None:
+                    self.state['high_ram_start'] = current_time
+                elif (current_time - self.state['high_ram_start']) > 900:  # 15 хвилин
+                    warnings.append("Закрийте програми або перезапустіть! Пам'ять переповнена")
+            else:
+                self.state['high_ram_start'] = None
         
         # Диск > 90%
         if data['disk_percent'] > 90:
@@ -109,16 +184,39 @@ class SimpleAI:
         health_score -= cpu_penalty + ram_penalty + disk_penalty + temp_penalty
         health_score = max(15, min(100, int(health_score)))  # мінімум 15%, максимум 100%
         # Диск-тест
+        disk_result = None
+        net = None
+        if self.probes:
+            disk_result, net = self._run_probes(warnings)
+            disk_result = disk_result or {}
+            disk_score = disk_result.get('disk_score', disk_result.get('score'))
+            if disk_score is not None and disk_score < 75:
+                health_score -= (75 - disk_score) * 0.2
+        # Прогнозування майбутніх проблем на основі історії
+        predictions = self._predict_future_issues(data)
+        
+        return {
+            'warnings': warnings,
+            'health_score': health_score,
+            'predictions': predictions,
+            'disk_test': disk_result,
+            'network': net,
+            'seq': data.get('seq')
+        }
+
+    def _run_probes(self, warnings):
+        """Диск-тест і вимір мережі (повільні, тому їх можна вимкнути)"""
+        disk_result = None
         try:
             disk_result = self.tests.run_disk_test()
             disk_score = disk_result.get('disk_score', disk_result.get('score'))
             if disk_score is not None and disk_score < 75:
                 warnings.append(f"Низька швидкість диска: {disk_score}% – рекомендовано дефрагментацію (defrag C:)")
-                health_score -= (75 - disk_score) * 0.2
         except Exception:
             pass
         
         # Мережеві метрики
+        net = None
         try:
             from monitor import get_network_data
             net = get_network_data(interval=0.5)
@@ -127,14 +225,7 @@ class SimpleAI:
                 warnings.append(f"Низька швидкість мережі: {recv} МБ/с")
         except Exception:
             pass
-        # Прогнозування майбутніх проблем на основі історії
-        predictions = self._predict_future_issues(data)
-        
-        return {
-            'warnings': warnings,
-            'health_score': health_score,
-            'predictions': predictions
-        }
+        return disk_result, net
     
     def _predict_future_issues(self, current_data):
         """Прогнозування майбутніх проблем на основі поточних тенденцій"""
@@ -167,6 +258,24 @@ class SimpleAI:
                     predictions.append("🌡️ Температура підвищена останні дні - перевірте охолодження")
         except:
             pass
+
+        # Прогноз вичерпання диска та пам'яті за трендом
+        try:
+            history = self.data_manager.get_historical_data(days=3)
+            with self._state_lock:
+                self.forecaster.update(history)
+                estimates = self.forecaster.forecast()
+            labels = {
+                'disk_free': "💾 Вільне місце на диску закінчиться",
+                'ram_available': "🧠 Доступна пам'ять закінчиться"
+            }
+            for key, estimate in estimates.items():
+                predictions.append(
+                    f"{labels.get(key, key)} приблизно через {format_eta(estimate['eta'])} "
+                    f"(95%: {format_eta(estimate['low'])} – {format_eta(estimate['high'])})"
+                )
+        except Exception as e:
+            print(f"Помилка прогнозу ресурсів: {e}")
         
         # Базові прогнози на основі поточного стану
         current_cpu = current_data['cpu_percent']
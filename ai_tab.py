@@ -1,8 +1,9 @@
+import time
 import tkinter as tk
 from tkinter import ttk
-from monitor import get_system_data, get_network_data
-from tests import SimpleTests
-import matplotlib.pyplot as plt
+
+from forecast import format_eta, parse_timestamp
+from visibility import COST_HIGH
 
 # Кольори (як у твоєму gui.py)
 DARK_BG    = "#181D23"
@@ -25,12 +26,29 @@ except ImportError:
             self.fg = fg
         def set_progress(self, v, animate=True): pass
 
+
+def history_span(records):
+    """Скільки секунд охоплює історія (від першого до останнього запису)"""
+    if len(records) < 2:
+        return 0.0
+    first = parse_timestamp(records[0].get('timestamp'))
+    last = parse_timestamp(records[-1].get('timestamp'))
+    return max(0.0, last - first) if first and last else 0.0
+
+
+# діапазони вікна тренду: (підпис, секунди)
+TREND_RANGES = [("10 хв", 600), ("1 год", 3600), ("24 год", 86400), ("7 днів", 7 * 86400)]
+
+
 class AITab:
-    def __init__(self, parent, app_ref):
+    def __init__(self, parent, app_ref, tasks=None, visibility=None):
         self.frame = tk.Frame(parent, bg=DARK_BG)
         self.app_ref = app_ref
+        self.tasks = tasks
+        self.visibility = visibility
         self.auto_refresh_enabled = tk.BooleanVar(value=True)
         self.last_score = 0
+        self._trend_window = None
         self._init_ui()
         self._auto_refresh()
         
@@ -81,9 +99,17 @@ class AITab:
         self.auto_checkbox.pack()
 
     def _auto_refresh(self):
+        if self.visibility is not None:
+            # аналіз запускає тест диска і мережеву пробу — лише поки вкладку видно
+            self.visibility.register('ai', self.frame, COST_HIGH)
+            self.visibility.every('ai', 10000, self._auto_refresh_tick)
+            return
+        self._auto_refresh_tick()
+        self.frame.after(10000, self._auto_refresh)
+
+    def _auto_refresh_tick(self):
         if self.auto_refresh_enabled.get():
             self.update_ai_analysis()
-        self.frame.after(10000, self._auto_refresh)
 
     def _draw_status_circle(self, score):
         color = GREEN if score >= 70 else YELLOW if score >= 45 else RED
@@ -91,70 +117,91 @@ class AITab:
         self.status_canvas.create_oval(4, 4, 28, 28, fill=color, outline="")
 
     def _show_trend(self):
-        # 1) Перевірки наявності даних
+        """Вікно живого тренду: один графік на весь час життя вікна, нові знімки дописуються"""
         if not self.app_ref or not hasattr(self.app_ref, "data_manager"):
             return
-        history = self.app_ref.data_manager.get_historical_data(days=7)
-        if not history:
+        if self._trend_window is not None:
+            self._trend_window.deiconify()
+            self._trend_window.lift()
             return
 
-        # 2) Імпорти
-        import matplotlib.pyplot as plt
-        from datetime import datetime
-
-        # 3) Підготовка даних
-        # Конвертуємо ISO-рядок у datetime, щоб на осі Х було видно годину та хвилину
-        times = [
-            datetime.fromisoformat(h["timestamp"])
-            for h in history[-30:]
-        ]
-        cpu   = [h.get("cpu_percent", 0)  for h in history[-30:]]
-        ram   = [h.get("ram_percent", 0)  for h in history[-30:]]
-        disk  = [h.get("disk_percent", 0) for h in history[-30:]]
-        ai_sc = [100 - ((c + r) / 2)        for c, r in zip(cpu, ram)]
-
-        # 4) Створюємо фігуру і вісь ПЕРЕД будь-яким викликом ax.plot
-        fig, ax = plt.subplots(figsize=(8, 4), facecolor=DARK_BG)
-        ax.set_facecolor(CARD_BG)
-
-        # 5) Малюємо лінії
-        ax.plot_date(times, cpu,   '-', label="CPU (%)", lw=2)
-        ax.plot_date(times, ram,   '-', label="RAM (%)", lw=2)
-        ax.plot_date(times, disk,  '-', label="Disk (%)", lw=2)
-        ax.plot_date(times, ai_sc, '-', label="AI Health Score", lw=2)
-
-        # 6) Оформлення
-        ax.set_title("AI Тренд (CPU, RAM, Disk, AI Score)", color=ACCENT)
-        ax.legend()
-        fig.autofmt_xdate()          # повертаємо підписи дат під кутом
-        fig.tight_layout()
-
-        # 7) Показуємо графік
-        plt.show()
+        from live_chart import LiveChart
+
+        window = tk.Toplevel(self.frame, bg=DARK_BG)
+        window.title("AI Тренд (CPU, RAM, Disk, AI Score)")
+        chart = LiveChart(window, title="AI Тренд (CPU, RAM, Disk, AI Score)")
+
+        def show_range(seconds):
+            # довгі діапазони проріджуються до ширини графіка, повторний вибір береться з кешу
+            chart.load(self.app_ref.data_manager.get_historical_data(days=7), seconds, now=time.time())
+            chart.redraw()
+
+        # історія обмежена за кількістю записів: діапазони, які вона не заповнює,
+        # показали б ті самі кілька хвилин — такі кнопки вимкнені, а реальний охват підписаний
+        span = history_span(self.app_ref.data_manager.get_historical_data(days=7))
+        ranges = tk.Frame(window, bg=DARK_BG)
+        ranges.pack(fill="x", padx=8, pady=(6, 0))
+        for i, (text, seconds) in enumerate(TREND_RANGES):
+            covered = i == 0 or TREND_RANGES[i - 1][1] < span
+            tk.Button(ranges, text=text, font=("Segoe UI", 9), bg=SHADOW, fg=ACCENT,
+                      relief="flat", bd=0, padx=10, cursor="hand2" if covered else "arrow",
+                      state="normal" if covered else "disabled",
+                      command=lambda s=seconds: show_range(s)).pack(side="left", padx=3)
+        tk.Label(ranges, text=f"в історії: {format_eta(span)}" if span else "історія порожня",
+                 font=("Segoe UI", 9), bg=DARK_BG, fg=TEXT_FADED).pack(side="right", padx=6)
+        chart.widget.pack(fill="both", expand=True)
+        chart.load(self.app_ref.data_manager.get_historical_data(days=7), now=time.time())
+
+        def on_snapshot(data):
+            if chart.append(data.get('timestamp') or time.time(), data):
+                chart.redraw()
+
+        def on_close():
+            if hasattr(self.app_ref, "remove_snapshot_listener"):
+                self.app_ref.remove_snapshot_listener(on_snapshot)
+            chart.close()
+            window.destroy()
+            self._trend_window = None
+
+        if hasattr(self.app_ref, "add_snapshot_listener"):
+            self.app_ref.add_snapshot_listener(on_snapshot)
+        window.protocol("WM_DELETE_WINDOW", on_close)
+        self._trend_window = window
+        chart.redraw()
+
+    def show_cached(self, health):
+        """Оцінка з кешу теплого старту до першого живого аналізу"""
+        score = int(max(0, min(100, health['health_score'])))
+        self.health_bar.set_progress(score, animate=False)
+        self._draw_status_circle(score)
+        self.health_label.config(text=f"🧠 AI Health Score: {score}% (останнє відоме)")
+        self.predictions_text.config(state="normal")
+        self.predictions_text.delete(1.0, tk.END)
+        for warning in health.get('warnings', []):
+            self.predictions_text.insert(tk.END, f"⚠ {warning}\n", "warn")
+        for prediction in health.get('predictions', []):
+            self.predictions_text.insert(tk.END, f"• {prediction}\n", "pred")
+        self.predictions_text.config(state="disabled")
 
     def update_ai_analysis(self):
-        # Отримай дані (останній зібраний зріз)
-        if not self.app_ref or not hasattr(self.app_ref, "data_manager"):
+        if not self.app_ref or not hasattr(self.app_ref, "ai_engine"):
             return
-        data = self.app_ref.data_manager.get_current_metrics()
-        #
+        if self.tasks:
+            self.tasks.submit(self._collect_analysis, key="ai_analysis", on_done=self._apply_analysis)
+        else:
+            self._apply_analysis(self._collect_analysis())
+
+    def _collect_analysis(self):
+        # Беремо спільний знімок і спільний (кешований) прогноз з AI-рушія (у фоновому потоці)
+        data = self.app_ref.get_snapshot()
+        return data, self.app_ref.ai_engine.predict_system_health(data)
+
+    def _apply_analysis(self, result):
+        data, health = result
         cpu, ram, disk = data.get("cpu_percent", 0), \
                  data.get("ram_percent",   0), \
                  data.get("disk_percent",  0)
-
-        # призначаємо ваги
-        w_cpu, w_ram, w_disk = 0.4, 0.4, 0.2
-
-        # інверсія навантаження
-        usable_cpu  = 100 - cpu
-        usable_ram  = 100 - ram
-        usable_disk = 100 - disk
-
-        # обчислення середньозваженого балу
-        score_float = (usable_cpu * w_cpu +
-                    usable_ram * w_ram +
-                    usable_disk * w_disk)
-        score = int(max(0, min(100, score_float)))
+        score = int(max(0, min(100, health['health_score'])))
 
         self._animate_score(score)
         self._draw_status_circle(score)
@@ -174,36 +221,19 @@ class AITab:
         # Деталізація
         self.predictions_text.config(state="normal")
         self.predictions_text.delete(1.0, tk.END)
-        self.predictions_text.insert(tk.END, f"CPU: {cpu}%\nRAM: {ram}%\nDisk: {disk}%\n", "bold")
-        # Додати результати швидкого тесту диску
-        try:
-            disk_score = SimpleTests(self.app_ref.data_manager).run_disk_test().get("disk_score", 0)
-            self.predictions_text.insert(tk.END, f"💽 Disk Speed Test: {disk_score}%\n", "pred")
-        except Exception:
-            pass
+        self.predictions_text.insert(tk.END, f"CPU: {cpu:.0f}%\nRAM: {ram:.0f}%\nDisk: {disk:.0f}%\n", "bold")
+        # Результати швидкого тесту диску (вже виконаного AI-рушієм для цього знімка)
+        disk_test = health.get("disk_test") or {}
+        if disk_test.get("disk_score") is not None:
+            self.predictions_text.insert(tk.END, f"💽 Disk Speed Test: {disk_test['disk_score']}%\n", "pred")
         # Мережа
-        try:
-            net = get_network_data(interval=1)
+        net = health.get("network")
+        if net:
             recv, sent = net.get("net_recv_mb_s", 0), net.get("net_sent_mb_s", 0)
             self.predictions_text.insert(tk.END, f"📡 Мережа: ↓ {recv*8:.1f} Мбіт/с | ↑ {sent*8:.1f} Мбіт/с\n", "pred")
-        except Exception:
-            pass
         self.predictions_text.config(state="disabled")
 
     def _animate_score(self, target):
-        # Плавно анімуй до target
-        step = 2 if abs(self.last_score - target) > 10 else 1
-        if self.last_score < target:
-            self.last_score += step
-            if self.last_score > target:
-                self.last_score = target
-            self.health_bar.set_progress(self.last_score)
-            self.frame.after(15, lambda: self._animate_score(target))
-        elif self.last_score > target:
-            self.last_score -= step
-            if self.last_score < target:
-                self.last_score = target
-            self.health_bar.set_progress(self.last_score)
-            self.frame.after(15, lambda: self._animate_score(target))
-        else:
-            self.health_bar.set_progress(target)
+        # Анімацію смужки веде спільний планувальник кадрів
+        self.last_score = target
+        self.health_bar.set_progress(target)
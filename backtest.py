@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+"""
+Бектест AI-рушія без запуску GUI
+Прокручує записану або згенеровану історію через SimpleAI з підставним годинником
+"""
+
+import json
+import math
+import random
+import sys
+import time
+
+from ai import SimpleAI
+from forecast import parse_timestamp
+
+# як сповіщення AI відносяться до типів інцидентів (за ключовими словами)
+WARNING_KINDS = [
+    ("охолодіть", "cpu"),
+    ("процесор", "cpu"),
+    ("пам'ять", "ram"),
+    ("пам'яті", "ram"),
+    ("диск", "disk"),
+    ("перезапустіть для стабільності", "uptime"),
+]
+
+# скільки секунд після кінця інциденту сповіщення ще вважається влучним
+DETECT_GRACE = 300
+
+
+def classify_warning(text):
+    """Визначає тип проблеми за текстом попередження"""
+    lower = text.lower()
+    for word, kind in WARNING_KINDS:
+        if word in lower:
+            return kind
+    return "other"
+
+
+class ManualClock:
+    """Годинник, яким керує бектест"""
+
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+    def set(self, value):
+        self.now = value
+
+
+class ReplayDataManager:
+    """Мінімальна заміна JsonDataManager у пам'яті (без запису на диск)"""
+
+    def __init__(self, history_limit=100, settings=None):
+        self.history_limit = history_limit
+        self.settings = settings or {}
+        self.history = []
+
+    def save_system_data(self, data):
+        self.history.append({
+            'timestamp': data.get('timestamp'),
+            'cpu_percent': data.get('cpu_percent', 0),
+            'ram_percent': data.get('ram_percent', 0),
+            'disk_percent': data.get('disk_percent', 0),
+            'disk_free': data.get('disk_free'),
+            'ram_available': data.get('ram_available'),
+        })
+        if len(self.history) > self.history_limit * 2:
+            del self.history[:-self.history_limit]
+        return True
+
+    def get_historical_data(self, days=7, hours=None):
+        return self.history[-self.history_limit:]
+
+    def get_setting(self, key, default_value=None):
+        return self.settings.get(key, default_value)
+
+
+def load_history(path="techcare_data.json"):
+    """Завантажує записану історію з файлу даних TechCare"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    samples = []
+    for record in data.get('system_history', []):
+        t = parse_timestamp(record.get('timestamp'))
+        if t is None:
+            continue
+        sample = dict(record)
+        sample['timestamp'] = t
+        samples.append(sample)
+    return samples
+
+
+def synthetic_history(hours=24, step=2, seed=1, incidents=None):
+    """Генерує історію з шумом і розміченими інцидентами
+
+    Повертає (samples, incidents), де incident — {'kind', 'start', 'end'}
+    """
+    rng = random.Random(seed)
+    start = 1_700_000_000.0
+    total = int(hours * 3600 / step)
+    if incidents is None:
+        incidents = []
+        # кожні ~6 годин одна проблема
+        for i in range(max(1, int(hours // 6))):
+            kind = ("cpu", "ram", "disk")[i % 3]
+            begin = start + (i * 6 + rng.uniform(1, 4)) * 3600
+            length = {"cpu": 45, "ram": 25, "disk": 60}[kind] * 60
+            incidents.append({'kind': kind, 'start': begin, 'end': begin + length})
+
+    disk_total = 500 * 1024 ** 3
+    ram_total = 16 * 1024 ** 3
+    samples = []
+    for i in range(total):
+        t = start + i * step
+        cpu = min(100, max(0, rng.gauss(25, 8) + (30 if rng.random() < 0.02 else 0)))
+        ram = min(100, max(0, rng.gauss(55, 4)))
+        disk = 60 + rng.gauss(0, 0.05)
+        for inc in incidents:
+            if inc['start'] <= t <= inc['end']:
+                if inc['kind'] == "cpu":
+                    cpu = min(100, rng.gauss(94, 2))
+                elif inc['kind'] == "ram":
+                    ram = min(100, rng.gauss(95, 1))
+                elif inc['kind'] == "disk":
+                    disk = 92 + rng.gauss(0, 0.2)
+        samples.append({
+            'timestamp': t,
+            'cpu_percent': cpu,
+            'ram_percent': ram,
+            'disk_percent': disk,
+            'disk_free': disk_total * (100 - disk) / 100,
+            'ram_available': ram_total * (100 - ram) / 100,
+            'uptime_hours': (t - start) / 3600 % 20,
+        })
+    return samples, incidents
+
+
+def run_backtest(samples, incidents=None, settings=None, history_limit=100):
+    """Проганяє історію через SimpleAI і рахує якість правил"""
+    incidents = incidents or []
+    clock = ManualClock()
+    dm = ReplayDataManager(history_limit, settings)
+    ai = SimpleAI(dm, clock=clock, probes=False)
+
+    active = set()
+    alerts = []
+    counts = {}
+    wall_start = time.perf_counter()
+    for seq, sample in enumerate(samples, 1):
+        clock.set(sample['timestamp'])
+        snapshot = dict(sample, seq=seq)
+        dm.save_system_data(snapshot)
+        health = ai.predict_system_health(snapshot)
+        current = set(health['warnings'])
+        # рахуємо тільки момент появи попередження (передній фронт)
+        for warning in current - active:
+            counts[warning] = counts.get(warning, 0) + 1
+            alerts.append({'time': sample['timestamp'], 'kind': classify_warning(warning), 'text': warning})
+        active = current
+    wall = time.perf_counter() - wall_start
+
+    detections = []
+    false_positives = 0
+    for alert in alerts:
+        hit = None
+        for inc in incidents:
+            if inc['kind'] == alert['kind'] and inc['start'] <= alert['time'] <= inc['end'] + DETECT_GRACE:
+                hit = inc
+                break
+        if hit is None:
+            false_positives += 1
+        elif 'detected' not in hit:
+            hit['detected'] = alert['time']
+            detections.append(round(alert['time'] - hit['start'], 1))
+
+    simulated = samples[-1]['timestamp'] - samples[0]['timestamp'] if len(samples) > 1 else 0
+    detections.sort()
+    return {
+        'samples': len(samples),
+        'simulated_hours': round(simulated / 3600, 2),
+        'wall_seconds': round(wall, 3),
+        'samples_per_second': round(len(samples) / wall, 1) if wall > 0 else math.inf,
+        'speedup': round(simulated / wall, 1) if wall > 0 else math.inf,
+        'alerts_fired': len(alerts),
+        'alerts_by_text': counts,
+        'incidents': len(incidents),
+        'incidents_detected': len(detections),
+        'missed_incidents': len(incidents) - len(detections),
+        'time_to_detect_median_s': detections[len(detections) // 2] if detections else None,
+        'time_to_detect_max_s': detections[-1] if detections else None,
+        'false_positives': false_positives,
+        'false_positive_rate': round(false_positives / len(alerts), 3) if alerts else 0.0,
+        'false_positives_per_day': round(false_positives / (simulated / 86400), 2) if simulated else 0.0,
+        'cache': ai.cache_stats(),
+    }
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Бектест AI-рушія TechCare")
+    parser.add_argument("--history", help="файл techcare_data.json із записаною історією")
+    parser.add_argument("--hours", type=float, default=168, help="тривалість синтетичної історії")
+    parser.add_argument("--step", type=float, default=2, help="крок між зразками, с")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="вивести результат у JSON")
+    args = parser.parse_args(argv)
+
+    if args.history:
+        samples, incidents = load_history(args.history), []
+    else:
+        samples, incidents = synthetic_history(args.hours, args.step, args.seed)
+    report = run_backtest(samples, incidents)
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        for key, value in report.items():
+            if key != 'alerts_by_text':
+                print(f"{key}: {value}")
+        for text, count in sorted(report['alerts_by_text'].items(), key=lambda kv: -kv[1]):
+            print(f"  {count:6d}  {text}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
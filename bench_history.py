@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+"""
+Історія бенчмарків: відбиток середовища, базова лінія машини,
+статистична перевірка регресії і тренди за тижні
+"""
+
+import hashlib
+import math
+import os
+import platform
+from datetime import datetime
+
+from benchmark import percentile
+from version import __version__
+
+# рівень значущості для тесту Манна–Вітні
+ALPHA = 0.01
+# мінімальна відносна зміна, яку вважаємо реальною, а не шумом
+MIN_EFFECT = 0.03
+# скільки попередніх запусків беремо в базову лінію
+BASELINE_RUNS = 10
+# максимум збережених вимірів одного запуску
+MAX_SAMPLES = 50
+
+
+def _cpu_model():
+    model = platform.processor()
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return model or platform.machine()
+
+
+def _power_state():
+    try:
+        import psutil
+        battery = psutil.sensors_battery()
+    except Exception:
+        return "unknown"
+    if battery is None:
+        return "ac"
+    return "ac" if battery.power_plugged else "battery"
+
+
+def environment_fingerprint():
+    """Відбиток машини та умов запуску"""
+    try:
+        import psutil
+        physical = psutil.cpu_count(logical=False)
+    except Exception:
+        physical = None
+    fp = {
+        'node': platform.node(),
+        'cpu_model': _cpu_model(),
+        'logical_cores': os.cpu_count(),
+        'physical_cores': physical,
+        'power_state': _power_state(),
+        'os': f"{platform.system()} {platform.release()}",
+        'python': platform.python_version(),
+        'techcare_version': __version__,
+    }
+    identity = f"{fp['node']}|{fp['cpu_model']}|{fp['logical_cores']}"
+    fp['machine_id'] = hashlib.sha1(identity.encode("utf-8")).hexdigest()[:12]
+    return fp
+
+
+def mann_whitney(x, y):
+    """Двосторонній тест Манна–Вітні (нормальне наближення з поправкою на зв'язки)
+
+    Повертає (U для x, p-значення)
+    """
+    n1, n2 = len(x), len(y)
+    if n1 == 0 or n2 == 0:
+        return None, 1.0
+    combined = sorted([(v, 0) for v in x] + [(v, 1) for v in y])
+    ranks = [0.0] * len(combined)
+    tie_term = 0.0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        rank = (i + j) / 2 + 1
+        for k in range(i, j + 1):
+            ranks[k] = rank
+        t = j - i + 1
+        tie_term += t ** 3 - t
+        i = j + 1
+    r1 = sum(r for r, (_, group) in zip(ranks, combined) if group == 0)
+    u1 = r1 - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    mean = n1 * n2 / 2
+    var = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1))) if n > 1 else 0
+    if var <= 0:
+        return u1, 1.0
+    z = (abs(u1 - mean) - 0.5) / math.sqrt(var)
+    p = math.erfc(max(z, 0) / math.sqrt(2))
+    return u1, p
+
+
+def _spread(samples, limit=MAX_SAMPLES):
+    """Не більше limit вимірів, рівномірно взятих з відсортованого ряду (зберігає розподіл)"""
+    values = sorted(samples or [])
+    if len(values) <= limit:
+        return values
+    step = (len(values) - 1) / (limit - 1)
+    return [values[round(i * step)] for i in range(limit)]
+
+
+def _median(values):
+    return percentile(sorted(values), 0.5)
+
+
+class BenchmarkHistory:
+    """Зберігає запуски через JsonDataManager і порівнює з базовою лінією"""
+
+    def __init__(self, data_manager, fingerprint=None):
+        self.data_manager = data_manager
+        self.fingerprint = fingerprint or environment_fingerprint()
+
+    def record(self, metrics):
+        """metrics: {назва: {'value', 'samples', 'unit', 'higher_is_better'}}
+
+        Зберігає запуск і повертає звіт порівняння з базовою лінією
+        """
+        run = {
+            'timestamp': datetime.now().isoformat(),
+            'fingerprint': self.fingerprint,
+            'metrics': {
+                name: dict(m, samples=_spread(m.get('samples')))
+                for name, m in metrics.items()
+            },
+        }
+        comparison = self.compare(run)
+        run['regressions'] = [name for name, c in comparison.items() if c['regression']]
+        self.data_manager.save_benchmark_run(run)
+        return comparison
+
+    def baseline_runs(self, fingerprint=None):
+        """Останні запуски на цій машині в тому ж стані живлення"""
+        fp = fingerprint or self.fingerprint
+        runs = [
+            r for r in self.data_manager.get_benchmark_runs()
+            if r.get('fingerprint', {}).get('machine_id') == fp['machine_id']
+            and r.get('fingerprint', {}).get('power_state') == fp['power_state']
+        ]
+        return runs[-BASELINE_RUNS:]
+
+    def compare(self, run):
+        """Для кожної метрики: зміна медіани, p-значення і прапорець регресії"""
+        baseline = self.baseline_runs(run['fingerprint'])
+        report = {}
+        for name, metric in run['metrics'].items():
+            higher_better = metric.get('higher_is_better', False)
+            past = [r['metrics'][name] for r in baseline if name in r.get('metrics', {})]
+            entry = {'baseline_runs': len(past), 'change': None, 'p_value': None, 'regression': False}
+            report[name] = entry
+            if not past:
+                continue
+
+            base_values = [m['value'] for m in past]
+            base_median = _median(base_values)
+            if not base_median:
+                continue
+            change = (metric['value'] - base_median) / base_median
+            entry['change'] = round(change, 4)
+            worse = change < 0 if higher_better else change > 0
+
+            current_samples = metric.get('samples') or []
+            base_samples = [v for m in past for v in (m.get('samples') or [])]
+            if len(current_samples) >= 5 and len(base_samples) >= 5:
+                _, p = mann_whitney(current_samples, base_samples)
+                entry['p_value'] = round(p, 5)
+                significant = p < ALPHA
+            else:
+                # без сирих вимірів порівнюємо з розкидом попередніх запусків
+                mad = _median([abs(v - base_median) for v in base_values]) or 0
+                noise = 3 * 1.4826 * mad / abs(base_median)
+                significant = len(base_values) >= 3 and abs(change) > noise
+            entry['regression'] = bool(worse and significant and abs(change) >= MIN_EFFECT)
+        return report
+
+    def trend(self, metric, machine_id=None):
+        """[(datetime, значення)] для однієї метрики на одній машині"""
+        machine_id = machine_id or self.fingerprint['machine_id']
+        points = []
+        for run in self.data_manager.get_benchmark_runs():
+            if run.get('fingerprint', {}).get('machine_id') != machine_id:
+                continue
+            m = run.get('metrics', {}).get(metric)
+            if m:
+                points.append((datetime.fromisoformat(run['timestamp']), m['value']))
+        return points
+
+    def plot_trend(self, metrics, machine_id=None):
+        """Графік трендів метрик (matplotlib імпортується тільки тут)"""
+        import matplotlib.pyplot as plt
+        fig, ax = plt.subplots(figsize=(8, 4))
+        for metric in metrics:
+            points = self.trend(metric, machine_id)
+            if points:
+                ax.plot([p[0] for p in points], [p[1] for p in points], marker="o", label=metric)
+        ax.set_title("Історія бенчмарків")
+        ax.legend()
+        fig.autofmt_xdate()
+        fig.tight_layout()
+        return fig
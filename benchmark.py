@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+Запускач бенчмарків: прогрів, адаптивна кількість повторів,
+perf_counter_ns, вимкнений GC, медіана / p95 / MAD / викиди, JSON-результат
+"""
+
+import gc
+import json
+import math
+import platform
+import sys
+import time
+
+# z для 95% довірчого інтервалу медіани
+Z_95 = 1.96
+
+
+def percentile(sorted_values, q):
+    """Перцентиль з лінійною інтерполяцією (значення вже відсортовані)"""
+    if not sorted_values:
+        return None
+    pos = (len(sorted_values) - 1) * q
+    low = int(math.floor(pos))
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (pos - low)
+
+
+def median_ci(sorted_values, z=Z_95):
+    """Непараметричний довірчий інтервал медіани за порядковими статистиками"""
+    n = len(sorted_values)
+    half = z * math.sqrt(n) / 2
+    low = max(0, int(math.floor(n / 2 - half)))
+    high = min(n - 1, int(math.ceil(n / 2 + half)) - 1)
+    return sorted_values[low], sorted_values[high]
+
+
+def summarize(samples):
+    """Робастна статистика вибірки (у тих самих одиницях, що й samples)"""
+    values = sorted(samples)
+    n = len(values)
+    med = percentile(values, 0.5)
+    mad = percentile(sorted(abs(v - med) for v in values), 0.5)
+    # модифікований z-score (Iglewicz–Hoaglin): |0.6745 * (x - med) / MAD| > 3.5
+    if mad:
+        outliers = [v for v in values if abs(0.6745 * (v - med) / mad) > 3.5]
+    else:
+        outliers = [v for v in values if v != med]
+    ci_low, ci_high = median_ci(values)
+    return {
+        'n': n,
+        'median': med,
+        'mean': sum(values) / n,
+        'min': values[0],
+        'max': values[-1],
+        'p95': percentile(values, 0.95),
+        'mad': mad,
+        'outliers': len(outliers),
+        'ci95_low': ci_low,
+        'ci95_high': ci_high,
+        'rel_ci': (ci_high - ci_low) / (2 * med) if med else 0.0,
+    }
+
+
+def environment():
+    """Коротко про середовище, щоб результати можна було порівнювати"""
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+    }
+
+
+class BenchmarkRunner:
+    """Вимірює функцію, доки довірчий інтервал медіани не стане достатньо вузьким"""
+
+    def __init__(self, warmup=3, min_reps=7, max_reps=200, max_seconds=5.0,
+                 target_rel_ci=0.02, disable_gc=True):
+        self.warmup = warmup
+        self.min_reps = min_reps
+        self.max_reps = max_reps
+        self.max_seconds = max_seconds
+        self.target_rel_ci = target_rel_ci
+        self.disable_gc = disable_gc
+
+    def run(self, name, func, inner_loops=1):
+        """Повертає словник результату; час одного виклику func у наносекундах"""
+        for _ in range(self.warmup):
+            func()
+
+        samples = []
+        stats = None
+        converged = False
+        gc_was_enabled = gc.isenabled()
+        gc.collect()
+        deadline = time.perf_counter() + self.max_seconds
+        try:
+            if self.disable_gc:
+                gc.disable()
+            while len(samples) < self.max_reps:
+                start = time.perf_counter_ns()
+                for _ in range(inner_loops):
+                    func()
+                samples.append((time.perf_counter_ns() - start) / inner_loops)
+
+                if len(samples) >= self.min_reps:
+                    stats = summarize(samples)
+                    if stats['rel_ci'] <= self.target_rel_ci:
+                        converged = True
+                        break
+                if time.perf_counter() > deadline:
+                    break
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+        stats = summarize(samples)
+        return {
+            'name': name,
+            'unit': 'ns',
+            'converged': converged,
+            'target_rel_ci': self.target_rel_ci,
+            'warmup': self.warmup,
+            'gc_disabled': self.disable_gc,
+            'stats': stats,
+            'samples': samples,
+        }
+
+
+def to_json(results, path=None):
+    """Серіалізує результати разом з інформацією про середовище"""
+    payload = {
+        'created': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'environment': environment(),
+        'results': results,
+    }
+    text = json.dumps(payload, ensure_ascii=False, indent=2)
+    if path:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+    return text
+
+
+def main(argv=None):
+    import argparse
+    from tests import SimpleTests
+    parser = argparse.ArgumentParser(description="Бенчмарк CPU/RAM TechCare")
+    parser.add_argument("--json", metavar="FILE", help="записати результати у JSON-файл")
+    parser.add_argument("--target", type=float, default=0.02, help="відносна ширина ДІ медіани")
+    args = parser.parse_args(argv)
+
+    tests = SimpleTests(None, runner=BenchmarkRunner(target_rel_ci=args.target))
+    summary = tests.run_benchmark()
+    results = list(summary['details'].values())
+    for res in results:
+        if 'stats' not in res:
+            for kernel, bw in res.get('stream', {}).items():
+                print(f"{res['name']} {kernel}: {bw['gbs']:.2f} ГБ/с (найкраще {bw['best_gbs']:.2f})")
+            continue
+        st = res['stats']
+        print(f"{res['name']}: median {st['median'] / 1e6:.3f} ms, p95 {st['p95'] / 1e6:.3f} ms, "
+              f"MAD {st['mad'] / 1e6:.3f} ms, n={st['n']}, outliers={st['outliers']}, "
+              f"converged={res['converged']}")
+    print(f"score: cpu {summary['cpu_score']:.1f}, ram {summary['ram_score']:.1f}, "
+          f"overall {summary['overall_score']:.1f}")
+    if args.json:
+        to_json(results, args.json)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+Багатоядерний тест процесора: пул процесів на 1, 2, 4 … N воркерах,
+пропускна здатність, прискорення, ефективність і скор кожного ядра окремо
+"""
+
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from tests import cpu_workload
+
+# ядро вважається загальмованим, якщо воно повільніше за медіану на стільки
+SLOW_CORE_RATIO = 0.85
+
+
+def run_chunk(units):
+    """Одна порція роботи у процесі-воркері; повертає кількість виконаних одиниць"""
+    for _ in range(units):
+        cpu_workload()
+    return units
+
+
+def run_pinned(core, units):
+    """Виконує порцію на конкретному ядрі; повертає час у секундах або None"""
+    try:
+        if hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, {core})
+        else:
+            import psutil
+            psutil.Process().cpu_affinity([core])
+    except Exception:
+        return None
+    start = time.perf_counter()
+    run_chunk(units)
+    return time.perf_counter() - start
+
+
+def _warmup(_):
+    return None
+
+
+def worker_counts(max_workers):
+    """1, 2, 4 … і обов'язково сам max_workers"""
+    counts = []
+    n = 1
+    while n < max_workers:
+        counts.append(n)
+        n *= 2
+    counts.append(max_workers)
+    return counts
+
+
+class CpuScalingBenchmark:
+    """Вимірює масштабування CPU-навантаження за кількістю процесів"""
+
+    def __init__(self, max_workers=None, seconds_per_level=2.0, chunk_units=3, per_core=True):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.seconds_per_level = seconds_per_level
+        self.chunk_units = chunk_units
+        self.per_core = per_core
+        self._cancel = threading.Event()
+        self._thread = None
+
+    def cancel(self):
+        """Просить зупинитися якнайшвидше (між порціями)"""
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def run(self, progress=None):
+        """Синхронний запуск; progress(текст) викликається з робочого потоку"""
+        self._cancel.clear()
+        report = {'max_workers': self.max_workers, 'levels': [], 'per_core': None, 'cancelled': False}
+        pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        try:
+            # прогріваємо пул, щоб запуск процесів не потрапив у вимір
+            list(pool.map(_warmup, range(self.max_workers)))
+            base = None
+            for count in worker_counts(self.max_workers):
+                if self.cancelled:
+                    break
+                if progress:
+                    progress(f"{count} воркер(и)…")
+                throughput = self._measure_level(pool, count)
+                if throughput is None:
+                    break
+                if base is None:
+                    base = throughput
+                speedup = throughput / base if base else 0
+                report['levels'].append({
+                    'workers': count,
+                    'throughput': round(throughput, 2),
+                    'speedup': round(speedup, 2),
+                    'efficiency': round(speedup / count, 3),
+                })
+            if self.per_core and not self.cancelled:
+                if progress:
+                    progress("Перевірка окремих ядер…")
+                report['per_core'] = self._measure_cores(pool)
+        finally:
+            pool.shutdown(wait=not self.cancelled, cancel_futures=True)
+        report['cancelled'] = self.cancelled
+        return report
+
+    def _measure_level(self, pool, count):
+        """Тримає count порцій у польоті протягом seconds_per_level; одиниць/с"""
+        done_units = 0
+        start = time.perf_counter()
+        deadline = start + self.seconds_per_level
+        pending = {pool.submit(run_chunk, self.chunk_units) for _ in range(count)}
+        while pending:
+            finished, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                done_units += fut.result()
+                if time.perf_counter() < deadline and not self.cancelled:
+                    pending.add(pool.submit(run_chunk, self.chunk_units))
+            if self.cancelled:
+                for fut in pending:
+                    fut.cancel()
+                return None
+        return done_units / (time.perf_counter() - start)
+
+    def _measure_cores(self, pool):
+        """Почергово проганяє однакову порцію на кожному ядрі"""
+        cores = os.cpu_count() or 1
+        timings = {}
+        for core in range(cores):
+            if self.cancelled:
+                return None
+            elapsed = pool.submit(run_pinned, core, self.chunk_units).result()
+            if elapsed is None:
+                return None
+            timings[core] = elapsed
+        ordered = sorted(timings.values())
+        median = ordered[len(ordered) // 2]
+        result = []
+        for core, elapsed in timings.items():
+            score = median / elapsed if elapsed else 0
+            result.append({
+                'core': core,
+                'seconds': round(elapsed, 4),
+                'score': round(score * 100, 1),
+                'slow': score < SLOW_CORE_RATIO,
+            })
+        return result
+
+    def start(self, on_done, progress=None):
+        """Запуск у фоновому потоці; on_done(report) викликається з цього потоку,
+        тому в GUI результат треба передати через root.after"""
+        def worker():
+            try:
+                report = self.run(progress)
+            except Exception as e:
+                report = {'error': str(e), 'cancelled': self.cancelled}
+            on_done(report)
+        self._thread = threading.Thread(target=worker, daemon=True)
+        self._thread.start()
+        return self
+
+
+def main(argv=None):
+    import argparse
+    import json
+    parser = argparse.ArgumentParser(description="Багатоядерний тест CPU")
+    parser.add_argument("--workers", type=int, help="максимум воркерів (за замовчуванням усі ядра)")
+    parser.add_argument("--seconds", type=float, default=2.0, help="тривалість кожного рівня")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    bench = CpuScalingBenchmark(args.workers, args.seconds)
+    try:
+        report = bench.run(progress=lambda msg: print(msg, file=sys.stderr))
+    except KeyboardInterrupt:
+        bench.cancel()
+        return 1
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return 0
+    for level in report['levels']:
+        print(f"{level['workers']:3d} воркерів: {level['throughput']:8.2f} од/с, "
+              f"прискорення x{level['speedup']:.2f}, ефективність {level['efficiency'] * 100:.0f}%")
+    for core in report['per_core'] or []:
+        mark = "  <-- повільне" if core['slow'] else ""
+        print(f"ядро {core['core']:3d}: {core['score']:6.1f}{mark}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+"""
+Тест диска: послідовне і випадкове читання/запис з різними розмірами блоку
+і глибиною черги, читання в обхід кешу (O_DIRECT або posix_fadvise),
+IOPS, МБ/с і перцентилі затримки
+"""
+
+import mmap
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+from benchmark import percentile
+
+KB = 1024
+MB = 1024 * KB
+
+DEFAULT_FILE_SIZE = 256 * MB
+DEFAULT_BLOCKS = [4 * KB, 64 * KB, 1 * MB]
+DEFAULT_DEPTHS = [1, 4, 16]
+
+
+class DiskBenchmarkError(Exception):
+    """Тест диска не вдалося виконати"""
+
+
+class _TestFile:
+    """Відкритий тестовий файл з однаковим API для POSIX і Windows"""
+
+    def __init__(self, path, direct):
+        self.path = path
+        self.direct = False
+        flags = os.O_RDWR | getattr(os, 'O_BINARY', 0)
+        if direct and hasattr(os, 'O_DIRECT'):
+            try:
+                self.fd = os.open(path, flags | os.O_DIRECT)
+                self.direct = True
+            except OSError:
+                # tmpfs та деякі ФС не підтримують O_DIRECT
+                self.fd = os.open(path, flags)
+        else:
+            self.fd = os.open(path, flags)
+        self.positional = hasattr(os, 'pwrite')
+        self._lock = threading.Lock()
+
+    def read(self, buf, offset):
+        if self.positional and hasattr(os, 'preadv'):
+            return os.preadv(self.fd, [buf], offset)
+        if self.positional:
+            data = os.pread(self.fd, len(buf), offset)
+            buf[:len(data)] = data
+            return len(data)
+        with self._lock:
+            os.lseek(self.fd, offset, os.SEEK_SET)
+            data = os.read(self.fd, len(buf))
+        buf[:len(data)] = data
+        return len(data)
+
+    def write(self, buf, offset):
+        if self.positional:
+            return os.pwrite(self.fd, buf, offset)
+        with self._lock:
+            os.lseek(self.fd, offset, os.SEEK_SET)
+            return os.write(self.fd, buf)
+
+    def sync(self):
+        os.fsync(self.fd)
+
+    def drop_cache(self):
+        """Скидає сторінки файлу з кешу ОС; False, якщо це неможливо"""
+        if self.direct:
+            return True
+        if hasattr(os, 'posix_fadvise'):
+            os.fsync(self.fd)
+            os.posix_fadvise(self.fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            return True
+        return False
+
+    def close(self):
+        os.close(self.fd)
+
+
+class DiskBenchmark:
+    """Багатопотоковий тест диска на тимчасовому файлі"""
+
+    def __init__(self, directory=None, file_size=DEFAULT_FILE_SIZE, block_sizes=None,
+                 queue_depths=None, seconds=2.0, direct=True):
+        self.directory = directory
+        self.file_size = file_size
+        self.block_sizes = block_sizes or DEFAULT_BLOCKS
+        self.queue_depths = queue_depths or DEFAULT_DEPTHS
+        self.seconds = seconds
+        self.direct = direct
+        self.cache_bypassed = False
+
+    def _create_file(self, block=1 * MB):
+        """Створює файл потрібного розміру; повертає результат послідовного запису"""
+        handle, path = tempfile.mkstemp(prefix="techcare_disk_", dir=self.directory)
+        os.close(handle)
+        test_file = None
+        try:
+            test_file = _TestFile(path, self.direct)
+            block = min(block, self.file_size)
+            buf = mmap.mmap(-1, block)  # вирівняний за сторінкою буфер (потрібно для O_DIRECT)
+            try:
+                buf.write(os.urandom(block))  # випадкові дані, щоб SSD не стискав їх
+                latencies = []
+                start = time.perf_counter()
+                for offset in range(0, self.file_size, block):
+                    t = time.perf_counter_ns()
+                    written = test_file.write(buf, offset)
+                    latencies.append(time.perf_counter_ns() - t)
+                    if written != block:
+                        raise DiskBenchmarkError(f"короткий запис: {written} з {block} байт")
+                test_file.sync()
+                elapsed = time.perf_counter() - start
+            finally:
+                buf.close()
+            self.cache_bypassed = test_file.drop_cache()
+        except BaseException:
+            # ENOSPC/EIO посеред запису: не лишати дескриптор і недописаний файл
+            if test_file is not None:
+                test_file.close()
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+            raise
+        return test_file, self._result('seq', 'write', block, 1, len(latencies), block, elapsed, latencies)
+
+    @staticmethod
+    def _result(mode, op, block, depth, ops, nbytes, elapsed, latencies):
+        latencies.sort()
+        to_us = lambda v: round(v / 1000, 1) if v is not None else None
+        return {
+            'mode': mode,
+            'op': op,
+            'block_kb': block // KB,
+            'queue_depth': depth,
+            'ops': ops,
+            'seconds': round(elapsed, 3),
+            'iops': round(ops / elapsed, 1) if elapsed > 0 else 0.0,
+            'mbs': round(ops * nbytes / MB / elapsed, 2) if elapsed > 0 else 0.0,
+            'lat_us': {
+                'p50': to_us(percentile(latencies, 0.50)),
+                'p95': to_us(percentile(latencies, 0.95)),
+                'p99': to_us(percentile(latencies, 0.99)),
+                'max': to_us(latencies[-1] if latencies else None),
+            },
+        }
+
+    def _run_io(self, test_file, mode, op, block, depth):
+        """depth потоків одночасно видають запити; кожен має власний буфер"""
+        blocks = self.file_size // block
+        if blocks < 1:
+            raise DiskBenchmarkError("файл менший за блок")
+        stripe = max(1, blocks // depth)
+        deadline = time.perf_counter() + self.seconds
+        # без обходу кешу читаємо кожен блок не більше одного разу
+        budget = blocks if not test_file.direct else None
+        latencies = []
+        errors = []
+        counter = [0]
+        lock = threading.Lock()
+
+        def worker(index):
+            buf = mmap.mmap(-1, block)
+            if op == 'write':
+                buf.write(os.urandom(block))
+            rng = random.Random(index)
+            local = []
+            position = index * stripe
+            try:
+                while time.perf_counter() < deadline:
+                    with lock:
+                        if budget is not None and counter[0] >= budget:
+                            break
+                        counter[0] += 1
+                    if mode == 'seq':
+                        offset = (position % blocks) * block
+                        position += 1
+                    else:
+                        offset = rng.randrange(blocks) * block
+                    t = time.perf_counter_ns()
+                    done = test_file.read(buf, offset) if op == 'read' else test_file.write(buf, offset)
+                    local.append(time.perf_counter_ns() - t)
+                    if done != block:
+                        raise DiskBenchmarkError(f"коротка операція: {done} з {block} байт")
+            except Exception as e:
+                errors.append(e)
+            finally:
+                buf.close()
+                with lock:
+                    latencies.extend(local)
+
+        if op == 'read':
+            test_file.drop_cache()
+        threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(depth)]
+        start = time.perf_counter()
+        for th in threads:
+            th.start()
+        for th in threads:
+            th.join()
+        if op == 'write':
+            test_file.sync()  # запис без fsync вимірював би кеш ОС
+        elapsed = time.perf_counter() - start
+        if errors:
+            raise DiskBenchmarkError(str(errors[0]))
+        return self._result(mode, op, block, depth, len(latencies), block, elapsed, latencies)
+
+    def run(self, progress=None, tests=None):
+        """Повний набір тестів; кидає DiskBenchmarkError при збої"""
+        tests = tests or [(m, o) for m in ('seq', 'rand') for o in ('read', 'write')]
+        try:
+            test_file, create = self._create_file()
+        except DiskBenchmarkError:
+            raise
+        except Exception as e:
+            raise DiskBenchmarkError(f"не вдалося створити тестовий файл: {e}")
+        results = [create]
+        try:
+            for mode, op in tests:
+                for block in self.block_sizes:
+                    for depth in self.queue_depths:
+                        if progress:
+                            progress(f"{mode} {op} {block // KB} КБ, QD{depth}…")
+                        results.append(self._run_io(test_file, mode, op, block, depth))
+        except DiskBenchmarkError:
+            raise
+        except Exception as e:
+            raise DiskBenchmarkError(str(e))
+        finally:
+            test_file.close()
+            try:
+                os.unlink(test_file.path)
+            except OSError:
+                pass
+        return {
+            'file_size_mb': self.file_size // MB,
+            'direct_io': test_file.direct,
+            'cache_bypassed': self.cache_bypassed,
+            'results': results,
+        }
+
+
+def quick_disk_probe(file_size=4 * MB, seconds=0.2):
+    """Швидкий замір для оцінки здоров'я: послідовний запис і послідовне читання
+    блоками по 1 МБ; кидає DiskBenchmarkError при збої. Без O_DIRECT і
+    posix_fadvise (Windows) читання йде з кешу ОС — тоді cache_bypassed=False
+    і чесним лишається тільки запис (він завершується fsync)"""
+    bench = DiskBenchmark(file_size=file_size, block_sizes=[1 * MB], queue_depths=[1], seconds=seconds)
+    report = bench.run(tests=[('seq', 'read')])
+    write, read = report['results'][0], report['results'][1]
+    return {
+        'write': write,
+        'read': read,
+        'cache_bypassed': report['cache_bypassed'],
+    }
+
+
+def main(argv=None):
+    import argparse
+    import json
+    parser = argparse.ArgumentParser(description="Тест диска TechCare")
+    parser.add_argument("--dir", help="каталог для тестового файлу (на потрібному диску)")
+    parser.add_argument("--size-mb", type=int, default=DEFAULT_FILE_SIZE // MB)
+    parser.add_argument("--blocks-kb", default="4,64,1024", help="розміри блоків через кому")
+    parser.add_argument("--depths", default="1,4,16", help="глибини черги через кому")
+    parser.add_argument("--seconds", type=float, default=2.0, help="тривалість кожного тесту")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    bench = DiskBenchmark(
+        directory=args.dir,
+        file_size=args.size_mb * MB,
+        block_sizes=[int(v) * KB for v in args.blocks_kb.split(",")],
+        queue_depths=[int(v) for v in args.depths.split(",")],
+        seconds=args.seconds,
+    )
+    try:
+        report = bench.run(progress=lambda msg: print(msg, file=sys.stderr))
+    except DiskBenchmarkError as e:
+        print(f"Помилка тесту диска: {e}", file=sys.stderr)
+        return 1
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return 0
+    print(f"файл {report['file_size_mb']} МБ, O_DIRECT: {report['direct_io']}, "
+          f"кеш обійдено: {report['cache_bypassed']}")
+    for r in report['results']:
+        lat = r['lat_us']
+        print(f"{r['mode']:4s} {r['op']:5s} {r['block_kb']:5d}КБ QD{r['queue_depth']:<3d} "
+              f"{r['iops']:10.1f} IOPS {r['mbs']:9.2f} МБ/с  p50 {lat['p50']} мкс  p99 {lat['p99']} мкс")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
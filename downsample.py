@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+"""
+Проріджування часових рядів для графіків: будь-який діапазон історії
+зводиться приблизно до ширини графіка в пікселях зі збереженням піків.
+LTTB (Largest-Triangle-Three-Buckets) або min/max у часових кошиках,
+векторизовано через numpy; кеш за діапазоном і роздільністю
+"""
+
+import math
+import sys
+import time
+from collections import OrderedDict
+
+try:
+    import numpy as np
+except ImportError:  # без numpy працюють чисто пайтонівські версії (повільніше)
+    np = None
+
+LTTB = "lttb"
+MINMAX = "minmax"
+
+
+# ---------- алгоритми ----------
+def lttb(xs, ys, threshold):
+    """Індекси threshold точок, що найкраще зберігають форму ряду (LTTB)"""
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+    if np is None:
+        return _lttb_py(xs, ys, threshold)
+
+    x = np.asarray(xs, dtype=float)
+    y = np.asarray(ys, dtype=float)
+    every = (n - 2) / (threshold - 2)
+    # межі кошиків: перша і остання точки — окремі кошики
+    edges = (np.arange(threshold - 1) * every).astype(np.int64) + 1
+    edges[-1] = n - 1
+    # середні точки кошиків через кумулятивні суми — без циклу
+    cx = np.concatenate(([0.0], np.cumsum(x)))
+    cy = np.concatenate(([0.0], np.cumsum(y)))
+    starts = np.append(edges[:-1], n - 1)
+    ends = np.append(edges[1:], n)
+    counts = ends - starts
+    avg_x = (cx[ends] - cx[starts]) / counts
+    avg_y = (cy[ends] - cy[starts]) / counts
+
+    out = np.empty(threshold, dtype=np.int64)
+    out[0] = 0
+    out[-1] = n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        bx = x[lo:hi]
+        by = y[lo:hi]
+        # подвоєна площа трикутника (вибрана точка, кандидат, середнє наступного кошика)
+        area = np.abs((x[a] - avg_x[i + 1]) * (by - y[a]) - (x[a] - bx) * (avg_y[i + 1] - y[a]))
+        a = lo + int(area.argmax())
+        out[i + 1] = a
+    return out.tolist()
+
+
+def _lttb_py(xs, ys, threshold):
+    n = len(xs)
+    every = (n - 2) / (threshold - 2)
+    out = [0]
+    a = 0
+    for i in range(threshold - 2):
+        lo = int(i * every) + 1
+        hi = int((i + 1) * every) + 1
+        nlo = hi
+        nhi = min(int((i + 2) * every) + 1, n)
+        if nlo >= nhi:
+            nlo, nhi = n - 1, n
+        avg_x = sum(xs[nlo:nhi]) / (nhi - nlo)
+        avg_y = sum(ys[nlo:nhi]) / (nhi - nlo)
+        best, best_area = lo, -1.0
+        for j in range(lo, hi):
+            area = abs((xs[a] - avg_x) * (ys[j] - ys[a]) - (xs[a] - xs[j]) * (avg_y - ys[a]))
+            if area > best_area:
+                best, best_area = j, area
+        out.append(best)
+        a = best
+    out.append(n - 1)
+    return out
+
+
+def minmax(xs, ys, buckets, start=None, end=None):
+    """Індекси мінімуму і максимуму в кожному з buckets рівних часових кошиків (xs відсортовані)"""
+    n = len(xs)
+    if n <= 2 * buckets:
+        return list(range(n))
+    start = xs[0] if start is None else start
+    end = xs[-1] if end is None else end
+    width = (end - start) / buckets or 1.0
+    if np is None:
+        return _minmax_py(xs, ys, start, width, buckets)
+
+    x = np.asarray(xs, dtype=float)
+    y = np.asarray(ys, dtype=float)
+    bucket = np.clip(((x - start) / width).astype(np.int64), 0, buckets - 1)
+    # x відсортовані, тож кошики — суцільні відрізки; reduceat обходить кожен один раз
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    counts = np.diff(np.r_[starts, n])
+    group = np.repeat(np.arange(len(starts)), counts)
+    picked = []
+    for reduce in (np.minimum, np.maximum):
+        hits = np.flatnonzero(y == np.repeat(reduce.reduceat(y, starts), counts))
+        # перше входження екстремуму в кожній групі
+        picked.append(hits[np.r_[True, group[hits][1:] != group[hits][:-1]]])
+    return np.unique(np.concatenate(picked)).tolist()
+
+
+def _minmax_py(xs, ys, start, width, buckets):
+    best = {}
+    for i, (x, y) in enumerate(zip(xs, ys)):
+        b = min(buckets - 1, max(0, int((x - start) / width)))
+        lo, hi = best.get(b, (i, i))
+        if y < ys[lo]:
+            lo = i
+        if y > ys[hi]:
+            hi = i
+        best[b] = (lo, hi)
+    return sorted({i for pair in best.values() for i in pair})
+
+
+def decimate(xs, ys, target, method=LTTB, start=None, end=None):
+    """Проріджені (xs, ys) приблизно з target точок; NaN/None відкидаються"""
+    if np is not None:
+        x = np.asarray(xs, dtype=float)
+        y = np.array(ys, dtype=float)  # None -> nan
+        keep = ~np.isnan(y)
+        x, y = x[keep], y[keep]
+        if method == MINMAX:
+            idx = minmax(x, y, max(1, target // 2), start, end)
+        else:
+            idx = lttb(x, y, target)
+        return x[idx].tolist(), y[idx].tolist()
+
+    points = [(x, y) for x, y in zip(xs, ys) if y is not None and not math.isnan(y)]
+    if not points:
+        return [], []
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    if method == MINMAX:
+        # дві точки на кошик, тож кошиків удвічі менше за ціль
+        idx = minmax(xs, ys, max(1, target // 2), start, end)
+    else:
+        idx = lttb(xs, ys, target)
+    return [xs[i] for i in idx], [ys[i] for i in idx]
+
+
+# ---------- кеш ----------
+class DownsampleCache:
+    """Проріджені ряди за ключем (ряд, діапазон, роздільність, метод)
+
+    Межі діапазону вирівнюються на ширину кошика, тож поки не закрився
+    наступний кошик, той самий запит (панорамування назад, повторне
+    відкриття вікна) повертає готовий результат. Незакритий хвіст
+    (менше одного кошика) додається сирим. Історія вважається лише
+    доповнюваною: закриті кошики не змінюються
+    """
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, name, records, start, end, width, value=None, method=LTTB):
+        """(xs, ys) ряду name з records (з полем timestamp) у [start, end] для width пікселів"""
+        from forecast import parse_timestamp
+
+        width = max(3, int(width))
+        step = (end - start) / width or 1.0
+        closed_end = math.floor(end / step) * step
+        aligned_start = math.floor(start / step) * step
+        key = (name, round(aligned_start, 6), round(closed_end, 6), width, method)
+
+        getter = value or (lambda r: r.get(name))
+        cached = self._entries.get(key)
+        tail_x, tail_y = [], []
+        if cached is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            for record in reversed(records):
+                ts = parse_timestamp(record.get('timestamp'))
+                if ts is None or ts < closed_end:
+                    break
+                if ts <= end:
+                    tail_x.append(ts)
+                    tail_y.append(getter(record))
+            tail_x.reverse()
+            tail_y.reverse()
+            return cached[0] + tail_x, cached[1] + tail_y
+
+        self.misses += 1
+        xs, ys = [], []
+        for record in records:
+            ts = parse_timestamp(record.get('timestamp'))
+            if ts is None or ts < start or ts > end:
+                continue
+            if ts >= closed_end:
+                tail_x.append(ts)
+                tail_y.append(getter(record))
+            else:
+                xs.append(ts)
+                ys.append(getter(record))
+        result = decimate(xs, ys, width, method, aligned_start, closed_end)
+        self._entries[key] = result
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return result[0] + tail_x, result[1] + tail_y
+
+    def clear(self):
+        self._entries.clear()
+
+
+DOWNSAMPLE_CACHE = DownsampleCache()
+
+
+# ---------- бенчмарк ----------
+def run_benchmark(points=1_000_000, width=800, interval=2.0):
+    """Час проріджування для points точок (синтетичний ряд з рідкими піками)"""
+    import random
+    rng = random.Random(1)
+    start_ts = 1_700_000_000.0
+    xs = [start_ts + i * interval for i in range(points)]
+    ys = [30 + 20 * math.sin(i / 500) + rng.uniform(-3, 3) for i in range(points)]
+    for i in range(0, points, max(1, points // 20)):
+        ys[i] = 100.0  # поодинокі піки мають пережити проріджування
+    spikes = {x for x, y in zip(xs, ys) if y == 100.0}
+
+    results = {'points': points, 'width': width, 'numpy': np is not None}
+    for method in (LTTB, MINMAX):
+        t0 = time.perf_counter()
+        dx, dy = decimate(xs, ys, width, method)
+        elapsed = time.perf_counter() - t0
+        results[method] = {
+            'ms': round(elapsed * 1000, 1),
+            'out_points': len(dx),
+            'spikes_kept': f"{sum(1 for x in dx if x in spikes)}/{len(spikes)}",
+        }
+
+    records = [{'timestamp': x, 'cpu_percent': y} for x, y in zip(xs, ys)]
+    cache = DownsampleCache()
+    end = xs[-1]
+    t0 = time.perf_counter()
+    cache.get('cpu_percent', records, xs[0], end, width)
+    cold = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    cache.get('cpu_percent', records, xs[0], end, width)
+    warm = time.perf_counter() - t0
+    results['cache'] = {'cold_ms': round(cold * 1000, 1), 'warm_ms': round(warm * 1000, 3)}
+    return results
+
+
+def main(argv=None):
+    import argparse
+    import json
+    parser = argparse.ArgumentParser(description="Бенчмарк проріджування рядів для графіків")
+    parser.add_argument("--points", type=int, default=1_000_000, help="кількість точок у ряді")
+    parser.add_argument("--width", type=int, default=800, help="ширина графіка, пікселі")
+    args = parser.parse_args(argv)
+    print(json.dumps(run_benchmark(args.points, args.width), ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
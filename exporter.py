@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+Експорт метрик у форматі OpenMetrics (Prometheus) через локальний HTTP.
+Текст відповіді формується один раз на такт збору, тож запит коштує
+лише відправку готових байтів
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from self_monitor import COUNTERS
+from tracing import TRACER
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 9464
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# (ключ знімка, назва метрики, опис, множник)
+SNAPSHOT_GAUGES = [
+    ('cpu_percent', 'techcare_cpu_usage_percent', 'Завантаження CPU', 1),
+    ('ram_percent', 'techcare_memory_usage_percent', 'Використання RAM', 1),
+    ('ram_total', 'techcare_memory_total_bytes', 'Обсяг RAM', 1),
+    ('ram_available', 'techcare_memory_available_bytes', 'Доступна RAM', 1),
+    ('disk_percent', 'techcare_disk_usage_percent', 'Заповненість диска', 1),
+    ('disk_total', 'techcare_disk_total_bytes', 'Обсяг диска', 1),
+    ('disk_free', 'techcare_disk_free_bytes', 'Вільне місце на диску', 1),
+    ('uptime_hours', 'techcare_system_uptime_seconds', 'Час роботи системи', 3600),
+    ('process_count', 'techcare_processes', 'Кількість процесів', 1),
+]
+
+SELF_GAUGES = [
+    ('cpu_percent', 'techcare_self_cpu_percent', 'CPU, який споживає TechCare (% ядра)', 1),
+    ('rss_mb', 'techcare_self_resident_memory_bytes', 'RSS процесу TechCare', 1024 ** 2),
+    ('threads', 'techcare_self_threads', 'Потоки TechCare', 1),
+    ('handles', 'techcare_self_open_handles', 'Відкриті дескриптори TechCare', 1),
+]
+
+SPAN_QUANTILES = [('0.5', 'p50_ms'), ('0.9', 'p90_ms'), ('0.99', 'p99_ms')]
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _number(value):
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+def render(snapshot, health=None, spans=None, counters=None):
+    """Повний текст OpenMetrics для одного знімка"""
+    lines = []
+
+    def gauge(name, help_text, value, labels=""):
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"{name}{labels} {_number(value)}")
+
+    for key, name, help_text, scale in SNAPSHOT_GAUGES:
+        value = snapshot.get(key)
+        if isinstance(value, (int, float)):
+            gauge(name, help_text, value * scale if scale != 1 else value)
+    if snapshot.get('timestamp'):
+        gauge('techcare_snapshot_timestamp_seconds', 'Час останнього знімка', snapshot['timestamp'])
+
+    if health and health.get('health_score') is not None:
+        gauge('techcare_health_score', 'Індекс здоров\'я системи (0-100)', health['health_score'])
+        gauge('techcare_health_warnings', 'Кількість активних попереджень', len(health.get('warnings', [])))
+
+    own = snapshot.get('techcare') or {}
+    for key, name, help_text, scale in SELF_GAUGES:
+        value = own.get(key)
+        if isinstance(value, (int, float)):
+            gauge(name, help_text, int(value * scale) if scale != 1 else value)
+
+    if counters:
+        for key in sorted(counters):
+            name = f"techcare_{key}"
+            lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name}_total {_number(counters[key])}")
+
+    if spans:
+        name = 'techcare_span_duration_seconds'
+        lines.append(f"# TYPE {name} summary")
+        lines.append(f"# HELP {name} Тривалість операцій збору та аналізу")
+        for label in sorted(spans):
+            summary = spans[label]
+            label_value = _escape(label)
+            for quantile, key in SPAN_QUANTILES:
+                if summary.get(key) is not None:
+                    lines.append(f'{name}{{source="{label_value}",quantile="{quantile}"}} '
+                                 f'{_number(summary[key] / 1000)}')
+            lines.append(f'{name}_count{{source="{label_value}"}} {summary["count"]}')
+            if summary.get('mean_ms') is not None:
+                total = summary['mean_ms'] * summary['count'] / 1000
+                lines.append(f'{name}_sum{{source="{label_value}"}} {_number(total)}')
+
+    lines.append("# EOF")
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+class MetricsExporter:
+    """HTTP-ендпоінт /metrics у власному потоці"""
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, tracer=None, counters=None):
+        self.host = host
+        self.port = port
+        self.tracer = tracer or TRACER
+        self.counters = counters or COUNTERS
+        self.scrapes = 0
+        self._payload = b"# EOF\n"
+        self._server = None
+        self._thread = None
+
+    def update(self, snapshot, health=None):
+        """Перерендерює відповідь (викликається раз на такт збору)"""
+        payload = render(snapshot, health, self.tracer.stats(), self.counters.snapshot())
+        self._payload = payload  # заміна посилання атомарна, блокування не потрібне
+        return len(payload)
+
+    def start(self):
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = exporter._payload
+                exporter.scrapes += 1
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # без запису кожного запиту в консоль
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-exporter", daemon=True)
+        self._thread.start()
+        return self.port
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+Прогноз часу до вичерпання ресурсів (вільне місце на диску, доступна RAM)
+Робастна лінійна регресія у ковзному вікні, оновлюється інкрементально
+"""
+
+import math
+from collections import deque
+from datetime import datetime
+
+# z-квантиль для 95% довірчого інтервалу
+Z_95 = 1.96
+
+# вікна регресії за замовчуванням (години)
+DEFAULT_WINDOWS = {
+    'disk_free': 24,
+    'ram_available': 3
+}
+
+
+def parse_timestamp(value):
+    """Перетворює ISO-рядок або число у unix-час"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except Exception:
+        return None
+
+
+def format_eta(seconds):
+    """Форматує кількість секунд у зручний вигляд"""
+    if seconds is None or math.isinf(seconds):
+        return "∞"
+    if seconds < 3600:
+        return f"{max(1, int(seconds // 60))} хв"
+    if seconds < 48 * 3600:
+        return f"{seconds / 3600:.1f} год"
+    return f"{seconds / 86400:.1f} дн"
+
+
+class RobustTrend:
+    """Зважена регресія y = a + b*t з Huber-вагами, точки старші за вікно видаляються"""
+
+    def __init__(self, window_seconds, huber_k=1.5, min_points=10, min_span=300):
+        self.window = window_seconds
+        self.huber_k = huber_k
+        self.min_points = min_points
+        self.min_span = min_span
+        self.points = deque()  # (x, y, w)
+        self.t0 = None
+        self._reset_sums()
+
+    def _reset_sums(self):
+        self.sw = self.sx = self.sy = 0.0
+        self.sxx = self.sxy = self.syy = 0.0
+
+    def _accumulate(self, x, y, w, sign):
+        w = w * sign
+        self.sw += w
+        self.sx += w * x
+        self.sy += w * y
+        self.sxx += w * x * x
+        self.sxy += w * x * y
+        self.syy += w * y * y
+
+    def _rebuild(self):
+        # переносимо опорну точку часу, щоб не накопичувати похибку округлення
+        shift = self.points[0][0]
+        self.t0 += shift
+        self.points = deque((x - shift, y, w) for x, y, w in self.points)
+        self._reset_sums()
+        for x, y, w in self.points:
+            self._accumulate(x, y, w, 1)
+
+    def add(self, t, y):
+        """Додає одну точку; вага залежить від залишку відносно поточної оцінки"""
+        if self.t0 is None:
+            self.t0 = t
+        x = t - self.t0
+        w = 1.0
+        fit = self.fit()
+        if fit and fit['sigma'] > 0:
+            residual = abs(y - (fit['a'] + fit['b'] * x))
+            limit = self.huber_k * fit['sigma']
+            if residual > limit:
+                w = limit / residual
+        self.points.append((x, y, w))
+        self._accumulate(x, y, w, 1)
+
+        while self.points and x - self.points[0][0] > self.window:
+            old = self.points.popleft()
+            self._accumulate(old[0], old[1], old[2], -1)
+        if self.points and self.points[0][0] > 10 * self.window:
+            self._rebuild()
+
+    def span(self):
+        if len(self.points) < 2:
+            return 0
+        return self.points[-1][0] - self.points[0][0]
+
+    def fit(self):
+        """Повертає параметри регресії або None, якщо даних замало"""
+        n = len(self.points)
+        if n < 3 or self.sw <= 0:
+            return None
+        sxx_c = self.sxx - self.sx * self.sx / self.sw
+        if sxx_c <= 1e-9:
+            return None
+        sxy_c = self.sxy - self.sx * self.sy / self.sw
+        syy_c = self.syy - self.sy * self.sy / self.sw
+        b = sxy_c / sxx_c
+        a = (self.sy - b * self.sx) / self.sw
+        rss = max(0.0, syy_c - b * sxy_c)
+        sigma2 = rss / self.sw * n / (n - 2)
+        return {
+            'a': a,
+            'b': b,
+            'sigma': math.sqrt(sigma2),
+            'se_b': math.sqrt(sigma2 / sxx_c)
+        }
+
+    def time_to_zero(self, now=None, z=Z_95):
+        """Оцінка часу (с) до y = 0 з довірчим інтервалом; None, якщо тренд не спадає"""
+        if len(self.points) < self.min_points or self.span() < self.min_span:
+            return None
+        fit = self.fit()
+        if not fit or fit['b'] >= 0:
+            return None
+        x_now = self.points[-1][0] if now is None else now - self.t0
+        level = fit['a'] + fit['b'] * x_now
+        if level <= 0:
+            return {'eta': 0.0, 'low': 0.0, 'high': 0.0, 'level': level, 'rate': fit['b']}
+
+        fast = fit['b'] - z * fit['se_b']
+        slow = fit['b'] + z * fit['se_b']
+        return {
+            'eta': level / -fit['b'],
+            'low': level / -fast,
+            'high': level / -slow if slow < 0 else math.inf,
+            'level': level,
+            'rate': fit['b']
+        }
+
+
+class SimpleForecaster:
+    """Прогнозує вичерпання диска та RAM за збереженою історією"""
+
+    def __init__(self, windows_hours=None, horizon_hours=72):
+        windows_hours = windows_hours or DEFAULT_WINDOWS
+        self.horizon = horizon_hours * 3600
+        self.trends = {
+            key: RobustTrend(hours * 3600)
+            for key, hours in windows_hours.items()
+        }
+        self.last_timestamp = None
+
+    def update(self, history):
+        """Додає тільки нові записи історії (інкрементально)"""
+        # історія впорядкована за часом, тому нові записи шукаємо з кінця
+        fresh = []
+        for record in reversed(history):
+            t = parse_timestamp(record.get('timestamp'))
+            if t is None:
+                continue
+            if self.last_timestamp is not None and t <= self.last_timestamp:
+                break
+            fresh.append((t, record))
+
+        for t, record in reversed(fresh):
+            for key, trend in self.trends.items():
+                value = record.get(key)
+                if value is not None:
+                    trend.add(t, float(value))
+            self.last_timestamp = t
+        return len(fresh)
+
+    def forecast(self, now=None):
+        """Повертає прогнози для метрик, що вичерпаються в межах горизонту"""
+        result = {}
+        for key, trend in self.trends.items():
+            estimate = trend.time_to_zero(now)
+            if estimate and estimate['eta'] <= self.horizon:
+                result[key] = estimate
+        return result
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+Єдиний планувальник кадрів анімації для Tk: усі анімовані віджети
+реєструються тут, оновлення одного кадру виконуються одним викликом after,
+а коли анімувати нічого, таймер не працює зовсім
+"""
+
+import time
+import tkinter as tk
+
+DEFAULT_FPS = 60
+_FRAME = 1.0 / DEFAULT_FPS
+
+
+class FrameScheduler:
+    """Викликає step(now) усіх активних анімацій раз на кадр"""
+
+    def __init__(self, root, fps=DEFAULT_FPS):
+        self.root = root
+        self.interval_ms = max(1, int(1000 / fps))
+        self._animations = {}   # dict як впорядкована множина
+        self._after_id = None
+        self.frames = 0
+        self.stopped = False
+
+    def register(self, animation):
+        self._animations[animation] = None
+        if self._after_id is None and not self.stopped:
+            self._after_id = self.root.after(self.interval_ms, self._tick)
+
+    def unregister(self, animation):
+        self._animations.pop(animation, None)
+
+    @property
+    def active(self):
+        return len(self._animations)
+
+    def stop(self):
+        self.stopped = True
+        self._animations.clear()
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except tk.TclError:
+                pass
+            self._after_id = None
+
+    def _tick(self):
+        self.frames += 1
+        now = time.perf_counter()
+        for animation in list(self._animations):
+            try:
+                alive = animation.step(now)
+            except tk.TclError:
+                alive = False  # віджет уже знищено
+            except Exception as e:
+                print(f"Помилка анімації: {e}")
+                alive = False
+            if not alive:
+                self._animations.pop(animation, None)
+        # анімації, зареєстровані під час кадру, підуть у наступний кадр
+        self._after_id = None
+        if self._animations and not self.stopped:
+            self._after_id = self.root.after(self.interval_ms, self._tick)
+
+
+def scheduler_for(widget):
+    """Спільний планувальник для кореневого вікна віджета"""
+    root = widget._root()
+    scheduler = getattr(root, "_techcare_frames", None)
+    if scheduler is None:
+        scheduler = FrameScheduler(root)
+        root._techcare_frames = scheduler
+    return scheduler
+
+
+def config_if_changed(widget, **options):
+    """widget.config лише для опцій, що змінилися з попереднього виклику"""
+    last = widget.__dict__.setdefault("_last_config", {})
+    changed = {key: value for key, value in options.items() if last.get(key) != value}
+    if changed:
+        widget.config(**changed)
+        last.update(changed)
+    return bool(changed)
+
+
+class Tween:
+    """Плавне наближення значення до цілі (експоненційне згладжування)
+
+    render(value) викликається лише тоді, коли змінюється quantize(value)
+    """
+
+    def __init__(self, scheduler, render, value=0.0, rate=0.2, epsilon=0.4, quantize=None):
+        self.scheduler = scheduler
+        self.render = render
+        self.value = value
+        self.target = value
+        self.rate = rate
+        self.epsilon = epsilon
+        self.quantize = quantize or (lambda v: round(v, 1))
+        self._rendered = None
+        self._last = None
+
+    def set(self, target, animate=True):
+        self.target = target
+        if not animate:
+            self.value = target
+            self._render()
+            self.scheduler.unregister(self)
+            return
+        if abs(self.target - self.value) >= self.epsilon:
+            self._last = None
+            self.scheduler.register(self)
+        else:
+            self.value = target
+            self._render()
+
+    def step(self, now):
+        dt = _FRAME if self._last is None else now - self._last
+        self._last = now
+        diff = self.target - self.value
+        if abs(diff) < self.epsilon:
+            self.value = self.target
+            self._render()
+            return False
+        # частка шляху за кадр не залежить від фактичної частоти кадрів
+        self.value += diff * (1 - (1 - self.rate) ** (dt / _FRAME))
+        self._render()
+        return True
+
+    def _render(self):
+        key = self.quantize(self.value)
+        if key != self._rendered:
+            self._rendered = key
+            self.render(self.value)
+
+
+class Ramp:
+    """Лінійна зміна від start до end за duration секунд (напр. прозорість вікна)"""
+
+    def __init__(self, scheduler, render, start, end, duration, on_done=None):
+        self.render = render
+        self.start_value = start
+        self.end = end
+        self.duration = max(duration, 1e-6)
+        self.on_done = on_done
+        self._started = time.perf_counter()
+        render(start)
+        scheduler.register(self)
+
+    def step(self, now):
+        t = min(1.0, (now - self._started) / self.duration)
+        self.render(self.start_value + (self.end - self.start_value) * t)
+        if t >= 1.0:
+            if self.on_done:
+                self.on_done()
+            return False
+        return True
@@ -3,21 +3,20 @@
 """
 TechCare 2025 — сучасний GUI у темному пастельному стилі з анімаціями
 """
-import smtplib
-from email.mime.text import MIMEText
 from datetime import datetime, timedelta
 import tkinter as tk
 from tkinter import ttk, messagebox
 import time
 import threading
 from ai_tab import AITab
-import matplotlib
-matplotlib.use("TkAgg")
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import subprocess
-from PIL import Image, ImageDraw
-import pystray
+from self_monitor import check_budget
+from profiler import profile_to_file
+from tasks import GuiTaskRunner
+from frames import Ramp, Tween, config_if_changed, scheduler_for
+from visibility import COST_MEDIUM, VisibilityManager
+from warm_cache import format_age
+from notifications import NotificationManager
+from outbox import Outbox, smtp_config
 import threading
 
 
@@ -49,7 +48,8 @@ class SmoothProgressBar(tk.Canvas):
         self.width = width
         self.height = height
         self._bar = None
-        self._animating = False
+        # анімацію веде спільний планувальник кадрів; перемальовуємо лише при зміні ширини в пікселях
+        self._tween = Tween(scheduler_for(self), self._render, rate=0.18, quantize=self._pixel_width)
         self.draw_background()
 
     def draw_background(self):
@@ -79,23 +79,14 @@ class SmoothProgressBar(tk.Canvas):
     def set_progress(self, value, animate=True):
         value = min(max(value, 0), 100)
         self._target = value
-        if animate and not self._animating:
-            self._animating = True
-            self._animate()
-        else:
-            self._progress = value
-            self._update_bar()
-
-    def _animate(self):
-        diff = self._target - self._progress
-        if abs(diff) < 0.4:
-            self._progress = self._target
-            self._animating = False
-            self._update_bar()
-            return
-        self._progress += diff * 0.18  # плавний easing
+        self._tween.set(value, animate)
+
+    def _pixel_width(self, value):
+        return int(2 + (self.width-4) * (value / 100.0))
+
+    def _render(self, value):
+        self._progress = value
         self._update_bar()
-        self.after(18, self._animate)
 
     def _update_bar(self):
         fill_width = 2 + (self.width-4) * (self._progress / 100.0)
@@ -119,6 +110,8 @@ class SmoothProgressBar(tk.Canvas):
             x1, y1
         ]
     def set_bar_color(self, color):
+        if color == self.fg:
+            return
         self.fg = color
         # Перемалювати бар з новим кольором
         self.itemconfig(self._bar, fill=self.fg)
@@ -172,22 +165,18 @@ class LoadingScreen:
         self.status.config(text=message)
         self.window.update_idletasks()
 
+    def _set_alpha(self, alpha):
+        self._alpha = alpha
+        self.window.attributes("-alpha", alpha)
+
     def _fade_in(self):
-        if self._alpha < 1.0:
-            self._alpha += 0.04
-            self.window.attributes("-alpha", self._alpha)
-            self.window.after(12, self._fade_in)
+        Ramp(scheduler_for(self.window), self._set_alpha, self._alpha, 1.0, 0.3)
 
     def close(self):
         self._fade_out()
 
     def _fade_out(self):
-        if self._alpha > 0:
-            self._alpha -= 0.07
-            self.window.attributes("-alpha", max(0, self._alpha))
-            self.window.after(12, self._fade_out)
-        else:
-            self.window.destroy()
+        Ramp(scheduler_for(self.window), self._set_alpha, self._alpha, 0.0, 0.17, on_done=self.window.destroy)
 
 class TechCareGUI:
     def __init__(self, update_callback):
@@ -199,52 +188,69 @@ class TechCareGUI:
         self.root.update_idletasks()
         self.root.update()
         self.loading_screen.update_progress(15, "Ініціалізація інтерфейсу...")
+        # уся блокуюча робота (psutil, WMI, диск, мережа) — у пулі, не в потоці Tk
+        self.tasks = GuiTaskRunner(self.root)
+        self.frames = scheduler_for(self.root)
+        # усі toast і balloon-сповіщення: пул вікон, ліміт частоти, пауза на ключ
+        self.notifications = NotificationManager(self.root, self.tasks, self.frames,
+                                                 default_cooldown=3600, tray=self.show_tray_notification)
+        self.reminder_popup = None
+        self.outbox = None  # створюється в set_app_ref: параметри SMTP беруться з налаштувань
         self.setup_window()
-        self.create_tray_icon()
         self.loading_screen.update_progress(40, "Створення віджетів...")
+        self.showing_cached = False
+        self.hardware_info = None   # склад ПК: з кешу теплого старту, потім живий
+        self.last_metrics = {}
         self.create_widgets()
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
-        self.metric_targets = {
-            'cpu': 0,
-            'ram': 0,
-            'disk': 0,
-            
-        }
-        self.metric_current = {
-            'cpu': 0,
-            'ram': 0,
-            'disk': 0,
-            
+        # значення CPU/RAM/Диск анімуються планувальником кадрів лише після зміни
+        self.metric_tweens = {
+            key: Tween(self.frames, lambda value, key=key: self.render_metric(key, value), rate=0.23)
+            for key in ('cpu', 'ram', 'disk')
         }
-        self.animating_metrics = False
-        self.start_metrics_animation()
         self.app_ref = None
         self.loading_screen.update_progress(80, "Підготовка системи...")
-        self.last_alerts = {
-            "cpu": datetime.min,
-            
-            "disk": datetime.min,
-            "ram": datetime.min,
-            "backup": datetime.min
-        }
-        self.alert_cooldown = timedelta(minutes=60) # 60 хвилин між сповіщеннями одного типу
        
 
-    # функція для контролю частоти повідомлень
+    # функція для контролю частоти повідомлень (60 хвилин між сповіщеннями одного типу)
     def can_alert(self, alert_type):
-        now = datetime.now()
-        if now - self.last_alerts.get(alert_type, datetime.min) > self.alert_cooldown:
-            self.last_alerts[alert_type] = now
-            return True
-        return False
+        return self.notifications.can_alert(alert_type)
 
     def finish_loading(self):
         self.loading_screen.update_progress(100, "Готово!")
-        time.sleep(0.1)
         self.loading_screen.close()
         self.root.deiconify()
         self.root.update()
+        # PIL і pystray імпортуються вже після першого показу вікна
+        self.root.after_idle(self.create_tray_icon)
+        self.root.after_idle(self.outbox.start)
+
+    def show_cached_metrics(self, record, saved_at=None):
+        """Останні відомі значення до першого живого знімка (без анімації і сповіщень)"""
+        for key in ('cpu', 'ram', 'disk'):
+            value = record.get(f'{key}_percent')
+            if value is not None:
+                self.metric_tweens[key].set(value, animate=False)
+        if record.get('window_count') is not None:
+            config_if_changed(self.windows_label, text=f"{record['window_count']}")
+            self.windows_bar.set_progress(min(record['window_count'], 100), animate=False)
+        if record.get('gpu_load') is not None:
+            config_if_changed(self.gpu_label, text=f"{record['gpu_load']:.0f}%")
+            self.gpu_bar.set_progress(record['gpu_load'], animate=False)
+        if record.get('uptime_str'):
+            config_if_changed(self.uptime_label, text=record['uptime_str'])
+        age = f" ({format_age(saved_at)})" if saved_at else ""
+        self.status_label.config(text=f"⏳ Останні відомі значення{age}, оновлення...", fg=TEXT_FADED)
+        self.showing_cached = True
+
+    def show_warm_state(self, state):
+        """Стан з кешу теплого старту: метрики, AI-оцінка і склад ПК, позначені як застарілі"""
+        self.show_cached_metrics(state.get('metrics') or {}, state.get('saved_at'))
+        if state.get('health'):
+            self.ai_tab.show_cached(state['health'])
+        if state.get('hardware'):
+            self.hardware_info = state['hardware']
 
     def setup_window(self):
         self.root.title("TechCare 2025")
@@ -268,42 +274,26 @@ class TechCareGUI:
         # Scrollbar dark
         style.configure("Vertical.TScrollbar", background=CARD_BG, troughcolor=DARK_BG, bordercolor=SHADOW)
 
-    def start_metrics_animation(self):
-        # Запускає регулярне плавне оновлення метрик (кожні 35мс)
-        self.animating_metrics = True
-        self.animate_metrics()
-    
     def auto_update_metrics(self):
+        # розклад задає VisibilityManager: прихована головна вкладка оновлюється рідше
         if self.app_ref and hasattr(self.app_ref, 'data_manager'):
-            data = self.app_ref.data_manager.get_current_metrics()
-            if data:
-                self.update_main_metrics(data)
-        self.root.after(2000, self.auto_update_metrics)
-
-    def animate_metrics(self):
-        # Плавно наближує поточні значення до цільових
-        changed = False
-        for key in self.metric_targets:
-            cur = self.metric_current[key]
-            target = self.metric_targets[key]
-            # Змінюємо повільно
-            diff = target - cur
-            if abs(diff) > 0.2:
-                self.metric_current[key] += diff * 0.23  # Чим менше — тим плавніше
-                changed = True
-            else:
-                self.metric_current[key] = target
-        # Оновлюємо віджети
-        self.cpu_label.config(text=f"{int(self.metric_current['cpu'])}%")
-        self.cpu_bar.set_progress(self.metric_current['cpu'])
-        self.ram_label.config(text=f"{int(self.metric_current['ram'])}%")
-        self.ram_bar.set_progress(self.metric_current['ram'])
-        self.disk_label.config(text=f"{int(self.metric_current['disk'])}%")
-        self.disk_bar.set_progress(self.metric_current['disk'])
-        
-        # Повторити через 35мс, якщо ще анімується
-        if self.animating_metrics:
-            self.root.after(35, self.animate_metrics)
+            self.tasks.submit(self.app_ref.data_manager.get_current_metrics, key="current_metrics",
+                              on_done=self.apply_current_metrics)
+
+    def apply_current_metrics(self, data):
+        if data:
+            self.last_metrics = data  # для кешу теплого старту (вікна, GPU, аптайм)
+            self.update_main_metrics(data)
+
+    def render_metric(self, key, value):
+        # Один кадр анімації метрики: підпис і смужка разом
+        label, bar = {
+            'cpu': (self.cpu_label, self.cpu_bar),
+            'ram': (self.ram_label, self.ram_bar),
+            'disk': (self.disk_label, self.disk_bar),
+        }[key]
+        config_if_changed(label, text=f"{int(value)}%")
+        bar.set_progress(value, animate=False)
 
     def create_widgets(self):
         # Хедер з назвою
@@ -312,32 +302,48 @@ class TechCareGUI:
         # Вкладки
         self.tab_control = ttk.Notebook(self.root, style='TNotebook')
         self.tab_control.pack(fill='both', expand=True, padx=12, pady=(5, 12))
+        self.visibility = VisibilityManager(self.root, self.tab_control)
 
         # Головна вкладка
         self.create_main_tab()
 
         # AI-Tab — сучасний аналітичний
-        self.ai_tab = AITab(self.tab_control, self.app_ref)
+        self.ai_tab = AITab(self.tab_control, self.app_ref, self.tasks, self.visibility)
         self.tab_control.add(self.ai_tab.frame, text="AI Аналітика")
 
-        self.hardware_tab = tk.Frame(self.tab_control, bg=DARK_BG)
-        self.tab_control.add(self.hardware_tab, text="Складові ПК")
-        self.hardware_initialized = False  # Флаг ініціалізації
-
-        def on_tab_change(event):
-            selected = event.widget.index("current")
-            tab_text = event.widget.tab(selected, "text")
-            if tab_text == "Складові ПК" and not self.hardware_initialized:
-                self.create_hardware_info_tab()
-                self.hardware_initialized = True
-
-        self.tab_control.bind("<<NotebookTabChanged>>", on_tab_change)
-    #    Вкладки для інших функцій
-        self.create_achievements_tab()
-        self.create_schedule_tab()
+        # Решта вкладок будується при першому відкритті (або коли їх вміст уперше потрібен)
+        self.lazy_tabs = {}
+        self.hardware_tab = self.add_lazy_tab("Складові ПК", self.build_hardware_tab)
+        self.add_lazy_tab("Досягнення", self.create_achievements_tab)
+        self.add_lazy_tab("Розклад", self.create_schedule_tab)
+        diag_tab = self.add_lazy_tab("Діагностика", self.create_diagnostics_tab)
+        # перевірка бюджету накладних витрат працює і до відкриття вкладки
+        self.visibility.register('diagnostics', diag_tab, COST_MEDIUM)
+        self.visibility.every('diagnostics', 2000, self.update_diagnostics)
 
         self.create_status_bar()
-        self.create_help_tab()
+        self.add_lazy_tab("Гід", self.create_help_tab)
+
+        def on_tab_change(event):
+            self.ensure_tab(event.widget.select())
+
+        self.tab_control.bind("<<NotebookTabChanged>>", on_tab_change, add="+")
+
+    def add_lazy_tab(self, text, builder):
+        """Порожня вкладка; builder(frame) заповнить її при першому показі"""
+        frame = tk.Frame(self.tab_control, bg=DARK_BG)
+        self.tab_control.add(frame, text=text)
+        self.lazy_tabs[str(frame)] = (text, builder, frame)
+        return frame
+
+    def ensure_tab(self, tab):
+        """Будує вкладку (шлях фрейму або підпис), якщо її ще не побудовано"""
+        key = tab if tab in self.lazy_tabs else next(
+            (path for path, (text, _, _) in self.lazy_tabs.items() if text == tab), None)
+        if key is None:
+            return
+        text, builder, frame = self.lazy_tabs.pop(key)
+        builder(frame)
 
         
 
@@ -367,6 +373,8 @@ class TechCareGUI:
     def create_main_tab(self):
         main = ttk.Frame(self.tab_control)
         self.tab_control.add(main, text="Головна")
+        # головна вкладка лише показує метрики, але smart-сповіщення з неї мають працювати і в треї
+        self.visibility.register('main', main, COST_MEDIUM)
 
         wrapper = tk.Frame(main, bg=DARK_BG)
         wrapper.pack(fill="both", expand=True, padx=26, pady=22)
@@ -447,46 +455,27 @@ class TechCareGUI:
         return b
 
     def add_event_to_outlook(self, subject, body, start_time):
-        # Додає подію у Outlook календар
-        try:
-            vbs = f'''
-Set olApp = CreateObject("Outlook.Application")
-Set olNS = olApp.GetNamespace("MAPI")
-Set olCalendar = olNS.GetDefaultFolder(9)
-Set olAppt = olCalendar.Items.Add()
-olAppt.Subject = "{subject}"
-olAppt.Body = "{body}"
-olAppt.Start = "{start_time.strftime('%m/%d/%Y %H:%M')}"
-olAppt.Duration = 30
-olAppt.ReminderSet = True
-olAppt.Save
-'''
-            with open("addevent.vbs", "w") as f:
-                f.write(vbs)
-            subprocess.Popen(["wscript.exe", "addevent.vbs"])
-        except Exception as e:
-            self.show_notification("Календар", f"Не вдалося додати подію: {e}")
+        # Додає подію у Outlook календар (VBScript запускається в потоці черги нагадувань)
+        return self.outbox.add_event(subject, body, start_time)
 
     # ========= API для оновлення метрик =========
     def update_main_metrics(self, data):
         # Оновлення індикаторів
-        self.metric_targets['cpu'] = data.get("cpu_percent", 0)
-        self.metric_targets['ram'] = data.get("ram_percent", 0)
-        self.metric_targets['disk'] = data.get("disk_percent", 0)
-
-        window_count = data.get("window_count", 0)
-        self.windows_label.config(text=f"{window_count}")
-        self.windows_bar.set_progress(min(window_count, 100))
-        
         cpu = data.get("cpu_percent", 0)
-        self.cpu_label.config(text=f"{int(cpu)}%")
-        self.cpu_bar.set_progress(cpu)
         ram = data.get("ram_percent", 0)
-        self.ram_label.config(text=f"{int(ram)}%")
-        self.ram_bar.set_progress(ram)
         disk = data.get("disk_percent", 0)
-        self.disk_label.config(text=f"{int(disk)}%")
-        self.disk_bar.set_progress(disk)
+        if self.showing_cached:
+            self.showing_cached = False
+            self.status_label.config(text="🟢 Готовий до роботи", fg=ACCENT)
+        # невидимі індикатори не анімуємо: одразу ставимо кінцеве значення
+        animate = self.visibility.is_visible('main')
+        self.metric_tweens['cpu'].set(cpu, animate)
+        self.metric_tweens['ram'].set(ram, animate)
+        self.metric_tweens['disk'].set(disk, animate)
+
+        window_count = data.get("window_count", 0)
+        config_if_changed(self.windows_label, text=f"{window_count}")
+        self.windows_bar.set_progress(min(window_count, 100))
        
         uptime_hours = data.get("uptime_hours", 0)
         uptime_minutes = data.get("uptime_minutes", 0)
@@ -496,10 +485,10 @@ olAppt.Save
         # Оновлення GPU
         gpu_load = data.get("gpu_load")
         if gpu_load is not None:
-            self.gpu_label.config(text=f"{gpu_load:.0f}%")
+            config_if_changed(self.gpu_label, text=f"{gpu_load:.0f}%")
             self.gpu_bar.set_progress(gpu_load)
         else:
-            self.gpu_label.config(text="Н/Д")
+            config_if_changed(self.gpu_label, text="Н/Д")
             self.gpu_bar.set_progress(0)
 
         # Оновлення аптайму
@@ -507,67 +496,68 @@ olAppt.Save
         self.uptime_bar.set_progress(progress)
         if uptime_hours >= 24:
             self.uptime_bar.set_bar_color("#E65F53")  
-            if not hasattr(self, "notified_uptime_over_24") or not self.notified_uptime_over_24:
+        else:
+            self.uptime_bar.set_bar_color("#6bf9d3")  
+
+        config_if_changed(self.uptime_label, text=uptime_str)
+
+    def check_alerts(self, data):
+        """Пороги й сповіщення для кожного фонового знімка (потік Tk)
+
+        Викликається з background_collector незалежно від видимості вкладки,
+        тож у треї чи на іншій вкладці попередження не сповільнюються
+        """
+        cpu = data.get("cpu_percent", 0)
+        ram = data.get("ram_percent", 0)
+        if data.get("uptime_hours", 0) >= 24:
+            # один раз за епізод (до перезавантаження), а не щогодини
+            if not getattr(self, "notified_uptime_over_24", False):
                 self.show_notification(
                     "Uptime > 24 год",
                     "Комп’ютер працює більше доби! Рекомендуємо перезавантажити."
                 )
                 self.notified_uptime_over_24 = True
         else:
-            self.uptime_bar.set_bar_color("#6bf9d3")  
             self.notified_uptime_over_24 = False
 
-        self.uptime_label.config(text=uptime_str)
-
         # SMART-логіка, інтеграція з календарем і system tray!
-        disk_free = data.get('disk_percent_free', 100)
-        # --- Smart-попередження!
-        if cpu > 90 and self.can_alert("cpu"):
-            self.show_notification("Високе навантаження", "Ваш процесор завантажений >90%.")
-            self.show_tray_notification("Високе навантаження", "Ваш процесор завантажений >90%.")
-            self.smart_add_schedule_task("Перевірити фонові процеси", "18:00")
-            self.show_reminder_options(
-                "Високе навантаження CPU",
-                "Рекомендовано закрити непотрібні програми для зниження навантаження.",
-                datetime.now()
-            )
-        
-        if disk_free < 10 and self.can_alert("disk"):
-            self.show_notification("Мало вільного місця", "Залишилось менше 10% місця на диску!")
-            self.show_tray_notification("Мало вільного місця", "Залишилось менше 10% місця на диску!")
-            self.smart_add_schedule_task("Очистити диск C", "20:00")
-            self.show_reminder_options(
-                "Очищення диску",
-                "Рекомендовано очистити диск C для стабільної роботи.",
-                datetime.now()
-            )
-        if ram > 90 and self.can_alert("ram"):
-            self.show_notification("Мало оперативної пам'яті", "Використання ОЗП перевищило 90%.")
-            self.show_tray_notification("Мало оперативної пам'яті", "Використання ОЗП перевищило 90%.")
-            self.smart_add_schedule_task("Перезавантажити комп'ютер", "21:00")
-            self.show_reminder_options(
-                "Перевантаження ОЗП",
-                "Рекомендуємо перезавантажити комп'ютер для звільнення пам'яті.",
-                datetime.now()
-            )
-        # Smart-планування бекапу
+        disk_free = data.get('disk_percent_free', 100 - data.get('disk_percent', 0))
+        # --- Smart-попередження: (умова, ключ, заголовок, текст, завдання, час, тема і текст нагадування)
         last_backup = None
         if self.app_ref and hasattr(self.app_ref, 'data_manager') and hasattr(self.app_ref.data_manager, 'get_last_backup_time'):
             last_backup = self.app_ref.data_manager.get_last_backup_time()
-        if not last_backup or datetime.now() - last_backup > timedelta(days=7):
-            if self.can_alert("backup"):
-                self.smart_add_schedule_task("Зробити резервну копію", "18:30")
-                self.show_notification("Рекомендуємо бекап", "Не робили резервну копію більше тижня!")
-                self.show_tray_notification("Бекап", "Не забувайте робити резервні копії щотижня!")
-                self.show_reminder_options(
-                    "Зробити резервну копію",
-                    "Рекомендуємо зробити резервну копію важливих файлів.",
-                    datetime.now()
-                )
+        smart_alerts = [
+            (cpu > 90, "cpu", "Високе навантаження", "Ваш процесор завантажений >90%.",
+             "Перевірити фонові процеси", "18:00", "Високе навантаження CPU",
+             "Рекомендовано закрити непотрібні програми для зниження навантаження."),
+            (disk_free < 10, "disk", "Мало вільного місця", "Залишилось менше 10% місця на диску!",
+             "Очистити диск C", "20:00", "Очищення диску",
+             "Рекомендовано очистити диск C для стабільної роботи."),
+            (ram > 90, "ram", "Мало оперативної пам'яті", "Використання ОЗП перевищило 90%.",
+             "Перезавантажити комп'ютер", "21:00", "Перевантаження ОЗП",
+             "Рекомендуємо перезавантажити комп'ютер для звільнення пам'яті."),
+            (not last_backup or datetime.now() - last_backup > timedelta(days=7), "backup",
+             "Рекомендуємо бекап", "Не робили резервну копію більше тижня!",
+             "Зробити резервну копію", "18:30", "Зробити резервну копію",
+             "Рекомендуємо зробити резервну копію важливих файлів."),
+        ]
+        reminders = []
+        for active, key, title, message, task, at, subject, body in smart_alerts:
+            # toast і balloon у треї — через менеджер сповіщень (пауза на ключ, ліміт, злиття)
+            if active and self.show_notification(title, message, key=key, tray=True):
+                self.smart_add_schedule_task(task, at)
+                reminders.append((subject, body))
+        # одне вікно нагадування на такт, навіть якщо спрацювало кілька правил
+        if reminders and not (self.reminder_popup and self.reminder_popup.winfo_exists()):
+            subject = reminders[0][0] if len(reminders) == 1 else "; ".join(r[0] for r in reminders)
+            body = "\n".join(r[1] for r in reminders)
+            self.show_reminder_options(subject, body, datetime.now())
 
     
     def shutdown(self): # Завершення роботи програми
         self.auto_collect_running = False
+        if getattr(self, 'cpu_scaling', None):
+            self.cpu_scaling.cancel()
         if hasattr(self, 'tray_icon'):
             try:
                 self.tray_icon.stop()
@@ -579,6 +569,7 @@ olAppt.Save
 
 
     def smart_add_schedule_task(self, name, time):
+        self.ensure_tab("Розклад")
         # Перевіряє, чи є вже така задача — не дублює!
         for i in range(self.scheduled_listbox.size()):
             if name in self.scheduled_listbox.get(i):
@@ -587,10 +578,17 @@ olAppt.Save
 
     def set_app_ref(self, app_ref):
         self.app_ref = app_ref
+        # email і календар доставляє фоновий потік; черга зберігається між запусками
+        self.outbox = Outbox(smtp=smtp_config(app_ref.data_manager.get_setting),
+                             on_sent=lambda items: self.tasks.post(self.outbox_sent, items),
+                             on_failed=lambda item, error: self.tasks.post(self.outbox_failed, item, error))
         if hasattr(self, 'ai_tab'):
             self.ai_tab.app_ref = app_ref
             self.ai_tab.update_ai_analysis()
-        self.auto_update_metrics()
+        self.visibility.every('main', 2000, self.auto_update_metrics)
+        # попередження — з фонового збору, а не з відмальовування головної вкладки
+        if hasattr(app_ref, 'add_snapshot_listener'):
+            app_ref.add_snapshot_listener(self.check_alerts)
         
 
     def show_reminder_options(self, subject, body, default_time=None):
@@ -600,6 +598,7 @@ olAppt.Save
         default_time — datetime для календаря (можна None)
         """
         popup = tk.Toplevel(self.root)
+        self.reminder_popup = popup
         popup.title("Додати нагадування")
         popup.configure(bg=CARD_BG)
         popup.geometry("380x210+{}+{}".format(self.root.winfo_x()+60, self.root.winfo_y()+120))
@@ -612,8 +611,7 @@ olAppt.Save
 
         def add_to_calendar():
             time = default_time or datetime.now()
-            self.show_reminder_options(subject, body, time)
-            self.show_notification("Календар", "Подія додана в Outlook!")
+            self.add_event_to_outlook(subject, body, time)
             popup.destroy()
 
         def send_email():
@@ -622,8 +620,11 @@ olAppt.Save
                 if not email or "@" not in email:
                     status.config(text="❗ Введіть коректний email!", fg="red")
                     return
+                if not self.outbox.email_enabled:
+                    status.config(text="❗ Пошту не налаштовано (smtp_user, smtp_password)", fg="red")
+                    return
+
                 self.send_email_reminder(subject, body, email)
-                self.show_notification("Пошта", f"Нагадування надіслано на {email}")
                 popup.destroy()
 
             for widget in popup.winfo_children():
@@ -647,19 +648,21 @@ olAppt.Save
                 bg=SHADOW, fg=ACCENT, font=("Segoe UI", 10), relief="flat", padx=8, pady=3).pack(pady=(4,8))
         
     def send_email_reminder(self, subject, body, to_email):
-        msg = MIMEText(body)
-        msg["Subject"] = subject
-        msg["From"]    = "forchatix@gmail.com"     # ваша реальна адреса
-        msg["To"]      = to_email
-        try:
-            s = smtplib.SMTP_SSL("smtp.gmail.com", 465)
-            # сюди вставте App Password, згенерований у налаштуваннях Google
-            s.login("forchatix@gmail.com", "yhsq kvjt ldmd gdgf")
-            # ТУТ має бути точно така ж адреса, що в login()
-            s.sendmail("forchatix@gmail.com", [to_email], msg.as_string())
-            s.quit()
-        except Exception as e:
-            self.show_notification("Помилка пошти", str(e))
+        # лист ставиться в чергу; надсилає фоновий потік (дайджест, повтори)
+        return self.outbox.send_email(to_email, subject, body)
+
+    def outbox_sent(self, items):
+        for item in items:
+            if item['kind'] == 'calendar':
+                self.show_notification("Календар", f"Подія додана в Outlook: {item['subject']}")
+        emails = [item for item in items if item['kind'] == 'email']
+        if emails:
+            self.show_notification("Пошта", f"Нагадування надіслано на {emails[0]['to']}")
+
+    def outbox_failed(self, item, error):
+        title = "Календар" if item['kind'] == 'calendar' else "Помилка пошти"
+        self.show_notification(title, f"Не вдалося доставити «{item['subject']}»: {error}",
+                               key="outbox_failed", cooldown=300)
 
 # Точка входу (factory для main.py)
     def create_gui(update_callback):
@@ -667,45 +670,11 @@ olAppt.Save
     
 
     def plot_history(self):
-        from json_data import JsonDataManager
-        manager = JsonDataManager()
-        history = manager.get_historical_data()
-        if not history:
-            return
-
-        timestamps = [entry["timestamp"].split('T')[1].split('.')[0] for entry in history[-15:]]
-        
-        cpu = [entry.get("cpu_percent", 0) for entry in history[-15:]]
-        ram = [entry.get("ram_percent", 0) for entry in history[-15:]]
-
-        fig, ax = plt.subplots(figsize=(7, 4), facecolor=DARK_BG)
-        ax.set_facecolor(CARD_BG)
-
-        
-        ax.plot(timestamps, cpu, label="CPU (%)", color=GREEN, linewidth=2.3)
-        ax.plot(timestamps, ram, label="RAM (%)", color=RED, linewidth=2.3)
-
-        ax.set_title("Історія показників системи", color=ACCENT, fontsize=14, fontweight='bold')
-        ax.set_xlabel("Час", color=TEXT_MAIN)
-        ax.set_ylabel("Значення", color=TEXT_MAIN)
-        ax.tick_params(axis='x', labelrotation=45, colors=TEXT_FADED)
-        ax.tick_params(axis='y', colors=TEXT_FADED)
-        for spine in ax.spines.values():
-            spine.set_color(ACCENT_FADE)
-        ax.legend(facecolor=DARK_BG, edgecolor=ACCENT, labelcolor=ACCENT, fontsize=9)
-
-        fig.tight_layout()
-
-        for widget in self.canvas_frame.winfo_children():
-            widget.destroy()
-
-        canvas = FigureCanvasTkAgg(fig, master=self.canvas_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        """Історія показників — те саме живе вікно тренду, що й на вкладці AI"""
+        if hasattr(self, 'ai_tab'):
+            self.ai_tab._show_trend()
 
-    def create_achievements_tab(self):
-        achievements_frame = tk.Frame(self.tab_control, bg=DARK_BG)
-        self.tab_control.add(achievements_frame, text="Досягнення")
+    def create_achievements_tab(self, achievements_frame):
 
         title = tk.Label(achievements_frame, text="🏆 Досягнення та прогрес",
                         font=("Segoe UI", 14, "bold"), fg=ACCENT, bg=DARK_BG)
@@ -749,6 +718,8 @@ olAppt.Save
         self.update_achievements_display()
 
     def update_achievements_display(self):
+        if not hasattr(self, 'achievements_listbox'):
+            return  # вкладку ще не відкривали; заповниться при побудові
         if self.app_ref and hasattr(self.app_ref, 'data_manager') and hasattr(self.app_ref, 'achievements'):
             user_stats = self.app_ref.data_manager.get_user_stats()
             total_points = user_stats.get('total_points', 0)
@@ -768,9 +739,7 @@ olAppt.Save
             self.achievements_listbox.delete(0, tk.END)
             self.achievements_listbox.insert(tk.END, "✗ Перший запуск - Запустити TechCare")
 
-    def create_schedule_tab(self):
-        schedule_tab = tk.Frame(self.tab_control, bg=DARK_BG)
-        self.tab_control.add(schedule_tab, text="Розклад")
+    def create_schedule_tab(self, schedule_tab):
 
         title = tk.Label(schedule_tab, text="🗓️ Заплановані завдання",
                         font=("Segoe UI", 14, "bold"), fg=ACCENT, bg=DARK_BG)
@@ -816,6 +785,144 @@ olAppt.Save
 
         self.load_schedule_tasks()
 
+    def create_diagnostics_tab(self, diag_tab):
+
+        title = tk.Label(diag_tab, text="⚙️ Споживання ресурсів TechCare",
+                        font=("Segoe UI", 14, "bold"), fg=ACCENT, bg=DARK_BG)
+        title.pack(pady=(14, 10))
+
+        rows = [
+            ("cpu_percent", "CPU (% ядра)"),
+            ("rss_mb", "Пам'ять (RSS), МБ"),
+            ("threads", "Потоки"),
+            ("handles", "Дескриптори"),
+            ("io_write_mb", "Записано процесом, МБ"),
+            ("write_kb_s", "Запис даних, КБ/с"),
+            ("json_saves", "Збережень JSON"),
+            ("json_bytes_written", "Записано у JSON, КБ"),
+            ("get_system_data_calls", "Знімків системи"),
+            ("disk_test_runs", "Тестів диска"),
+        ]
+        self.diag_labels = {}
+        for key, name in rows:
+            frame = tk.Frame(diag_tab, bg=CARD_BG)
+            frame.pack(fill="x", padx=24, pady=3)
+            tk.Label(frame, text=name, font=("Segoe UI", 11, "bold"), fg=ACCENT_2, bg=CARD_BG,
+                     width=22, anchor="w").pack(side="left")
+            value = tk.Label(frame, text="—", font=("Segoe UI", 11), fg=TEXT_MAIN, bg=CARD_BG, anchor="w")
+            value.pack(side="left", padx=(16, 0))
+            self.diag_labels[key] = value
+
+        self.diag_budget_label = tk.Label(diag_tab, text="", font=("Segoe UI", 11, "bold"),
+                                          bg=DARK_BG, fg=GREEN, wraplength=600, justify="left")
+        self.diag_budget_label.pack(pady=(12, 6), padx=24, anchor="w")
+
+        tk.Label(diag_tab, text="🕒 Чуйність інтерфейсу", font=("Segoe UI", 12, "bold"),
+                 fg=ACCENT, bg=DARK_BG).pack(pady=(6, 4))
+        self.diag_ui_text = tk.Text(diag_tab, bg=CARD_BG, fg=TEXT_MAIN, font=("Consolas", 9),
+                                    height=8, wrap="none", relief="flat")
+        self.diag_ui_text.pack(fill="both", expand=True, padx=24, pady=(0, 12))
+
+        btn_frame = tk.Frame(diag_tab, bg=DARK_BG)
+        btn_frame.pack(pady=(0, 12))
+        self.profile_button = self.create_modern_button(btn_frame, "🔬 Профілювати 10 с", self.start_profiling, width=210)
+        self.profiler = None
+        self.cpu_scaling_button = self.create_modern_button(btn_frame, "🧮 Тест ядер CPU", self.toggle_cpu_scaling, width=210)
+        self.cpu_scaling_button.pack_configure(pady=(6, 0))
+        self.cpu_scaling = None
+        self.cpu_scaling_label = tk.Label(diag_tab, text="", font=("Consolas", 9), fg=TEXT_MAIN, bg=DARK_BG,
+                                          justify="left", anchor="w")
+        self.cpu_scaling_label.pack(fill="x", padx=24, pady=(0, 12))
+        self.update_diagnostics()
+
+    def update_diagnostics(self):
+        """Показує дані самоконтролю з останнього знімка системи"""
+        sample = None
+        if self.app_ref and hasattr(self.app_ref, 'state'):
+            sample = self.app_ref.state.get('current_data', {}).get('techcare')
+        # вкладка будується лише при першому відкритті, а бюджет перевіряється завжди
+        built = hasattr(self, 'diag_labels')
+        if sample:
+            budget = self.app_ref.data_manager.get_setting('overhead_budget')
+            violations = check_budget(sample, budget)
+            text = "; ".join(f"{key}: {value} > {limit}" for key, value, limit in violations)
+            if violations:
+                self.show_notification("TechCare споживає забагато", text, key="overhead")
+            if built:
+                counters = sample.get('counters', {})
+                values = dict(sample)
+                values.update(counters)
+                if 'json_bytes_written' in values:
+                    values['json_bytes_written'] = round(values['json_bytes_written'] / 1024, 1)
+                for key, label in self.diag_labels.items():
+                    value = values.get(key)
+                    label.config(text="—" if value is None else str(value))
+                if violations:
+                    self.diag_budget_label.config(text=f"⚠ Перевищено бюджет: {text}", fg=RED)
+                else:
+                    self.diag_budget_label.config(text="✓ У межах бюджету накладних витрат", fg=GREEN)
+        if built and self.app_ref and hasattr(self.app_ref, 'watchdog'):
+            self.show_ui_latency(self.app_ref.watchdog.report(top=5))
+
+    def start_profiling(self, duration=10):
+        if self.profiler and self.profiler.running:
+            return
+        self.profile_button.config(state="disabled")
+        self.status_label.config(text=f"🔬 Профілювання {duration} с…")
+
+        def saved(path, profiler):
+            top = ", ".join(f"{name} {share:.0%}" for name, share in profiler.top_functions(3))
+            self.tasks.post(self.profile_button.config, {'state': "normal"})
+            self.tasks.post(self.status_label.config, {'text': "🟢 Готовий до роботи"})
+            self.tasks.post(self.show_notification, "Профіль збережено", f"{path}\n{top}")
+
+        self.profiler = profile_to_file(duration, on_saved=saved)
+
+    def toggle_cpu_scaling(self):
+        """Запускає багатоядерний тест CPU (cpu_scaling.py) або зупиняє той, що йде"""
+        if self.cpu_scaling is not None:
+            self.cpu_scaling.cancel()
+            self.cpu_scaling_button.config(state="disabled")
+            return
+        if not (self.app_ref and hasattr(self.app_ref, 'tests')):
+            return
+        self.cpu_scaling_button.config(text="⏹ Зупинити тест CPU")
+        self.cpu_scaling_label.config(text="Запуск пулу процесів…")
+        # on_done і progress приходять з робочого потоку — у Tk лише через tasks.post
+        self.cpu_scaling = self.app_ref.tests.start_cpu_scaling(
+            on_done=lambda report: self.tasks.post(self.show_cpu_scaling, report),
+            progress=lambda text: self.tasks.post(self.cpu_scaling_label.config, {'text': text}))
+
+    def show_cpu_scaling(self, report):
+        self.cpu_scaling = None
+        self.cpu_scaling_button.config(text="🧮 Тест ядер CPU", state="normal")
+        if report.get('error'):
+            self.cpu_scaling_label.config(text=f"Помилка тесту CPU: {report['error']}")
+            return
+        if report.get('cancelled'):
+            self.cpu_scaling_label.config(text="Тест CPU зупинено")
+            return
+        lines = [f"{level['workers']:3d} воркерів: {level['throughput']:8.2f} од/с, "
+                 f"прискорення x{level['speedup']:.2f}, ефективність {level['efficiency'] * 100:.0f}%"
+                 for level in report['levels']]
+        slow = [str(core['core']) for core in report['per_core'] or [] if core['slow']]
+        if slow:
+            lines.append(f"Повільні ядра: {', '.join(slow)}")
+        elif report['per_core']:
+            lines.append("Усі ядра працюють рівно")
+        self.cpu_scaling_label.config(text="\n".join(lines))
+
+    def show_ui_latency(self, report):
+        lag = report['lag']
+        lines = [
+            f"Затримка циклу подій: p50 {lag['p50_ms']} мс, p99 {lag['p99_ms']} мс, макс {lag['max_ms']} мс",
+            f"Зависань понад {report['threshold_ms']} мс: {report['stalls']}",
+        ]
+        for site in report['top_sites']:
+            lines.append(f"  {site['stalled_s']:6.2f} с  ×{site['stalls']:<3d} {site['site']}")
+        self.diag_ui_text.delete(1.0, tk.END)
+        self.diag_ui_text.insert(tk.END, "\n".join(lines))
+
     def add_schedule_task(self):
         name = self.task_name_entry.get().strip()
         t = self.task_time_entry.get().strip()
@@ -844,60 +951,40 @@ olAppt.Save
             for task in tasks:
                 self.scheduled_listbox.insert(tk.END, f"{task['name']} о {task['time']}")
 
-    def show_notification(self, title, message, duration=3400):
-        # Сучасний toast поверх усіх вікон, fade-in/fade-out
-        toast = tk.Toplevel(self.root)
-        toast.overrideredirect(True)
-        toast.configure(bg=ACCENT)
-        toast.attributes("-topmost", True)
-        w, h = 340, 88
-        x = self.root.winfo_x() + (self.root.winfo_width() - w)//2
-        y = self.root.winfo_y() + 56
-        toast.geometry(f"{w}x{h}+{x}+{y}")
-
-        frame = tk.Frame(toast, bg=ACCENT, bd=0)
-        frame.pack(fill="both", expand=True)
-        title_lbl = tk.Label(frame, text=title, font=("Segoe UI", 12, "bold"), bg=ACCENT, fg=DARK_BG)
-        title_lbl.pack(pady=(14, 2), padx=10, anchor="w")
-        msg_lbl = tk.Label(frame, text=message, font=("Segoe UI", 10), bg=ACCENT, fg=DARK_BG, wraplength=w-28, justify="left")
-        msg_lbl.pack(pady=(2, 8), padx=14, anchor="w")
+    def show_notification(self, title, message, key=None, tray=False, cooldown=None):
+        """Toast через менеджер сповіщень; False — придушено паузою для key"""
+        return self.notifications.notify(title, message, key=key, cooldown=cooldown, tray=tray)
 
-        
-
-        def fade_out(alpha=1.0):
-            alpha -= 0.09
-            if alpha <= 0:
-                toast.destroy()
-            else:
-                toast.attributes("-alpha", max(alpha, 0))
-                toast.after(25, lambda: fade_out(alpha))
-        # Fade-in
-        toast.attributes("-alpha", 0.0)
-        def fade_in(alpha=0.0):
-            alpha += 0.10
-            if alpha >= 1.0:
-                toast.attributes("-alpha", 1.0)
-                toast.after(duration, fade_out)
-            else:
-                toast.attributes("-alpha", alpha)
-                toast.after(18, lambda: fade_in(alpha))
-        fade_in()
     def create_tray_icon(self):
     # Створюємо іконку для трей-менеджера
+        from PIL import Image, ImageDraw
+        import pystray
         img = Image.new('RGBA', (64, 64), (30, 40, 50, 255))
         d = ImageDraw.Draw(img)
         d.ellipse((8, 8, 56, 56), fill="#80FFD0")
-        self.tray_icon = pystray.Icon("TechCare", img, "TechCare Smart Reminder")
+        # пункти меню викликаються в потоці трею, тож дії передаємо в потік Tk
+        menu = pystray.Menu(
+            pystray.MenuItem("Показати TechCare", lambda: self.tasks.post(self.show_from_tray), default=True),
+            pystray.MenuItem("Сховати в трей", lambda: self.tasks.post(self.hide_to_tray)),
+        )
+        self.tray_icon = pystray.Icon("TechCare", img, "TechCare Smart Reminder", menu)
         threading.Thread(target=self.tray_icon.run, daemon=True).start()
 
+    def hide_to_tray(self):
+        self.root.withdraw()
+        self.visibility.set_tray(True)
+
+    def show_from_tray(self):
+        self.root.deiconify()
+        self.root.lift()
+        self.visibility.set_tray(False)
+
     def show_tray_notification(self, title, message):
         # Показати balloon-tip у system tray (тільки якщо tray icon створена)
         if hasattr(self, 'tray_icon'):
             self.tray_icon.notify(message, title)
 
-    def create_help_tab(self):
-        help_tab = tk.Frame(self.tab_control, bg=DARK_BG)
-        self.tab_control.add(help_tab, text="Гід")
+    def create_help_tab(self, help_tab):
         guide = (
             "🟢 Коротка інструкція користувача:\n"
             "\n"
@@ -924,7 +1011,7 @@ olAppt.Save
         txt.pack(fill="both", expand=True, padx=14, pady=12)
 
     def on_close(self):
-        self.animating_metrics = False
+        self.frames.stop()
         try:
             if hasattr(self, "tray_icon"):
                 self.tray_icon.stop()
@@ -978,7 +1065,8 @@ olAppt.Save
                     bg=DARK_BG, fg=TEXT_MAIN, anchor="w", wraplength=420, justify="left").pack(side="left", fill="x", expand=True)
 
     
-    def create_hardware_info_tab(self):
+    def probe_hardware_info(self):
+        """Збирає дані для вкладки 'Складові ПК' (виконується у пулі)"""
         import platform
         try:
             import GPUtil
@@ -999,6 +1087,16 @@ olAppt.Save
             ("ОЗП", ram),
             ("Ім'я ПК", platform.node())
         ]
+        return info
+
+    def build_hardware_tab(self, frame):
+        # збережений склад ПК показуємо одразу, живі дані замінять його
+        if self.hardware_info:
+            self.create_hardware_info_tab(self.hardware_info)
+        self.tasks.submit(self.probe_hardware_info, key="hardware_info", on_done=self.create_hardware_info_tab)
+
+    def create_hardware_info_tab(self, info):
+        self.hardware_info = info
         for widget in self.hardware_tab.winfo_children():
             widget.destroy()  # Очищення вкладки при повторному виклику
         title = tk.Label(self.hardware_tab, text="🛠️ Складові ПК", font=("Segoe UI", 14, "bold"), fg=ACCENT, bg=DARK_BG)
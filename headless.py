@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+"""
+TechCare без інтерфейсу (сервери, машини без дисплея): той самий збір
+знімків, історія, оцінка здоров'я і правила попереджень, експорт
+OpenMetrics і потік знімків — без Tk і без імпорту GUI-модулів.
+SIGTERM/SIGINT завершують роботу чисто: кеш теплого старту, черга
+нагадувань і трасування дописуються на диск
+"""
+
+import json
+import os
+import signal
+import sys
+import threading
+import time
+
+# точка відліку для звіту про ресурси (див. --compare)
+_PROCESS_T0 = time.perf_counter()
+
+from monitor import get_system_data
+from json_data import JsonDataManager
+from ai import SimpleAI
+from tracing import TRACER, measure_time
+from profiler import install_signal_handler
+from exporter import MetricsExporter
+from stream import StreamServer
+from warm_cache import WarmCache, build_state
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+SINGLETON_NAME = "TechCareAppMutex2025"
+# інтервали як у GUI: фоновий збір і перевірка здоров'я (start_monitoring)
+COLLECT_INTERVAL = 2.0
+HEALTH_INTERVAL = 30.0
+# слова в попередженнях AI, що роблять їх критичними (як у main.check_thresholds)
+CRITICAL_WORDS = ('охолодіть', 'перезапустіть', 'очистіть')
+ALERT_COOLDOWN = 600
+
+# модулі, яких не має бути в процесі без інтерфейсу
+GUI_MODULES = ('tkinter', 'gui', 'ai_tab', 'live_chart', 'matplotlib', 'PIL', 'pystray')
+
+
+def singleton_lock(name=SINGLETON_NAME):
+    """Дескриптор блокування або None, якщо TechCare (GUI чи без інтерфейсу) уже запущено"""
+    if os.name == "nt":
+        import ctypes
+        import ctypes.wintypes
+        mutex = ctypes.windll.kernel32.CreateMutexW(None, ctypes.wintypes.BOOL(True), name)
+        if ctypes.windll.kernel32.GetLastError() == 183:  # ERROR_ALREADY_EXISTS
+            return None
+        return mutex
+    import fcntl
+    import tempfile
+    handle = open(os.path.join(tempfile.gettempdir(), f"{name}.lock"), "a")
+    try:
+        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        handle.close()
+        return None
+    return handle
+
+
+def _rss_mb():
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 1024 ** 2
+    except Exception:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+    except Exception:
+        return None
+
+
+def resource_report(started=None):
+    """RSS, процесорний час і склад процесу — для порівняння з GUI-збіркою"""
+    wall = time.perf_counter() - (started or _PROCESS_T0)
+    cpu = time.process_time()
+    rss = _rss_mb()
+    return {
+        'wall_s': round(wall, 1),
+        'cpu_s': round(cpu, 3),
+        'cpu_percent': round(cpu / wall * 100, 2) if wall else 0.0,
+        'rss_mb': round(rss, 1) if rss is not None else None,
+        'threads': threading.active_count(),
+        'modules': len(sys.modules),
+        'gui_modules': [name for name in GUI_MODULES if name in sys.modules],
+    }
+
+
+class HeadlessApp:
+    """Цикл збору в головному потоці; зупинка — stop() або сигнал"""
+
+    def __init__(self, metrics_port=None, stream=False, alert_email=None):
+        self.data_manager = JsonDataManager()
+        self.ai_engine = SimpleAI(self.data_manager)
+        self.warm_cache = WarmCache()
+        self.state = {
+            'current_data': {},
+            'last_saved_seq': None,
+            'last_health': None,
+            'last_alerts': {},
+        }
+        self.alert_email = alert_email or self.data_manager.get_setting('alert_email')
+        self.outbox = None
+        if self.alert_email:
+            from outbox import Outbox, smtp_config
+            smtp = smtp_config(self.data_manager.get_setting)
+            if smtp is None:
+                print("Email для попереджень вимкнено: не задано smtp_user і smtp_password")
+            else:
+                self.outbox = Outbox(smtp=smtp, on_failed=lambda item, error: print(
+                    f"[ALERT] не вдалося надіслати «{item['subject']}»: {error}", flush=True))
+        self.exporter = self.start_exporter(metrics_port)
+        self.stream = self.start_stream(stream)
+        self._stop = threading.Event()
+
+    # ---------- сервіси (як у TechCareApp) ----------
+    def start_exporter(self, port=None):
+        port = port or os.environ.get("TECHCARE_METRICS_PORT") or self.data_manager.get_setting('exporter_port')
+        if not port:
+            return None
+        exporter = MetricsExporter(port=int(port))
+        try:
+            exporter.start()
+        except OSError as e:
+            print(f"Не вдалося запустити експорт метрик на порту {port}: {e}")
+            return None
+        print(f"Метрики OpenMetrics: http://{exporter.host}:{exporter.port}/metrics")
+        return exporter
+
+    def start_stream(self, enabled=False):
+        if not enabled and os.environ.get("TECHCARE_STREAM", "0") == "0" \
+                and not self.data_manager.get_setting('stream_enabled'):
+            return None
+        server = StreamServer(self.data_manager.get_setting('stream_address'))
+        try:
+            address = server.start()
+        except OSError as e:
+            print(f"Не вдалося запустити потік метрик: {e}")
+            return None
+        print(f"Потік метрик: {address}")
+        return server
+
+    # ---------- цикл ----------
+    def install_signal_handlers(self):
+        def handler(signum, frame):
+            print(f"Отримано сигнал {signum}, завершення роботи", flush=True)
+            self._stop.set()
+
+        for name in ("SIGTERM", "SIGINT", "SIGHUP", "SIGBREAK"):
+            if hasattr(signal, name):
+                signal.signal(getattr(signal, name), handler)
+
+    def stop(self):
+        self._stop.set()
+
+    def run(self, run_for=None):
+        """Збирає знімки до сигналу (або run_for секунд), потім shutdown()"""
+        if self.outbox:
+            self.outbox.start()
+        deadline = None if run_for is None else time.monotonic() + run_for
+        next_health = time.monotonic()
+        try:
+            while not self._stop.is_set():
+                started = time.monotonic()
+                try:
+                    data = self.collect()
+                    if started >= next_health:
+                        next_health = started + HEALTH_INTERVAL
+                        measure_time("Check system health (headless)", lambda: self.check_health(data))
+                except Exception as e:
+                    print(f"[ERROR] headless collector: {e}")
+                if deadline is not None and time.monotonic() >= deadline:
+                    break
+                self._stop.wait(max(0.0, COLLECT_INTERVAL - (time.monotonic() - started)))
+        finally:
+            self.shutdown()
+
+    def collect(self):
+        data = get_system_data()
+        self.state['current_data'] = data
+        seq = data.get('seq')
+        if seq is None or seq != self.state['last_saved_seq']:
+            self.state['last_saved_seq'] = seq
+            self.data_manager.save_system_data(data)
+        if self.exporter:
+            self.exporter.update(data, self.state['last_health'])
+        if self.stream:
+            self.stream.publish(data)
+        self.warm_cache.save_if_due(self.warm_state)
+        return data
+
+    def check_health(self, data):
+        health = self.ai_engine.predict_system_health(data)
+        self.state['last_health'] = health
+        for warning in health['warnings']:
+            if any(word in warning.lower() for word in CRITICAL_WORDS):
+                self.alert("Критичне попередження!", warning, key='critical')
+                break
+        return health
+
+    def alert(self, title, message, key):
+        """Попередження в журнал і, якщо задано адресу, на email; не частіше ALERT_COOLDOWN"""
+        now = time.time()
+        if now - self.state['last_alerts'].get(key, 0) < ALERT_COOLDOWN:
+            return False
+        self.state['last_alerts'][key] = now
+        print(f"[ALERT] {title} {message}", flush=True)
+        if self.outbox:
+            self.outbox.send_email(self.alert_email, f"TechCare: {title}", message)
+        return True
+
+    def warm_state(self):
+        return build_state(self.state['current_data'], self.state['last_health'])
+
+    def shutdown(self):
+        """Зупиняє сервіси і дописує стан на диск"""
+        if self.exporter:
+            self.exporter.stop()
+        if self.stream:
+            self.stream.stop()
+        if self.outbox:
+            self.outbox.stop()
+        if self.state.get('current_data'):
+            self.warm_cache.save(self.warm_state())
+        TRACER.flush()
+
+
+def compare(seconds=60):
+    """Запускає GUI-збірку і збірку без інтерфейсу на seconds секунд і порівнює ресурси"""
+    import subprocess
+    results = {}
+    for name, script in (('headless', "headless.py"), ('gui', "main.py")):
+        proc = subprocess.run([sys.executable, script, "--run-for", str(seconds), "--report"], cwd=HERE,
+                              capture_output=True, text=True, timeout=seconds + 120)
+        report = None
+        for line in proc.stdout.splitlines():
+            if line.startswith("RESOURCES "):
+                report = json.loads(line[len("RESOURCES "):])
+        if report is None:
+            lines = (proc.stderr or proc.stdout).strip().splitlines()
+            report = {'error': lines[-1] if lines else f"код виходу {proc.returncode}"}
+        results[name] = report
+    gui, headless = results['gui'], results['headless']
+    if gui.get('rss_mb') and headless.get('rss_mb'):
+        results['rss_saved_mb'] = round(gui['rss_mb'] - headless['rss_mb'], 1)
+    if 'cpu_s' in gui and 'cpu_s' in headless:
+        results['cpu_saved_s'] = round(gui['cpu_s'] - headless['cpu_s'], 3)
+    return results
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="TechCare без інтерфейсу")
+    parser.add_argument("--metrics-port", type=int, help="порт /metrics (інакше TECHCARE_METRICS_PORT або налаштування)")
+    parser.add_argument("--stream", action="store_true", help="увімкнути локальний потік знімків")
+    parser.add_argument("--alert-email", help="адреса для критичних попереджень (інакше налаштування alert_email)")
+    parser.add_argument("--run-for", type=float, metavar="СЕКУНДИ", help="завершитися через N секунд")
+    parser.add_argument("--report", action="store_true", help="після завершення вивести RESOURCES {json}")
+    parser.add_argument("--compare", type=float, metavar="СЕКУНДИ",
+                        help="порівняти RSS і CPU з GUI-збіркою за N секунд роботи")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        print(json.dumps(compare(args.compare), ensure_ascii=False, indent=2))
+        return 0
+
+    lock = singleton_lock()
+    if lock is None:
+        print("TechCare вже запущено (mutex)")
+        return 1
+    # kill -USR2 <pid> запускає профілювання на 10 секунд (Linux/macOS)
+    install_signal_handler()
+    app = HeadlessApp(args.metrics_port, args.stream, args.alert_email)
+    app.install_signal_handlers()
+    print("TechCare без інтерфейсу запущено", flush=True)
+    app.run(args.run_for)
+    if args.report:
+        print("RESOURCES " + json.dumps(resource_report(), ensure_ascii=False), flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,13 +10,23 @@ from datetime import datetime
 import psutil
 import time
 import ctypes
-import win32gui
-import win32con
+try:
+    import win32gui
+    import win32con
+except ImportError:  # не Windows або без pywin32: кількість вікон недоступна
+    win32gui = win32con = None
 
-import GPUtil
+from self_monitor import COUNTERS
+
+# історія бенчмарків — окремим компактним файлом, щоб не роздувати
+# techcare_data.json, який перезаписується на кожному знімку
+BENCH_FILE = "techcare_bench.json"
+# сирі виміри лишаються тільки в останніх запусках (база для порівняння), старші — лише зведення
+BENCH_SAMPLE_RUNS = 20
 
 def get_gpu_load():
     try:
+        import GPUtil  # не під час запуску: модуль тягне subprocess/distutils
         gpus = GPUtil.getGPUs()
         if gpus:
             return gpus[0].load * 100  # Повертає % завантаження першої відеокарти
@@ -58,12 +68,16 @@ def is_task_window(hwnd):
 
 # Функції для роботи з вікнами
 def print_window_titles():
+    if win32gui is None:
+        return
     def callback(hwnd, extra):
         if is_task_window(hwnd):
             print(win32gui.GetWindowText(hwnd))
     win32gui.EnumWindows(callback, None)
         
 def get_window_count():
+    if win32gui is None:
+        return None
     windows = []
     def callback(hwnd, extra):
         if is_task_window(hwnd):
@@ -76,6 +90,8 @@ class JsonDataManager:
     def __init__(self):
         """Ініціалізація простого менеджера даних"""
         self.data_file = "techcare_data.json"
+        self.bench_file = BENCH_FILE
+        self._bench_runs = None  # читається при першому зверненні
         self.load_data()
     
     def load_data(self):
@@ -102,8 +118,11 @@ class JsonDataManager:
     def save_data(self):
         """Збереження даних у файл"""
         try:
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(self.data, f, ensure_ascii=False, indent=2)
+            payload = json.dumps(self.data, ensure_ascii=False, indent=2).encode('utf-8')
+            with open(self.data_file, 'wb') as f:
+                f.write(payload)
+            COUNTERS.add('json_saves')
+            COUNTERS.add('json_bytes_written', len(payload))
         except Exception as e:
             print(f"Помилка збереження: {e}")
     
@@ -115,7 +134,8 @@ class JsonDataManager:
                 'cpu_percent': data.get('cpu_percent', 0),
                 'ram_percent': data.get('ram_percent', 0),
                 'disk_percent': data.get('disk_percent', 0),
-                
+                'disk_free': data.get('disk_free'),
+                'ram_available': data.get('ram_available'),
             }
             self.data['system_history'].append(record)
             
@@ -168,6 +188,47 @@ class JsonDataManager:
     
     
     
+    def save_benchmark_run(self, run, limit=200):
+        """Збереження результату бенчмарку"""
+        try:
+            runs = self.get_benchmark_runs()
+            runs.append(run)
+            del runs[:-limit]
+            for old in runs[:-BENCH_SAMPLE_RUNS]:
+                for metric in old.get('metrics', {}).values():
+                    metric.pop('samples', None)
+            self._save_benchmark_runs()
+            return True
+        except Exception:
+            return False
+
+    def get_benchmark_runs(self):
+        """Усі збережені результати бенчмарків"""
+        if self._bench_runs is None:
+            try:
+                with open(self.bench_file, 'r', encoding='utf-8') as f:
+                    self._bench_runs = json.load(f)
+            except (OSError, ValueError):
+                self._bench_runs = []
+            # старі версії тримали історію в techcare_data.json
+            legacy = self.data.pop('benchmark_history', None)
+            if legacy:
+                self._bench_runs = legacy + self._bench_runs
+                try:
+                    self._save_benchmark_runs()
+                    self.save_data()
+                except OSError as e:
+                    print(f"Помилка перенесення історії бенчмарків: {e}")
+        return self._bench_runs
+
+    def _save_benchmark_runs(self):
+        payload = json.dumps(self._bench_runs, ensure_ascii=False, separators=(",", ":")).encode('utf-8')
+        tmp = self.bench_file + ".tmp"
+        with open(tmp, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp, self.bench_file)
+        COUNTERS.add('json_bytes_written', len(payload))
+
     def save_scheduled_task(self, task_data):
         """Збереження запланованого завдання"""
         return True
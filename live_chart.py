@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+"""
+Живий графік метрик: фігура і лінії створюються один раз, нові точки
+дописуються на місці, а перемальовуються тільки лінії (blitting).
+Вісь X — секунди відносно поточного моменту, тож межі осей не змінюються
+і фон (сітка, підписи) не треба малювати заново на кожному кадрі.
+Довгі діапазони історії проріджуються до ширини графіка (downsample.py)
+"""
+
+import sys
+import time
+from collections import deque
+
+from downsample import DOWNSAMPLE_CACHE
+
+# Кольори (як у gui.py)
+DARK_BG    = "#181D23"
+CARD_BG    = "#232A33"
+ACCENT     = "#80FFD0"
+ACCENT_2   = "#44A6FF"
+ACCENT_FADE = "#2A4D4D"
+TEXT_FADED = "#92A6B6"
+RED        = "#FF6384"
+YELLOW     = "#FFD580"
+GREEN      = "#B6FFB0"
+
+# (ключ, підпис, колір, функція значення з запису)
+DEFAULT_SERIES = [
+    ('cpu_percent', "CPU (%)", GREEN, None),
+    ('ram_percent', "RAM (%)", RED, None),
+    ('disk_percent', "Disk (%)", YELLOW, None),
+    ('ai_score', "AI Health Score", ACCENT_2,
+     lambda r: 100 - (r.get('cpu_percent', 0) + r.get('ram_percent', 0)) / 2),
+]
+
+
+class LiveChart:
+    """Графік, що оновлюється інкрементально
+
+    master=None — без Tk (FigureCanvasAgg), для бенчмарку і тестів
+    """
+
+    def __init__(self, master=None, series=None, window_seconds=600, capacity=None,
+                 figsize=(7, 3.4), title="Тренд системи"):
+        from matplotlib.figure import Figure
+
+        self.series = series or DEFAULT_SERIES
+        self.window_seconds = window_seconds
+        self.last_timestamp = None
+        self._bucket_start = None
+        self.full_draws = 0
+        self.blits = 0
+        self._background = None
+
+        # Figure без pyplot: не потрапляє в глобальний реєстр фігур і не тече
+        self.figure = Figure(figsize=figsize, facecolor=DARK_BG)
+        self.ax = self.figure.add_subplot(111)
+        self._style(title)
+        self.lines = {}
+        for key, label, color, _ in self.series:
+            line, = self.ax.plot([], [], label=label, color=color, lw=2, animated=True)
+            self.lines[key] = line
+        self.ax.legend(loc="upper left", facecolor=DARK_BG, edgecolor=ACCENT_FADE,
+                       labelcolor=ACCENT, fontsize=8)
+        # точок у вікні не більше, ніж пікселів по ширині осей (із запасом на min/max)
+        self.pixel_width = max(16, int(self.ax.bbox.width))
+        capacity = capacity or 2 * self.pixel_width
+        self.points = {key: (deque(maxlen=capacity), deque(maxlen=capacity)) for key, *_ in self.series}
+
+        if master is not None:
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+            self.canvas = FigureCanvasTkAgg(self.figure, master=master)
+            self.widget = self.canvas.get_tk_widget()
+        else:
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            self.canvas = FigureCanvasAgg(self.figure)
+            self.widget = None
+        # після кожного повного малювання (перший показ, зміна розміру) зберігаємо фон
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+
+    def _style(self, title):
+        ax = self.ax
+        ax.set_facecolor(CARD_BG)
+        ax.set_xlim(-self.window_seconds, 0)
+        ax.set_xlabel(self._xlabel(), color=TEXT_FADED)
+        ax.set_ylim(0, 100)
+        ax.set_title(title, color=ACCENT, fontsize=12, fontweight='bold')
+        ax.tick_params(colors=TEXT_FADED)
+        ax.grid(color=ACCENT_FADE, alpha=0.5, lw=0.6)
+        for spine in ax.spines.values():
+            spine.set_color(ACCENT_FADE)
+        self.figure.tight_layout()
+
+    def _xlabel(self):
+        if self.window_seconds >= 2 * 86400:
+            return "днів тому"
+        if self.window_seconds >= 2 * 3600:
+            return "годин тому"
+        if self.window_seconds >= 1200:
+            return "хвилин тому"
+        return "секунд тому"
+
+    def _x_scale(self):
+        return {"днів тому": 86400, "годин тому": 3600, "хвилин тому": 60}.get(self._xlabel(), 1)
+
+    # ---------- дані ----------
+    def append(self, timestamp, record):
+        """Додає одну точку (timestamp — секунди epoch)
+
+        На довгих діапазонах точки, ближчі за один піксель, зливаються:
+        лишається значення, що найбільше відхиляється від попередньої точки (піки не губляться)
+        """
+        if self.last_timestamp is not None and timestamp <= self.last_timestamp:
+            return False
+        self.last_timestamp = timestamp
+        step = self.window_seconds / self.pixel_width
+        merge = self._bucket_start is not None and timestamp - self._bucket_start < step
+        if not merge:
+            self._bucket_start = timestamp
+        for key, _, _, getter in self.series:
+            value = getter(record) if getter else record.get(key)
+            if value is None:
+                continue
+            xs, ys = self.points[key]
+            if merge and len(xs) >= 2 and xs[-1] >= self._bucket_start:
+                if abs(value - ys[-2]) >= abs(ys[-1] - ys[-2]):
+                    xs[-1], ys[-1] = timestamp, value
+            else:
+                xs.append(timestamp)
+                ys.append(value)
+            # точки, що вийшли за ліву межу, не малюємо (одну лишаємо для неперервності лінії)
+            while len(xs) > 1 and xs[1] < timestamp - self.window_seconds:
+                xs.popleft()
+                ys.popleft()
+        return True
+
+    def extend(self, records):
+        """Додає записи історії (timestamp як ISO-рядок або число)"""
+        from forecast import parse_timestamp
+        for record in records:
+            ts = parse_timestamp(record.get('timestamp'))
+            if ts is not None:
+                self.append(ts, record)
+
+    def load(self, records, window_seconds=None, now=None, cache=DOWNSAMPLE_CACHE):
+        """Показує діапазон історії, проріджений до ширини графіка (LTTB, з кешем)"""
+        from forecast import parse_timestamp
+        if window_seconds:
+            self.window_seconds = window_seconds
+            self.ax.set_xlim(-window_seconds / self._x_scale(), 0)
+            self.ax.set_xlabel(self._xlabel(), color=TEXT_FADED)
+        if now is None:
+            last = parse_timestamp(records[-1].get('timestamp')) if records else None
+            now = last or time.time()
+        start = now - self.window_seconds
+        for key, _, _, getter in self.series:
+            xs, ys = cache.get(key, records, start, now, self.pixel_width, value=getter)
+            px, py = self.points[key]
+            px.clear()
+            py.clear()
+            px.extend(xs)
+            py.extend(ys)
+        self.last_timestamp = now
+        self._bucket_start = now
+        self.invalidate()
+
+    # ---------- малювання ----------
+    def _on_draw(self, event):
+        self._background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._draw_lines()
+
+    def _draw_lines(self, now=None):
+        now = now if now is not None else (self.last_timestamp or time.time())
+        scale = self._x_scale()
+        for key, line in self.lines.items():
+            xs, ys = self.points[key]
+            line.set_data([(t - now) / scale for t in xs], ys)
+            self.ax.draw_artist(line)
+
+    def redraw(self, now=None):
+        """Кадр: відновлює фон, малює лише лінії; повне малювання тільки за потреби"""
+        if self._background is None:
+            self.full_draws += 1
+            self.canvas.draw()  # викличе _on_draw
+            return
+        self.canvas.restore_region(self._background)
+        self._draw_lines(now)
+        self.canvas.blit(self.ax.bbox)
+        self.blits += 1
+
+    def invalidate(self):
+        """Наступний кадр — повне малювання (напр. після зміни розміру)"""
+        self._background = None
+
+    def close(self):
+        if self.widget is not None:
+            self.widget.destroy()
+        self.figure.clear()
+
+
+def _rss_kb():
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 1024
+    except Exception:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            import os
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024
+    except Exception:
+        return None
+
+
+def run_benchmark(minutes=60, interval=2.0, window_seconds=600, blit=True):
+    """Моделює minutes хвилин потоку знімків (кадр на кожен знімок) без Tk"""
+    import gc
+    import math
+    import random
+
+    rng = random.Random(1)
+    chart = LiveChart(window_seconds=window_seconds)
+    samples = int(minutes * 60 / interval)
+    start_ts = 1_700_000_000.0
+    chart.redraw(start_ts)
+    chart.redraw(start_ts)
+    gc.collect()
+    base_objects = len(gc.get_objects())
+    base_rss = _rss_kb()
+    frame_ns = []
+    t0 = time.perf_counter()
+    for i in range(samples):
+        ts = start_ts + i * interval
+        record = {
+            'cpu_percent': 30 + 25 * math.sin(i / 50) + rng.uniform(-5, 5),
+            'ram_percent': 55 + rng.uniform(-3, 3),
+            'disk_percent': 60 + i / samples,
+        }
+        t = time.perf_counter_ns()
+        chart.append(ts, record)
+        if not blit:
+            chart.invalidate()
+        chart.redraw(ts)
+        frame_ns.append(time.perf_counter_ns() - t)
+    elapsed = time.perf_counter() - t0
+    gc.collect()
+    rss = _rss_kb()
+    frame_ns.sort()
+    return {
+        'mode': 'blit' if blit else 'full',
+        'samples': samples,
+        'simulated_minutes': minutes,
+        'fps': round(samples / elapsed, 1),
+        'frame_p50_ms': round(frame_ns[len(frame_ns) // 2] / 1e6, 3),
+        'frame_p99_ms': round(frame_ns[int(len(frame_ns) * 0.99)] / 1e6, 3),
+        'rss_growth_kb': round(rss - base_rss, 1) if rss is not None and base_rss is not None else None,
+        'object_growth': len(gc.get_objects()) - base_objects,
+        'full_draws': chart.full_draws,
+        'blits': chart.blits,
+    }
+
+
+def main(argv=None):
+    import argparse
+    import json
+    parser = argparse.ArgumentParser(description="Бенчмарк живого графіка")
+    parser.add_argument("--minutes", type=float, default=60, help="скільки хвилин потоку моделювати")
+    parser.add_argument("--window", type=int, default=600, help="ширина вікна графіка, секунди")
+    parser.add_argument("--compare", action="store_true", help="порівняти з повним перемальовуванням")
+    args = parser.parse_args(argv)
+
+    results = [run_benchmark(args.minutes, window_seconds=args.window)]
+    if args.compare:
+        results.append(run_benchmark(args.minutes, window_seconds=args.window, blit=False))
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
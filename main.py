@@ -3,14 +3,16 @@
 TechCare - Desktop застосунок для моніторингу ПК з Smart-нагадуванням
 """
 
+import time
+
+# точка відліку для вимірювання запуску (див. startup_bench.py)
+_PROCESS_T0 = time.perf_counter()
+
 import tkinter as tk
 import threading
-import time
 import json
 import sys
 import multiprocessing
-import ctypes
-import ctypes.wintypes
 from datetime import datetime
 import os
 
@@ -21,29 +23,28 @@ from ai import SimpleAI
 from achievements import SimpleAchievements
 from tests import SimpleTests
 from gui import create_gui
+from tracing import TRACER, measure_time
+from ui_watchdog import UiWatchdog
+from profiler import install_signal_handler, profile_to_file
+from exporter import MetricsExporter
+from stream import StreamServer
+from warm_cache import WarmCache, build_state
+from headless import resource_report, singleton_lock
+
+IMPORT_MS = (time.perf_counter() - _PROCESS_T0) * 1000
 
 def singleton_win_mutex():
-    mutex_name = "TechCareAppMutex2025"
-    mutex = ctypes.windll.kernel32.CreateMutexW(None, ctypes.wintypes.BOOL(True), mutex_name)
-    last_error = ctypes.windll.kernel32.GetLastError()
-    if last_error == 183:
+    # Windows — іменований mutex, інші системи — блокування файлу; спільне з headless.py
+    global _SINGLETON
+    _SINGLETON = singleton_lock()
+    if _SINGLETON is None:
         print("TechCare вже запущено (mutex)")
         sys.exit(0)
 
-def measure_time(label, func):
-    start_time = time.perf_counter()
-    result = func()
-    end_time = time.perf_counter()
-    elapsed_time = end_time - start_time
-    output = f"{label}: {elapsed_time:.4f} секунд"
-    print(output)
-    with open('timings.log', 'a', encoding='utf-8') as f:
-        f.write(output + '\n')
-    return result
-
 class TechCareApp:
-    def __init__(self):
+    def __init__(self, startup_report=False, run_for=None):
         print("[DEBUG] App instance created")
+        self.startup_report = startup_report
         self.gui = create_gui(self.update_data)
 
         self.gui.loading_screen.update_progress(20, "Ініціалізація модулів...")
@@ -65,21 +66,48 @@ class TechCareApp:
         }
 
         self.state = {
-            'last_notification': {},
             'monitoring_active': True,
-            'current_data': {}
+            'current_data': {},
+            'last_saved_seq': None,
+            'last_health': None
         }
+        # скільки секунд знімок вважається актуальним для всіх споживачів
+        self.snapshot_max_age = 3
+        # функції, які отримують кожен новий знімок у потоці Tk (живі графіки)
+        self.snapshot_listeners = []
 
         self.gui.loading_screen.update_progress(60, "Запуск сервісів...")
 
+        self.exporter = self.start_exporter()
+        self.stream = self.start_stream()
+
         self.gui.set_app_ref(self)
         self.gui.root.protocol("WM_DELETE_WINDOW", self.shutdown)
 
+        # до першого живого знімка показуємо останній відомий стан (кеш теплого старту)
+        self.warm_cache = WarmCache()
+        warm_state = self.warm_cache.load()
+        history = self.data_manager.get_historical_data()
+        if warm_state:
+            self.gui.show_warm_state(warm_state)
+        elif history:
+            self.gui.show_cached_metrics(history[-1])
+
+        # сторож циклу подій: затримка інтерфейсу і стеки зависань
+        # у треї чи згорнутому вікні серцебиття рідшає — менше пробуджень у простої
+        self.watchdog = UiWatchdog(self.gui.root, visible=lambda: self.gui.visibility.window_visible)
+        self.watchdog.start()
+
+        # перший збір іде у пулі, вікно показується одразу, не чекаючи його
         self.update_data()
         self.auto_collect_running = False
 
-        self.gui.root.after(500, self.gui.finish_loading)
+        self.startup_marks = {'import_ms': IMPORT_MS}
+        self.gui.root.after_idle(self.finish_startup)
         self.start_auto_collect()
+        if run_for:
+            # для вимірювань: завершитися через run_for секунд (див. headless.py --compare)
+            self.gui.root.after(int(run_for * 1000), self.shutdown)
 
         print("Кінець ініціалізації TechCareApp")
     
@@ -87,12 +115,92 @@ class TechCareApp:
         while self.auto_collect_running:
             try:
                 data = get_system_data()
-                self.data_manager.save_system_data(data)
+                self.state['current_data'] = data
+                self.save_snapshot(data)
+                if self.exporter:
+                    self.exporter.update(data, self.state['last_health'])
+                if self.stream:
+                    self.stream.publish(data)
+                self.warm_cache.save_if_due(lambda: self.warm_state(data))
+                for listener in self.snapshot_listeners:
+                    self.gui.tasks.post(listener, data)
             except Exception as e:
                 print(f"[ERROR] background_collector: {e}")
             time.sleep(2)
 
+    def warm_state(self, data=None):
+        """Стан для кешу теплого старту: знімок, прогноз і склад ПК"""
+        metrics = dict(data or self.state.get('current_data') or {})
+        metrics.update(self.gui.last_metrics)
+        return build_state(metrics, self.state['last_health'], self.gui.hardware_info)
+
+    def add_snapshot_listener(self, listener):
+        """listener(data) викликатиметься в потоці Tk після кожного фонового збору"""
+        self.snapshot_listeners = self.snapshot_listeners + [listener]
+
+    def remove_snapshot_listener(self, listener):
+        self.snapshot_listeners = [l for l in self.snapshot_listeners if l is not listener]
+
+    def start_exporter(self):
+        """Ендпоінт /metrics, якщо задано порт (TECHCARE_METRICS_PORT або налаштування exporter_port)"""
+        port = os.environ.get("TECHCARE_METRICS_PORT") or self.data_manager.get_setting('exporter_port')
+        if not port:
+            return None
+        exporter = MetricsExporter(port=int(port))
+        try:
+            exporter.start()
+        except OSError as e:
+            print(f"Не вдалося запустити експорт метрик на порту {port}: {e}")
+            return None
+        print(f"Метрики OpenMetrics: http://{exporter.host}:{exporter.port}/metrics")
+        return exporter
+
+    def start_stream(self):
+        """Локальний потік знімків для інших програм (TECHCARE_STREAM=1 або налаштування stream_enabled)"""
+        if os.environ.get("TECHCARE_STREAM", "0") == "0" and not self.data_manager.get_setting('stream_enabled'):
+            return None
+        server = StreamServer(self.data_manager.get_setting('stream_address'))
+        try:
+            address = server.start()
+        except OSError as e:
+            print(f"Не вдалося запустити потік метрик: {e}")
+            return None
+        print(f"Потік метрик: {address}")
+        return server
+
+    def get_snapshot(self):
+        """Останній знімок системи; новий збирається тільки якщо старий застарів"""
+        data = self.state.get('current_data') or {}
+        if data.get('timestamp') and time.time() - data['timestamp'] <= self.snapshot_max_age:
+            return data
+        data = get_system_data()
+        self.state['current_data'] = data
+        return data
+
+    def save_snapshot(self, data):
+        """Зберігає знімок в історію один раз"""
+        seq = data.get('seq')
+        if seq is not None and seq == self.state['last_saved_seq']:
+            return False
+        self.state['last_saved_seq'] = seq
+        return self.data_manager.save_system_data(data)
+
+    def finish_startup(self):
+        """Показ головного вікна; інтерактивність — коли цикл подій уперше вільний"""
+        self.gui.finish_loading()
+        self.startup_marks['first_paint_ms'] = (time.perf_counter() - _PROCESS_T0) * 1000
+        self.gui.root.after_idle(self._mark_interactive)
+
+    def _mark_interactive(self):
+        self.startup_marks['interactive_ms'] = (time.perf_counter() - _PROCESS_T0) * 1000
+        TRACER.record("Startup: interactive", self.startup_marks['interactive_ms'] * 1e6)
+        if self.startup_report:
+            print("STARTUP " + json.dumps({k: round(v, 1) for k, v in self.startup_marks.items()}), flush=True)
+            self.shutdown()
+
     def start_auto_collect(self):
+        if self.auto_collect_running:
+            return  # збирач уже працює
         self.auto_collect_running = True
         threading.Thread(target=self.background_collector, daemon=True).start()
 
@@ -116,16 +224,17 @@ class TechCareApp:
         try:
             import pythoncom
             pythoncom.CoInitialize()
-            data = measure_time("Get system data (startup diagnosis)", get_system_data)
+            data = measure_time("Get system data (startup diagnosis)", self.get_snapshot)
             health = measure_time("Predict system health (startup diagnosis)",
                                   lambda: self.ai_engine.predict_system_health(data))
+            self.state['last_health'] = health
 
             if health['warnings']:
                 message = "\n".join(health['warnings'][:3])
-                self.gui.root.after(0, lambda: self.gui.show_notification("Попередження при запуску", message))
+                self.gui.notifications.notify("Попередження при запуску", message, key='startup')
         except Exception as e:
             print(f"Помилка при автодіагностиці: {e}")
-            self.gui.root.after(0, lambda: self.gui.show_notification("TechCare запущено", "Програма готова до роботи!"))
+            self.gui.notifications.notify("TechCare запущено", "Програма готова до роботи!", key='startup')
         finally:
             try:
                 import pythoncom
@@ -155,18 +264,18 @@ class TechCareApp:
 
     def check_system_health(self):
         try:
-            data = self.measure_time("Get system data (health check)", get_system_data)
+            data = self.measure_time("Get system data (health check)", self.get_snapshot)
             # self.save_history_entry(data)
-            self.state['current_data'] = data
             # self.generate_smart_reminders(data)
-            self.measure_time("Save system data", lambda: self.data_manager.save_system_data(data))
+            self.measure_time("Save system data", lambda: self.save_snapshot(data))
             health = self.measure_time("Predict system health (health check)", lambda: self.ai_engine.predict_system_health(data))
+            self.state['last_health'] = health
             self.measure_time("Check thresholds", lambda: self.check_thresholds(data, health))
 
             self.data_manager.save_user_activity("diagnostics_done", 1, "Системна діагностика")
             stats = self.data_manager.get_user_stats()
             self.achievements.check_achievements(stats)
-            self.gui.update_achievements_display()
+            self.gui.tasks.post(self.gui.update_achievements_display)
 
         except Exception as e:
             print(f"Помилка перевірки системи: {e}")
@@ -176,28 +285,55 @@ class TechCareApp:
         print("[DEBUG] Shutting down monitoring threads")
             # сигналізуємо потоку завершитись
         self.state['monitoring_active'] = False
+        self.watchdog.stop()
+        self.gui.tasks.shutdown()
+        if self.exporter:
+            self.exporter.stop()
+        if self.stream:
+            self.stream.stop()
             # чекаємо максимум 5 секунд, щоб потік відреагував
         if hasattr(self, 'monitor_thread'):
                 self.monitor_thread.join(timeout=5)
+        # недоставлені нагадування лишаються у файлі черги до наступного запуску
+        if self.gui.outbox:
+            self.gui.outbox.stop()
+        if self.state.get('current_data'):
+            self.warm_cache.save(self.warm_state())
+        # дописуємо трасування, що ще не потрапило у файл
+        TRACER.flush()
         # після цього чисто закриваємо GUI
         self.gui.root.destroy()
 
     def check_thresholds(self, data, health):
-        current_time = time.time()
+        # notify() потокобезпечний; пауза 10 хв на ключ — у менеджері сповіщень
         for warning in health['warnings']:
             if any(word in warning.lower() for word in ['охолодіть', 'перезапустіть', 'очистіть']):
-                if current_time - self.state['last_notification'].get('critical', 0) > 600:
-                    self.gui.root.after(0, lambda: self.gui.show_notification("Критичне попередження!", warning))
-                    self.state['last_notification']['critical'] = current_time
-                    break
+                self.gui.notifications.notify("Критичне попередження!", warning, key='critical', cooldown=600)
+                break
 
     def update_data(self):
+        """Збір даних у пулі, оновлення віджетів — у потоці Tk"""
+        self.gui.tasks.submit(self.collect_update_data, key="update_data",
+                              on_done=self.apply_update_data, on_error=self.update_data_failed)
+
+    def collect_update_data(self):
+        data = self.measure_time("Get system data (update data)", self.get_snapshot)
+        health = self.measure_time("Predict system health (update data)", lambda: self.ai_engine.predict_system_health(data))
+        self.state['last_health'] = health
+        stats = self.measure_time("Get user stats", lambda: self.data_manager.get_user_stats())
+        level = self.measure_time("Get user level", lambda: self.achievements.get_user_level(stats.get('total_points', 0)))
+        return data, health, stats, level
+
+    def update_data_failed(self, error):
+        print(f"Помилка оновлення даних: {error}")
+        self.gui.notifications.notify("Помилка", f"Не вдалося оновити дані: {error}",
+                                      key='update_failed', cooldown=300)
+
+    def apply_update_data(self, result):
+        data, health, stats, level = result
         try:
-            data = self.measure_time("Get system data (update data)", get_system_data)
-            self.state['current_data'] = data
             # self.generate_smart_reminders(data)
             self.measure_time("Update main metrics", lambda: self.gui.update_main_metrics(data))
-            health = self.measure_time("Predict system health (update data)", lambda: self.ai_engine.predict_system_health(data))
 
             health_color = '#00FF00' if health['health_score'] > 70 else '#FFFF00' if health['health_score'] > 40 else '#FF0000'
             self.measure_time("Update health label", lambda: self.gui.ai_tab.health_label.config(text=f"{health['health_score']}%", fg=health_color))
@@ -214,26 +350,46 @@ class TechCareApp:
                 for prediction in health['predictions']:
                     self.gui.ai_tab.predictions_text.insert(tk.END, f"• {prediction}\n")
 
-            stats = self.measure_time("Get user stats", lambda: self.data_manager.get_user_stats())
-            level = self.measure_time("Get user level", lambda: self.achievements.get_user_level(stats.get('total_points', 0)))
-            self.measure_time("Update level label", lambda: self.gui.level_label.config(text=f"Рівень {level} ({stats.get('total_points', 0)} очок)"))
+            if hasattr(self.gui, 'level_label'):  # вкладка досягнень будується при першому відкритті
+                self.measure_time("Update level label", lambda: self.gui.level_label.config(text=f"Рівень {level} ({stats.get('total_points', 0)} очок)"))
 
         except Exception as e:
-            print(f"Помилка оновлення даних: {e}")
-            self.gui.root.after(0, lambda err=e: self.gui.show_notification("Помилка", f"Не вдалося оновити дані: {err}"))
+            self.update_data_failed(e)
 
     
     
     
 
-def main():
+def parse_args(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="TechCare")
+    parser.add_argument("--profile", type=float, metavar="СЕКУНДИ",
+                        help="профілювати перші N секунд роботи (collapsed stacks у файл)")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="вивести час запуску (JSON) і завершитися, щойно вікно стане інтерактивним")
+    parser.add_argument("--run-for", type=float, metavar="СЕКУНДИ", help="завершитися через N секунд")
+    parser.add_argument("--report", action="store_true",
+                        help="після завершення вивести RESOURCES {json} (RSS, CPU; див. headless.py --compare)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
     print("Початок запуску програми")
+    # kill -USR2 <pid> запускає профілювання на 10 секунд (Linux/macOS)
+    install_signal_handler()
+    if args.profile:
+        profile_to_file(args.profile)
     start_time = time.perf_counter()
-    app_instance = measure_time("TechCareApp init", lambda: TechCareApp())
+    app_instance = measure_time("TechCareApp init", lambda: TechCareApp(startup_report=args.startup_report,
+                                                                        run_for=args.run_for))
     app_instance.start_auto_collect()
     measure_time("App run", lambda: app_instance.run())
     end_time = time.perf_counter()
+    TRACER.flush()
     print(f"Загальний час запуску: {end_time - start_time:.4f} секунд")
+    if args.report:
+        print("RESOURCES " + json.dumps(resource_report(_PROCESS_T0), ensure_ascii=False), flush=True)
 
 if __name__ == "__main__":
     singleton_win_mutex()
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+Тест пам'яті: пропускна здатність у стилі STREAM (copy/scale/add/triad)
+і затримка випадкового доступу через pointer chasing, з перебором розмірів буфера
+"""
+
+import array
+import random
+import sys
+import time
+
+from benchmark import BenchmarkRunner
+
+try:
+    import numpy as np
+except ImportError:  # без numpy доступний тільки copy через bytearray
+    np = None
+
+KB = 1024
+MB = 1024 * KB
+
+# розміри для перебору: від L1 до набагато більше за кеш останнього рівня
+DEFAULT_SWEEP = [32 * KB, 256 * KB, 2 * MB, 8 * MB, 32 * MB, 128 * MB]
+# розмір одного масиву для основного заміру пропускної здатності
+DEFAULT_STREAM_SIZE = 64 * MB
+# кількість переходів у pointer chasing
+CHASE_STEPS = 200_000
+
+# байти, які STREAM зараховує на елемент для кожного ядра (8-байтові float)
+STREAM_BYTES = {'copy': 16, 'scale': 16, 'add': 24, 'triad': 24}
+# triad іде блоками: проміжний c*scalar лишається в кеші, тож через пам'ять
+# проходять лише читання b, c і запис a — рівно 24 байти на елемент
+TRIAD_BLOCK = 32 * KB
+
+
+class MemoryBenchmark:
+    """Пропускна здатність (ГБ/с) і затримка (нс) пам'яті"""
+
+    def __init__(self, runner=None, sweep=None, stream_size=DEFAULT_STREAM_SIZE, chase_steps=CHASE_STEPS):
+        self.runner = runner or BenchmarkRunner(warmup=1, min_reps=5, max_reps=30, max_seconds=3.0, target_rel_ci=0.03)
+        self.sweep = sweep or DEFAULT_SWEEP
+        self.stream_size = stream_size
+        self.chase_steps = chase_steps
+
+    # ---------- пропускна здатність ----------
+    def stream(self, size_bytes, kernels=('copy', 'scale', 'add', 'triad')):
+        """STREAM-ядра на трьох масивах по size_bytes кожен; {ядро: ГБ/с}"""
+        if np is None:
+            return self._bytearray_copy(size_bytes)
+
+        n = max(1, size_bytes // 8)
+        a = np.full(n, 1.0)
+        b = np.full(n, 2.0)
+        c = np.zeros(n)
+        scalar = 3.0
+        tmp = np.empty(min(n, TRIAD_BLOCK))
+
+        def copy():
+            np.copyto(c, a)
+
+        def scale():
+            np.multiply(c, scalar, out=b)
+
+        def add():
+            np.add(a, b, out=c)
+
+        def triad():
+            # a = b + scalar*c без повного проміжного масиву (два проходи numpy дали б 40 байт)
+            for lo in range(0, n, TRIAD_BLOCK):
+                hi = min(n, lo + TRIAD_BLOCK)
+                part = tmp[:hi - lo]
+                np.multiply(c[lo:hi], scalar, out=part)
+                np.add(b[lo:hi], part, out=a[lo:hi])
+
+        funcs = {'copy': copy, 'scale': scale, 'add': add, 'triad': triad}
+        result = {}
+        for name in kernels:
+            res = self.runner.run(f"stream_{name}", funcs[name])
+            result[name] = self._gbs(STREAM_BYTES[name] * n, res)
+        return result
+
+    def _bytearray_copy(self, size_bytes):
+        src = bytearray(size_bytes)
+        dst = bytearray(size_bytes)
+        view = memoryview(dst)
+
+        def copy():
+            view[:] = src
+
+        res = self.runner.run("stream_copy", copy)
+        return {'copy': self._gbs(2 * size_bytes, res)}
+
+    @staticmethod
+    def _gbs(nbytes, res):
+        median = res['stats']['median']
+        best = res['stats']['min']
+        return {
+            'gbs': round(nbytes / median, 2) if median else 0.0,  # байт/нс == ГБ/с
+            'best_gbs': round(nbytes / best, 2) if best else 0.0,
+            'n': res['stats']['n'],
+            'samples': [round(nbytes / v, 3) for v in res['samples'] if v],
+        }
+
+    # ---------- затримка ----------
+    def _chain(self, size_bytes):
+        """Один випадковий цикл по всіх елементах буфера (кожен елемент — індекс наступного)"""
+        n = max(2, size_bytes // 8)
+        if np is not None:
+            order = np.random.default_rng(1).permutation(n)
+            chain = np.empty(n, dtype=np.int64)
+            chain[order[:-1]] = order[1:]
+            chain[order[-1]] = order[0]
+            return memoryview(chain).cast('B').cast('q')
+        order = list(range(n))
+        random.Random(1).shuffle(order)
+        chain = array.array('q', bytes(8 * n))
+        for i in range(n - 1):
+            chain[order[i]] = order[i + 1]
+        chain[order[-1]] = order[0]
+        return chain
+
+    def latency(self, size_bytes):
+        """Середній час одного переходу в наносекундах"""
+        chain = self._chain(size_bytes)
+        steps = self.chase_steps
+        # прогрів: один прохід, щоб сторінки були відображені
+        i = 0
+        for _ in range(min(steps, len(chain))):
+            i = chain[i]
+        start = time.perf_counter_ns()
+        for _ in range(steps):
+            i = chain[i]
+        return (time.perf_counter_ns() - start) / steps
+
+    # ---------- повний набір ----------
+    def run(self, progress=None):
+        report = {
+            'numpy': np is not None,
+            'stream_size_mb': self.stream_size // MB,
+            'stream': None,
+            'sweep': [],
+        }
+        if progress:
+            progress("STREAM…")
+        report['stream'] = self.stream(self.stream_size)
+
+        baseline = None
+        for size in self.sweep:
+            if np is None and size > 32 * MB:
+                continue  # без numpy побудова ланцюга надто повільна
+            if progress:
+                progress(f"Буфер {size // KB} КБ…")
+            raw = self.latency(size)
+            if baseline is None:
+                # найменший буфер лежить у L1 — це вартість самого інтерпретатора
+                baseline = raw
+            bw = self.stream(size, kernels=('copy', 'triad') if np is not None else ('copy',))
+            report['sweep'].append({
+                'size_kb': size // KB,
+                'latency_ns': round(raw, 1),
+                'latency_over_l1_ns': round(max(0.0, raw - baseline), 1),
+                'copy_gbs': bw['copy']['gbs'],
+                'triad_gbs': bw['triad']['gbs'] if 'triad' in bw else None,
+            })
+        return report
+
+
+def main(argv=None):
+    import argparse
+    import json
+    parser = argparse.ArgumentParser(description="Тест пропускної здатності і затримки пам'яті")
+    parser.add_argument("--size-mb", type=int, default=DEFAULT_STREAM_SIZE // MB, help="розмір масиву STREAM")
+    parser.add_argument("--max-mb", type=int, default=128, help="найбільший буфер у переборі")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    sweep = [s for s in DEFAULT_SWEEP if s <= args.max_mb * MB]
+    report = MemoryBenchmark(sweep=sweep, stream_size=args.size_mb * MB).run(
+        progress=lambda msg: print(msg, file=sys.stderr))
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return 0
+    for name, res in report['stream'].items():
+        print(f"{name:6s}: {res['gbs']:7.2f} ГБ/с (найкраще {res['best_gbs']:.2f})")
+    print(f"{'буфер':>10s} {'затримка':>10s} {'понад L1':>10s} {'copy':>8s} {'triad':>8s}")
+    for row in report['sweep']:
+        triad = f"{row['triad_gbs']:8.2f}" if row['triad_gbs'] is not None else "     —"
+        print(f"{row['size_kb']:8d}КБ {row['latency_ns']:8.1f}нс {row['latency_over_l1_ns']:8.1f}нс "
+              f"{row['copy_gbs']:8.2f} {triad}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,20 +6,28 @@
 
 import psutil
 import os
-import clr
 from pathlib import Path
 
 
 
 import platform
 import time
+import itertools
 
+from self_monitor import COUNTERS, SELF_MONITOR
+
+# порядковий номер знімка — за ним кешуються результати аналізу
+_snapshot_seq = itertools.count(1)
 
 
 def get_system_data():
     
     """Отримуємо основні дані про систему"""
-    data = {}
+    data = {
+        'seq': next(_snapshot_seq),
+        'timestamp': time.time()
+    }
+    COUNTERS.add('get_system_data_calls')
     
     try:
         # CPU
@@ -30,6 +38,7 @@ def get_system_data():
         data['ram_percent'] = memory.percent
         data['ram_total'] = memory.total
         data['ram_used'] = memory.used
+        data['ram_available'] = memory.available
         
         # Диск
         disk = psutil.disk_usage('/')
@@ -132,13 +141,18 @@ def get_system_data():
             data['manufacturer'] = "Невідомо" 
             data['gpu_name'] = "Невідомо"
             data['battery_status'] = None
-        
+
+        # Власне споживання ресурсів TechCare
+        data['techcare'] = SELF_MONITOR.sample()
+
         return data
         
     except Exception as e:
         print(f"Помилка отримання даних: {e}")
         # повертаємо базові дані щоб програма не крашилась
         return {
+            'seq': data.get('seq'),
+            'timestamp': data.get('timestamp'),
             'cpu_percent': 0,
             'ram_percent': 0,
             'disk_percent': 0,
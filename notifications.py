@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+"""
+Менеджер сповіщень: невеликий пул toast-вікон, що перевикористовуються,
+черга зі злиттям сплесків в одне зведення, глобальне обмеження частоти
+(token bucket) і пауза між повтореннями для кожного ключа — в одному місці.
+Шторм попереджень коштує інтерфейсу не більше одного toast за раз
+"""
+
+import sys
+import threading
+import time
+import tkinter as tk
+from collections import deque
+
+from frames import Ramp, scheduler_for
+from self_monitor import COUNTERS
+
+# Кольори (як у gui.py)
+DARK_BG = "#181D23"
+ACCENT = "#80FFD0"
+
+TOAST_WIDTH = 340
+TOAST_HEIGHT = 88
+# скільки рядків показує зведення, решта — "і ще N"
+SUMMARY_LINES = 3
+
+
+class TokenBucket:
+    """capacity токенів, поповнюється на rate токенів за секунду"""
+
+    def __init__(self, rate, capacity, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = float(capacity)
+        self._last = clock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def take(self):
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def wait_time(self):
+        """Секунди до появи наступного токена"""
+        self._refill()
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+
+class _Toast:
+    """Одне toast-вікно; створюється раз і ховається між показами"""
+
+    def __init__(self, root, slot):
+        self.window = tk.Toplevel(root)
+        self.window.withdraw()
+        self.window.overrideredirect(True)
+        self.window.configure(bg=ACCENT)
+        self.window.attributes("-topmost", True)
+        self.slot = slot
+        self.busy = False
+        frame = tk.Frame(self.window, bg=ACCENT, bd=0)
+        frame.pack(fill="both", expand=True)
+        self.title = tk.Label(frame, font=("Segoe UI", 12, "bold"), bg=ACCENT, fg=DARK_BG, anchor="w")
+        self.title.pack(pady=(14, 2), padx=10, fill="x")
+        self.message = tk.Label(frame, font=("Segoe UI", 10), bg=ACCENT, fg=DARK_BG,
+                                wraplength=TOAST_WIDTH - 28, justify="left", anchor="w")
+        self.message.pack(pady=(2, 8), padx=14, fill="x")
+
+    def set_alpha(self, alpha):
+        self.window.attributes("-alpha", alpha)
+
+
+class NotificationManager:
+    """notify() можна викликати з будь-якого потоку; показ — лише в потоці Tk"""
+
+    def __init__(self, root, tasks=None, frames=None, pool_size=2, rate_per_min=4, burst=3,
+                 default_cooldown=3600, duration_ms=3400, tray=None, clock=time.monotonic):
+        self.root = root
+        self.tasks = tasks
+        self.frames = frames or scheduler_for(root)
+        self.pool_size = pool_size
+        self.default_cooldown = default_cooldown
+        self.duration_ms = duration_ms
+        self.tray = tray  # функція (title, message) для balloon-tip у треї
+        self.clock = clock
+        self.bucket = TokenBucket(rate_per_min / 60.0, burst, clock)
+        self._lock = threading.Lock()
+        self._last_sent = {}
+        self._queue = deque()
+        self._toasts = []
+        self._after_id = None
+        self._tk_thread = threading.get_ident()
+        self.stats = {'accepted': 0, 'suppressed': 0, 'merged': 0, 'shown': 0}
+
+    # ---------- API ----------
+    def can_alert(self, key, cooldown=None):
+        """True (і позначає час), якщо для key минула пауза між повтореннями"""
+        cooldown = self.default_cooldown if cooldown is None else cooldown
+        now = self.clock()
+        with self._lock:
+            last = self._last_sent.get(key)
+            if last is not None and now - last < cooldown:
+                return False
+            self._last_sent[key] = now
+            return True
+
+    def notify(self, title, message, key=None, cooldown=None, tray=False):
+        """Ставить сповіщення в чергу; з key — не частіше, ніж раз на cooldown секунд"""
+        if key is not None and not self.can_alert(key, cooldown):
+            self.stats['suppressed'] += 1
+            COUNTERS.add('notifications_suppressed')
+            return False
+        with self._lock:
+            self._queue.append((title, message, tray))
+            self.stats['accepted'] += 1
+        if threading.get_ident() == self._tk_thread:
+            self._kick()
+        elif self.tasks is not None:
+            self.tasks.post(self._kick)
+        return True
+
+    @property
+    def pending(self):
+        return len(self._queue)
+
+    # ---------- доставка ----------
+    def _kick(self, delay_ms=0):
+        if self._after_id is None:
+            self._after_id = self.root.after(delay_ms, self._drain)
+
+    def _drain(self):
+        self._after_id = None
+        if not self._queue:
+            return
+        toast = self._free_toast()
+        if toast is None:
+            return  # повторний запуск — коли звільниться вікно
+        if not self.bucket.take():
+            self._kick(int(self.bucket.wait_time() * 1000) + 1)
+            return
+        with self._lock:
+            batch = list(self._queue)
+            self._queue.clear()
+        if len(batch) == 1:
+            title, message, tray = batch[0]
+        else:
+            # сплеск зливається в одне зведення
+            self.stats['merged'] += len(batch) - 1
+            COUNTERS.add('notifications_merged', len(batch) - 1)
+            title = f"{len(batch)} сповіщень"
+            lines = [f"• {t}: {m}" for t, m, _ in batch[:SUMMARY_LINES]]
+            if len(batch) > SUMMARY_LINES:
+                lines.append(f"… і ще {len(batch) - SUMMARY_LINES}")
+            message = "\n".join(lines)
+            tray = any(item[2] for item in batch)
+        self._show(toast, title, message)
+        if tray and self.tray:
+            try:
+                self.tray(title, message)
+            except Exception as e:
+                print(f"Помилка сповіщення в треї: {e}")
+
+    def _free_toast(self):
+        for toast in self._toasts:
+            if not toast.busy:
+                return toast
+        if len(self._toasts) < self.pool_size:
+            toast = _Toast(self.root, len(self._toasts))
+            self._toasts.append(toast)
+            return toast
+        return None
+
+    def _show(self, toast, title, message):
+        self.stats['shown'] += 1
+        COUNTERS.add('notifications_shown')
+        toast.busy = True
+        toast.title.config(text=title)
+        toast.message.config(text=message)
+        height = max(TOAST_HEIGHT, 48 + 18 * (message.count("\n") + 1))
+        x = self.root.winfo_x() + (self.root.winfo_width() - TOAST_WIDTH) // 2
+        y = self.root.winfo_y() + 56 + toast.slot * (TOAST_HEIGHT + 8)
+        toast.window.geometry(f"{TOAST_WIDTH}x{height}+{x}+{y}")
+        toast.set_alpha(0.0)
+        toast.window.deiconify()
+        frames = self.frames
+
+        def release():
+            toast.window.withdraw()
+            toast.busy = False
+            self._kick()
+
+        def fade_out():
+            Ramp(frames, toast.set_alpha, 1.0, 0.0, 0.28, on_done=release)
+
+        # Fade-in, пауза, fade-out
+        Ramp(frames, toast.set_alpha, 0.0, 1.0, 0.18,
+             on_done=lambda: self.root.after(self.duration_ms, fade_out))
+
+
+def run_benchmark(alerts=1000, seconds=60.0):
+    """Шторм з alerts сповіщень за seconds секунд (модельований час, без Tk)"""
+    import heapq
+    import itertools
+
+    class FakeWidget:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def __getattr__(self, name):
+            return lambda *args, **kwargs: None
+
+    class FakeRoot(FakeWidget):
+        def __init__(self):
+            self.now = 0.0
+            self._timers = []
+            self._ids = itertools.count()
+
+        def after(self, ms, func, *args):
+            heapq.heappush(self._timers, (self.now + ms / 1000, next(self._ids), func, args))
+            return object()
+
+        def run_until(self, t):
+            while self._timers and self._timers[0][0] <= t:
+                self.now, _, func, args = heapq.heappop(self._timers)
+                func(*args)
+            self.now = t
+
+        def winfo_x(self):
+            return 0
+
+        winfo_y = winfo_width = winfo_x
+
+    root = FakeRoot()
+    original = (tk.Toplevel, tk.Frame, tk.Label)
+    tk.Toplevel = tk.Frame = tk.Label = FakeWidget
+    try:
+        # анімації завершуються миттєво: вимірюється лише логіка черги
+        frames = type("Frames", (), {"register": lambda self, animation: animation.step(float("inf"))})()
+        manager = NotificationManager(root, frames=frames, clock=lambda: root.now)
+        step = seconds / alerts
+        t0 = time.perf_counter()
+        for i in range(alerts):
+            root.run_until(i * step)
+            manager.notify(f"Попередження {i % 7}", "Високе навантаження", key=f"k{i % 50}", cooldown=30)
+        root.run_until(seconds + 120)
+        elapsed = time.perf_counter() - t0
+    finally:
+        tk.Toplevel, tk.Frame, tk.Label = original
+    return dict(manager.stats, alerts=alerts, windows=len(manager._toasts),
+                cpu_ms=round(elapsed * 1000, 1))
+
+
+def main(argv=None):
+    import argparse
+    import json
+    parser = argparse.ArgumentParser(description="Модель шторму сповіщень")
+    parser.add_argument("--alerts", type=int, default=1000)
+    parser.add_argument("--seconds", type=float, default=60.0)
+    args = parser.parse_args(argv)
+    print(json.dumps(run_benchmark(args.alerts, args.seconds), ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,653 @@
+# -*- coding: utf-8 -*-
+"""
+Черга вихідних нагадувань (email і календар Outlook) з фоновим потоком:
+одне SMTP-з'єднання на всі листи, листи одному адресату зливаються в
+дайджест, невдалі спроби повторюються з експоненційною затримкою, а сама
+черга зберігається у файлі й переживає перезапуск. Потік Tk лише ставить
+запис у чергу
+"""
+
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime
+
+from self_monitor import COUNTERS
+
+OUTBOX_FILE = "techcare_outbox.json"
+
+# облікові дані — лише з оточення (TECHCARE_SMTP_*) або налаштувань smtp_*;
+# без логіна й пароля email вимкнено
+SMTP_HOST = "smtp.gmail.com"
+SMTP_PORT = 465
+SMTP_SETTINGS = ('host', 'port', 'user', 'password')
+
+EMAIL = "email"
+CALENDAR = "calendar"
+
+# скільки секунд новий лист чекає на сусідів для дайджесту
+DIGEST_WINDOW = 2.0
+# найбільше нагадувань в одному дайджесті
+DIGEST_MAX = 20
+# повтори: RETRY_BASE * 2^(спроба-1) секунд, не більше RETRY_MAX, до MAX_ATTEMPTS спроб
+RETRY_BASE = 5.0
+RETRY_MAX = 600.0
+MAX_ATTEMPTS = 6
+# з'єднання закривається після стількох секунд простою; перед повторним
+# використанням після NOOP_AFTER секунд перевіряється командою NOOP
+IDLE_CLOSE = 60.0
+NOOP_AFTER = 15.0
+
+
+class PermanentError(Exception):
+    """Помилка, яку повтор не виправить (адресата відхилено, немає Outlook)"""
+
+
+def smtp_config(get_setting=None):
+    """Параметри SMTP або None, якщо логін чи пароль не задано
+
+    TECHCARE_SMTP_HOST/PORT/USER/PASSWORD мають перевагу над налаштуваннями
+    smtp_host/smtp_port/smtp_user/smtp_password (для Gmail — App Password)
+    """
+    config = {'host': SMTP_HOST, 'port': SMTP_PORT}
+    for key in SMTP_SETTINGS:
+        value = os.environ.get(f"TECHCARE_SMTP_{key.upper()}") or \
+            (get_setting(f"smtp_{key}") if get_setting else None)
+        if value:
+            config[key] = value
+    if not config.get('user') or not config.get('password'):
+        return None
+    config['port'] = int(config['port'])
+    return config
+
+
+def smtp_ssl_factory(host=SMTP_HOST, port=SMTP_PORT, timeout=20):
+    """Фабрика з'єднань для SmtpPool: SMTP поверх SSL"""
+    def connect():
+        import smtplib
+        return smtplib.SMTP_SSL(host, port, timeout=timeout)
+    return connect
+
+
+class SmtpPool:
+    """Одне SMTP-з'єднання, що перевикористовується між листами"""
+
+    def __init__(self, factory, user=None, password=None, idle_close=IDLE_CLOSE, clock=time.monotonic):
+        self.factory = factory
+        self.user = user
+        self.password = password
+        self.idle_close = idle_close
+        self.clock = clock
+        self.connections = 0
+        self._conn = None
+        self._last_used = 0.0
+
+    def get(self):
+        import smtplib
+        now = self.clock()
+        if self._conn is not None and now - self._last_used > NOOP_AFTER:
+            try:
+                if self._conn.noop()[0] != 250:
+                    self.discard()
+            except (smtplib.SMTPException, OSError):
+                self.discard()
+        if self._conn is None:
+            conn = self.factory()
+            try:
+                if self.password:
+                    conn.login(self.user, self.password)
+            except smtplib.SMTPAuthenticationError as e:
+                conn.close()
+                raise PermanentError(f"SMTP відхилив логін {self.user}: перевірте пароль") from e
+            except BaseException:
+                conn.close()
+                raise
+            self._conn = conn
+            self.connections += 1
+            COUNTERS.add('smtp_connections')
+        self._last_used = now
+        return self._conn
+
+    def discard(self):
+        """Закрити з'єднання без QUIT (після помилки)"""
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except OSError:
+                pass
+            self._conn = None
+
+    def close(self):
+        if self._conn is not None:
+            try:
+                self._conn.quit()
+            except Exception:
+                pass
+            self._conn = None
+
+    def close_if_idle(self):
+        if self._conn is not None and self.clock() - self._last_used > self.idle_close:
+            self.close()
+
+
+def _vbs_string(text):
+    # лапки у VBScript подвоюються; перенесення рядка — через vbCrLf
+    return '"' + str(text).replace('"', '""').replace("\n", '" & vbCrLf & "') + '"'
+
+
+def add_outlook_event(subject, body, start):
+    """Подія в календарі Outlook через VBScript; start — рядок ISO"""
+    import subprocess
+    import tempfile
+    when = datetime.fromisoformat(start)
+    vbs = f'''
+Set olApp = CreateObject("Outlook.Application")
+Set olNS = olApp.GetNamespace("MAPI")
+Set olCalendar = olNS.GetDefaultFolder(9)
+Set olAppt = olCalendar.Items.Add()
+olAppt.Subject = {_vbs_string(subject)}
+olAppt.Body = {_vbs_string(body)}
+olAppt.Start = "{when.strftime('%m/%d/%Y %H:%M')}"
+olAppt.Duration = 30
+olAppt.ReminderSet = True
+olAppt.Save
+'''
+    fd, path = tempfile.mkstemp(prefix="techcare_event_", suffix=".vbs")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-16") as f:
+            f.write(vbs)
+        try:
+            code = subprocess.run(["wscript.exe", "//B", path], timeout=60).returncode
+        except FileNotFoundError:
+            raise PermanentError("wscript.exe недоступний (потрібні Windows і Outlook)")
+        if code != 0:
+            raise RuntimeError(f"wscript.exe завершився з кодом {code}")
+    finally:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def build_digest(items):
+    """(тема, текст) одного листа для кількох нагадувань одному адресату"""
+    if len(items) == 1:
+        return items[0]['subject'], items[0]['body']
+    subject = f"TechCare: {len(items)} нагадувань"
+    parts = []
+    for item in items:
+        created = datetime.fromtimestamp(item['created']).strftime('%d.%m %H:%M')
+        parts.append(f"• {item['subject']} ({created})\n{item['body']}")
+    return subject, "\n\n".join(parts)
+
+
+class Outbox:
+    """Постійна черга нагадувань і потік доставки
+
+    send_email/add_event можна викликати з будь-якого потоку. on_sent(items)
+    і on_failed(item, error) викликаються в потоці доставки.
+    smtp — словник з smtp_config(); без нього (і без smtp_factory) email вимкнено
+    """
+
+    def __init__(self, path=OUTBOX_FILE, smtp=None, smtp_factory=None,
+                 calendar=add_outlook_event, digest_window=DIGEST_WINDOW, digest_max=DIGEST_MAX,
+                 retry_base=RETRY_BASE, max_attempts=MAX_ATTEMPTS, on_sent=None, on_failed=None):
+        smtp = smtp or {}
+        self.path = path
+        self.sender = smtp.get('user') or "techcare@localhost"
+        if smtp_factory is None and smtp:
+            smtp_factory = smtp_ssl_factory(smtp.get('host', SMTP_HOST), smtp.get('port', SMTP_PORT))
+        self.email_enabled = smtp_factory is not None
+        self.pool = SmtpPool(smtp_factory, smtp.get('user'), smtp.get('password'))
+        self.calendar = calendar
+        self.digest_window = digest_window
+        self.digest_max = digest_max
+        self.retry_base = retry_base
+        self.max_attempts = max_attempts
+        self.on_sent = on_sent
+        self.on_failed = on_failed
+        self.stats = {'queued': 0, 'sent': 0, 'messages': 0, 'events': 0, 'retries': 0, 'failed': 0}
+        self._items = []
+        self._cond = threading.Condition()
+        self._dirty = False
+        self._thread = None
+        self.running = False
+
+    # ---------- API ----------
+    def start(self):
+        """Завантажує збережену чергу і запускає потік доставки"""
+        with self._cond:
+            # поставлене до запуску йде після збереженого
+            self._items = self._load() + self._items
+            self._dirty = True
+        self.running = True
+        self._thread = threading.Thread(target=self._loop, name="outbox", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=5):
+        """Зупиняє потік; недоставлене лишається у файлі до наступного запуску"""
+        if self._thread is None:
+            return  # не запускалась — файл черги не чіпаємо
+        with self._cond:
+            self.running = False
+            self._cond.notify()
+        self._thread.join(timeout=timeout)
+        self.pool.close()
+        with self._cond:
+            self._save()
+
+    def send_email(self, to, subject, body):
+        """id запису або None, якщо email не налаштовано"""
+        if not self.email_enabled:
+            print("Email не налаштовано: задайте smtp_user і smtp_password")
+            return None
+        return self._enqueue({'kind': EMAIL, 'to': to, 'subject': subject, 'body': body},
+                             delay=self.digest_window)
+
+    def add_event(self, subject, body, start):
+        """start — datetime початку події"""
+        return self._enqueue({'kind': CALENDAR, 'subject': subject, 'body': body,
+                              'start': start.isoformat(timespec='minutes')})
+
+    @property
+    def pending(self):
+        with self._cond:
+            return len(self._items)
+
+    def wait_idle(self, timeout=None):
+        """Чекає, доки черга спорожніє; False — якщо вийшов час"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._items:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def _enqueue(self, item, delay=0.0):
+        now = time.time()
+        item.update(id=uuid.uuid4().hex[:12], created=now, attempts=0, next_try=now + delay)
+        with self._cond:
+            if item['kind'] == EMAIL:
+                # вікно дайджесту відкриває перший лист адресату; наступні
+                # до його закриття йдуть разом з ним
+                for other in self._items:
+                    if other['kind'] == EMAIL and other['to'] == item['to'] \
+                            and other['attempts'] == 0 and other['next_try'] > now:
+                        item['next_try'] = other['next_try']
+                        break
+            self._items.append(item)
+            self._dirty = True
+            self.stats['queued'] += 1
+            self._cond.notify()
+        COUNTERS.add('outbox_queued')
+        return item['id']
+
+    # ---------- файл ----------
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                items = json.load(f)
+        except (OSError, ValueError):
+            return []
+        return [item for item in items if isinstance(item, dict) and item.get('kind') in (EMAIL, CALENDAR)]
+
+    def _save(self):
+        # викликається під self._cond; запис атомарний, як у кеші теплого старту
+        self._dirty = False
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._items, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"Не вдалося зберегти чергу нагадувань: {e}")
+
+    # ---------- потік доставки ----------
+    def _loop(self):
+        while True:
+            with self._cond:
+                if self._dirty:
+                    self._save()
+                now = time.time()
+                due = [item for item in self._items if item['next_try'] <= now]
+                if not due:
+                    if not self.running:
+                        return
+                    upcoming = min((item['next_try'] for item in self._items), default=None)
+                    timeout = IDLE_CLOSE if upcoming is None else max(0.0, upcoming - now)
+                    self._cond.wait(min(timeout, IDLE_CLOSE))
+                    if not self._items:
+                        self.pool.close_if_idle()
+                    continue
+                if not self.running:
+                    return
+            self._deliver(due)
+
+    def _deliver(self, due):
+        groups = {}
+        for item in due:
+            if item['kind'] == EMAIL:
+                groups.setdefault(item['to'], []).append(item)
+            else:
+                self._attempt([item], self._send_event)
+        for items in groups.values():
+            for i in range(0, len(items), self.digest_max):
+                self._attempt(items[i:i + self.digest_max], self._send_digest)
+
+    def _attempt(self, items, send):
+        try:
+            send(items)
+        except Exception as e:
+            self._failed(items, e)
+            return
+        with self._cond:
+            ids = {item['id'] for item in items}
+            self._items = [item for item in self._items if item['id'] not in ids]
+            self.stats['sent'] += len(items)
+            self._save()
+            self._cond.notify_all()
+        COUNTERS.add('outbox_sent', len(items))
+        if self.on_sent:
+            self.on_sent(items)
+
+    def _failed(self, items, error):
+        dropped = []
+        with self._cond:
+            for item in items:
+                item['attempts'] += 1
+                item['error'] = str(error)
+                if isinstance(error, PermanentError) or item['attempts'] >= self.max_attempts:
+                    dropped.append(item)
+                    continue
+                delay = min(RETRY_MAX, self.retry_base * 2 ** (item['attempts'] - 1))
+                # розкид, щоб повтори після збою мережі не йшли одночасно
+                item['next_try'] = time.time() + delay * random.uniform(0.8, 1.2)
+                self.stats['retries'] += 1
+            if dropped:
+                ids = {item['id'] for item in dropped}
+                self._items = [item for item in self._items if item['id'] not in ids]
+                self.stats['failed'] += len(dropped)
+            self._save()
+            self._cond.notify_all()
+        COUNTERS.add('outbox_failed', len(dropped))
+        if self.on_failed:
+            for item in dropped:
+                self.on_failed(item, error)
+
+    def _send_digest(self, items):
+        import smtplib
+        if not self.email_enabled:
+            raise PermanentError("Email не налаштовано")
+        from email.mime.text import MIMEText
+        subject, body = build_digest(items)
+        msg = MIMEText(body, "plain", "utf-8")
+        msg["Subject"] = subject
+        msg["From"] = self.sender   # ТУТ має бути точно така ж адреса, що в login()
+        msg["To"] = items[0]['to']
+        msg["X-TechCare-Ids"] = ",".join(item['id'] for item in items)
+        payload = msg.as_string()
+        for retry in (True, False):
+            conn = self.pool.get()
+            try:
+                conn.sendmail(self.sender, [items[0]['to']], payload)
+                break
+            except smtplib.SMTPServerDisconnected:
+                # сервер закрив з'єднання з пулу — одна спроба з новим
+                self.pool.discard()
+                if not retry:
+                    raise
+            except smtplib.SMTPRecipientsRefused as e:
+                raise PermanentError(f"Адресата відхилено: {items[0]['to']}") from e
+            except (smtplib.SMTPException, OSError):
+                self.pool.discard()
+                raise
+        self.stats['messages'] += 1
+        COUNTERS.add('outbox_messages')
+
+    def _send_event(self, items):
+        item = items[0]
+        self.calendar(item['subject'], item['body'], item['start'])
+        self.stats['events'] += 1
+
+
+# ---------- локальний SMTP-сервер для перевірки ----------
+class LocalSmtpServer:
+    """Мінімальний SMTP-сервер на 127.0.0.1: приймає й запам'ятовує листи
+
+    fail_first — скільки перших команд DATA відхилити кодом 451 (перевірка повторів)
+    """
+
+    def __init__(self, fail_first=0):
+        self.fail_first = fail_first
+        self.messages = []      # (час отримання, заголовки, текст)
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._server = None
+
+    def start(self):
+        import socketserver
+        owner = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def reply(self, line):
+                self.wfile.write(line.encode() + b"\r\n")
+
+            def handle(self):
+                with owner._lock:
+                    owner.connections += 1
+                self.reply("220 techcare-local ESMTP")
+                while True:
+                    line = self.rfile.readline()
+                    if not line:
+                        return
+                    command = line.decode("utf-8", "replace").strip()
+                    verb = command.split(" ", 1)[0].upper()
+                    if verb == "EHLO":
+                        self.reply("250-techcare-local")
+                        self.reply("250 AUTH PLAIN LOGIN")
+                    elif verb == "AUTH":
+                        self.reply("235 2.7.0 Authentication successful")
+                    elif verb in ("HELO", "MAIL", "RCPT", "RSET", "NOOP"):
+                        self.reply("250 OK")
+                    elif verb == "DATA":
+                        with owner._lock:
+                            refuse = owner.fail_first > 0
+                            owner.fail_first -= refuse
+                        if refuse:
+                            self.reply("451 4.3.0 Try again later")
+                            continue
+                        self.reply("354 End data with <CR><LF>.<CR><LF>")
+                        lines = []
+                        while True:
+                            data = self.rfile.readline()
+                            if not data or data in (b".\r\n", b".\n"):
+                                break
+                            lines.append(data.decode("utf-8", "replace").rstrip("\r\n"))
+                        received = time.perf_counter()
+                        split = lines.index("") if "" in lines else len(lines)
+                        headers = {}
+                        for header in lines[:split]:
+                            name, _, value = header.partition(":")
+                            headers[name.strip()] = value.strip()
+                        with owner._lock:
+                            owner.messages.append((received, headers, "\n".join(lines[split + 1:])))
+                        self.reply("250 OK")
+                    elif verb == "QUIT":
+                        self.reply("221 Bye")
+                        return
+                    else:
+                        self.reply("502 Command not implemented")
+
+        self._server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="local-smtp", daemon=True).start()
+        return self._server.server_address
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def factory(self):
+        import smtplib
+        host, port = self._server.server_address
+        return lambda: smtplib.SMTP(host, port, timeout=10)
+
+
+# ---------- бенчмарк ----------
+def _percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))] if values else 0.0
+
+
+def run_benchmark(alerts=200, recipients=3):
+    """Сплеск alerts нагадувань для recipients адресатів: лист-на-з'єднання
+    (як було) проти черги з пулом з'єднань, з дайджестами і без них"""
+    import smtplib
+    import tempfile
+    from email.mime.text import MIMEText
+
+    addresses = [f"user{i}@example.test" for i in range(recipients)]
+    burst = [(addresses[i % recipients], f"Попередження {i}", "Високе навантаження CPU") for i in range(alerts)]
+    results = {'alerts': alerts, 'recipients': recipients}
+    sender = "techcare@example.test"
+    account = {'user': sender, 'password': "password"}
+
+    # як було: з'єднання, вхід і лист на кожне нагадування, синхронно
+    server = LocalSmtpServer()
+    host, port = server.start()
+    t0 = time.perf_counter()
+    blocked = []
+    for to, subject, body in burst:
+        t = time.perf_counter()
+        msg = MIMEText(body, "plain", "utf-8")
+        msg["Subject"] = subject
+        conn = smtplib.SMTP(host, port, timeout=10)
+        conn.login(sender, "password")
+        conn.sendmail(sender, [to], msg.as_string())
+        conn.quit()
+        blocked.append(time.perf_counter() - t)
+    elapsed = time.perf_counter() - t0
+    server.stop()
+    results['per_message'] = {
+        'seconds': round(elapsed, 3),
+        'alerts_per_sec': round(alerts / elapsed, 1),
+        'messages': len(server.messages),
+        'connections': server.connections,
+        'caller_blocked_p50_ms': round(_percentile(blocked, 0.5) * 1000, 2),
+    }
+
+    with tempfile.TemporaryDirectory(prefix="techcare_outbox_") as workdir:
+        for name, window, digest_max in (('pooled', 0.0, 1), ('pooled_digest', 0.2, DIGEST_MAX)):
+            server = LocalSmtpServer()
+            server.start()
+            outbox = Outbox(os.path.join(workdir, f"{name}.json"), account, server.factory(),
+                            digest_window=window, digest_max=digest_max).start()
+            enqueued = {}
+            enqueue_s = []
+            t0 = time.perf_counter()
+            for to, subject, body in burst:
+                t = time.perf_counter()
+                enqueued[outbox.send_email(to, subject, body)] = t
+                enqueue_s.append(time.perf_counter() - t)
+            outbox.wait_idle(timeout=60)
+            elapsed = time.perf_counter() - t0
+            outbox.stop()
+            server.stop()
+            latency = [received - enqueued[i]
+                       for received, headers, _ in server.messages
+                       for i in headers.get('X-TechCare-Ids', "").split(",") if i in enqueued]
+            results[name] = {
+                'seconds': round(elapsed, 3),
+                'alerts_per_sec': round(alerts / elapsed, 1),
+                'delivered': len(latency),
+                'messages': len(server.messages),
+                'connections': server.connections,
+                'caller_blocked_p50_ms': round(_percentile(enqueue_s, 0.5) * 1000, 3),
+                'latency_p50_ms': round(_percentile(latency, 0.5) * 1000, 1),
+                'latency_p95_ms': round(_percentile(latency, 0.95) * 1000, 1),
+            }
+
+        # нагадування одному адресату з інтервалом 0.5 с потрапляють в один дайджест
+        server = LocalSmtpServer()
+        server.start()
+        outbox = Outbox(os.path.join(workdir, "window.json"), smtp_factory=server.factory(),
+                        digest_window=2.0).start()
+        for i in range(4):
+            outbox.send_email(addresses[0], f"Нагадування {i}", "Перевірка вікна дайджесту")
+            time.sleep(0.5)
+        outbox.wait_idle(timeout=10)
+        outbox.stop()
+        server.stop()
+        results['digest_window'] = {'reminders': 4, 'messages': len(server.messages)}
+
+        # збій сервера: два відхилені DATA, доставка з третьої спроби
+        server = LocalSmtpServer(fail_first=2)
+        server.start()
+        outbox = Outbox(os.path.join(workdir, "retry.json"), smtp_factory=server.factory(),
+                        digest_window=0.0, retry_base=0.05).start()
+        outbox.send_email(addresses[0], "Повтор", "Перевірка повторів")
+        delivered = outbox.wait_idle(timeout=10)
+        outbox.stop()
+        server.stop()
+        results['retry'] = {'delivered': delivered and len(server.messages) == 1,
+                            'retries': outbox.stats['retries']}
+
+        # перезапуск: сервер недоступний, черга зберігається і доставляється наступним запуском
+        path = os.path.join(workdir, "restart.json")
+
+        def unreachable():
+            raise ConnectionRefusedError("сервер недоступний")
+
+        outbox = Outbox(path, smtp_factory=unreachable, digest_window=0.0, retry_base=30).start()
+        for to, subject, body in burst[:5]:
+            outbox.send_email(to, subject, body)
+        time.sleep(0.2)
+        outbox.stop()
+        server = LocalSmtpServer()
+        server.start()
+        outbox = Outbox(path, smtp_factory=server.factory(), digest_window=0.0, retry_base=30)
+        outbox.start()
+        restored = outbox.pending
+        for item in outbox._items:
+            item['next_try'] = 0    # не чекати затримки повтору
+        with outbox._cond:
+            outbox._cond.notify()
+        delivered = outbox.wait_idle(timeout=10)
+        outbox.stop()
+        server.stop()
+        results['restart'] = {'restored': restored, 'delivered': delivered,
+                              'messages': len(server.messages)}
+    return results
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Черга нагадувань TechCare (email, календар)")
+    parser.add_argument("--bench", action="store_true", help="сплеск нагадувань на локальний SMTP-сервер")
+    parser.add_argument("--alerts", type=int, default=200)
+    parser.add_argument("--recipients", type=int, default=3)
+    parser.add_argument("--show", action="store_true", help="показати вміст черги")
+    parser.add_argument("--path", default=OUTBOX_FILE)
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        print(json.dumps(run_benchmark(args.alerts, args.recipients), ensure_ascii=False, indent=2))
+        return 0
+    items = Outbox(args.path)._load()
+    if args.show:
+        print(json.dumps(items, ensure_ascii=False, indent=2))
+    else:
+        print(f"У черзі {args.path}: {len(items)} нагадувань")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+Вбудований статистичний профайлер: періодично знімає стеки всіх потоків
+і зводить їх у формат collapsed stacks (для flamegraph.pl / speedscope).
+Поки профайлер не запущений, він нічого не коштує — немає ні потоку, ні хуків
+"""
+
+import os
+import signal
+import sys
+import threading
+import time
+
+DEFAULT_INTERVAL = 0.005   # 200 Гц
+DEFAULT_DURATION = 10.0
+MAX_DEPTH = 64
+
+# кадри, у яких потік просто чекає (без include_idle такі стеки відкидаються)
+IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+    ("socketserver.py", "serve_forever"),
+}
+
+
+def _frame_label(code):
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+class SamplingProfiler:
+    """Профайлер на основі sys._current_frames()"""
+
+    def __init__(self, interval=DEFAULT_INTERVAL, duration=DEFAULT_DURATION, include_idle=False):
+        self.interval = interval
+        self.duration = duration
+        self.include_idle = include_idle
+        self.counts = {}
+        self.samples = 0
+        self.started = None
+        self.elapsed = 0.0
+        self._thread = None
+        self._stop = threading.Event()
+        self._label_cache = {}
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, on_done=None):
+        """Запускає збір у фоновому потоці; on_done(profiler) після завершення"""
+        if self.running:
+            return False
+        self.counts = {}
+        self.samples = 0
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(on_done,), name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        self._stop.set()
+
+    def wait(self, timeout=None):
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _run(self, on_done):
+        own = threading.get_ident()
+        self.started = time.time()
+        start = time.perf_counter()
+        deadline = start + self.duration
+        next_tick = start
+        while not self._stop.is_set() and time.perf_counter() < deadline:
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident != own:
+                    self._add(names.get(ident, str(ident)), frame)
+            self.samples += 1
+            next_tick += self.interval
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                self._stop.wait(delay)
+            else:
+                next_tick = time.perf_counter()  # не надолужуємо пропущені такти
+        self.elapsed = time.perf_counter() - start
+        if on_done:
+            try:
+                on_done(self)
+            except Exception as e:
+                print(f"Помилка обробки профілю: {e}")
+
+    def _add(self, thread_name, frame):
+        if not self.include_idle:
+            code = frame.f_code
+            if (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES:
+                return
+        labels = []
+        cache = self._label_cache
+        while frame is not None and len(labels) < MAX_DEPTH:
+            code = frame.f_code
+            label = cache.get(code)
+            if label is None:
+                label = cache[code] = _frame_label(code)
+            labels.append(label)
+            frame = frame.f_back
+        labels.append(thread_name)
+        key = ";".join(reversed(labels))
+        self.counts[key] = self.counts.get(key, 0) + 1
+
+    # ---------- результат ----------
+    def collapsed(self):
+        """Рядки 'потік;кадр;…;кадр кількість', найчастіші першими"""
+        return [f"{stack} {n}" for stack, n in sorted(self.counts.items(), key=lambda kv: -kv[1])]
+
+    def top_functions(self, limit=10):
+        """Найчастіші верхні кадри: [(кадр, частка семплів)]"""
+        leaf = {}
+        total = sum(self.counts.values()) or 1
+        for stack, n in self.counts.items():
+            name = stack.rsplit(";", 1)[-1]
+            leaf[name] = leaf.get(name, 0) + n
+        return [(name, round(n / total, 3)) for name, n in sorted(leaf.items(), key=lambda kv: -kv[1])[:limit]]
+
+    def write(self, path=None):
+        """Записує collapsed stacks у файл і повертає шлях"""
+        path = path or time.strftime("techcare_profile_%Y%m%d_%H%M%S.folded")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(self.collapsed()))
+            f.write("\n")
+        return path
+
+
+def profile_to_file(duration=DEFAULT_DURATION, interval=DEFAULT_INTERVAL, on_saved=None):
+    """Профілює процес duration секунд у фоні й зберігає результат у файл"""
+    def done(profiler):
+        path = profiler.write()
+        print(f"Профіль ({profiler.samples} семплів) збережено у {path}")
+        if on_saved:
+            on_saved(path, profiler)
+
+    profiler = SamplingProfiler(interval=interval, duration=duration)
+    profiler.start(on_done=done)
+    return profiler
+
+
+def install_signal_handler(duration=DEFAULT_DURATION):
+    """kill -USR2 <pid> запускає профілювання (тільки POSIX); False, якщо сигналу немає"""
+    if not hasattr(signal, "SIGUSR2"):
+        return False
+    active = []
+
+    def handler(signum, frame):
+        if active and active[0].running:
+            return
+        active[:] = [profile_to_file(duration)]
+
+    signal.signal(signal.SIGUSR2, handler)
+    return True
@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+"""
+Бенчмарк власних гарячих шляхів TechCare (без GUI, працює на Linux)
+Windows-залежності та psutil підміняються фейковими модулями,
+щоб вимірювався саме код TechCare, а не система
+"""
+
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+from benchmark import BenchmarkRunner, environment
+
+BASELINE_FILE = "self_bench_baseline.json"
+# наскільки p50 може погіршитися відносно базової лінії, поки це не регресія
+DEFAULT_TOLERANCE = 0.25
+HISTORY_SIZES = [10, 50, 100]
+
+
+def install_fake_backends(real_psutil=False):
+    """Реєструє фейкові win32gui/win32con/GPUtil/clr (і psutil) у sys.modules"""
+    fakes = {}
+
+    win32con = types.ModuleType("win32con")
+    win32con.GW_OWNER = 4
+    win32con.GWL_EXSTYLE = -20
+    win32con.WS_EX_TOOLWINDOW = 0x80
+    fakes["win32con"] = win32con
+
+    win32gui = types.ModuleType("win32gui")
+    windows = {i: f"Вікно {i}" for i in range(1, 13)}
+    win32gui.IsWindowVisible = lambda hwnd: True
+    win32gui.GetWindow = lambda hwnd, cmd: 0
+    win32gui.GetWindowLong = lambda hwnd, index: 0
+    win32gui.GetWindowText = lambda hwnd: windows.get(hwnd, "")
+    win32gui.EnumWindows = lambda callback, extra: [callback(h, extra) for h in windows]
+    fakes["win32gui"] = win32gui
+
+    gputil = types.ModuleType("GPUtil")
+    gputil.getGPUs = lambda: [types.SimpleNamespace(load=0.25, name="Fake GPU")]
+    fakes["GPUtil"] = gputil
+
+    fakes["clr"] = types.ModuleType("clr")
+
+    if not real_psutil:
+        psutil = types.ModuleType("psutil")
+        VMem = namedtuple("VMem", "total available percent used free")
+        Disk = namedtuple("Disk", "total used free percent")
+        NetIO = namedtuple("NetIO", "bytes_sent bytes_recv")
+        gb = 1024 ** 3
+        boot = time.time() - 5 * 3600
+        psutil.cpu_percent = lambda interval=None, percpu=False: 23.5
+        psutil.cpu_count = lambda logical=True: 8 if logical else 4
+        psutil.virtual_memory = lambda: VMem(16 * gb, 9 * gb, 43.7, 7 * gb, 9 * gb)
+        psutil.disk_usage = lambda path: Disk(500 * gb, 300 * gb, 200 * gb, 60.0)
+        psutil.boot_time = lambda: boot
+        psutil.pids = lambda: list(range(250))
+        psutil.net_io_counters = lambda: NetIO(10 ** 9, 2 * 10 ** 9)
+        psutil.sensors_battery = lambda: None
+        MemInfo = namedtuple("MemInfo", "rss vms")
+        psutil.Process = lambda pid=None: types.SimpleNamespace(
+            oneshot=contextlib.nullcontext,
+            cpu_percent=lambda interval=None: 0.4,
+            memory_info=lambda: MemInfo(80 * 1024 ** 2, 400 * 1024 ** 2),
+            num_threads=lambda: 9,
+            num_fds=lambda: 30,
+        )
+        fakes["psutil"] = psutil
+
+    for name, module in fakes.items():
+        if name == "psutil" or name not in sys.modules:
+            sys.modules[name] = module
+    return fakes
+
+
+def _history(size):
+    now = datetime.now()
+    return [
+        {
+            'timestamp': (now - timedelta(seconds=2 * (size - i))).isoformat(),
+            'cpu_percent': 20 + i % 30,
+            'ram_percent': 50 + i % 10,
+            'disk_percent': 60,
+            'disk_free': 200 * 1024 ** 3 - i * 1024 ** 2,
+            'ram_available': 9 * 1024 ** 3,
+        }
+        for i in range(size)
+    ]
+
+
+def _allocations(func, calls=20):
+    """Пікова і залишкова пам'ять на один виклик (tracemalloc)"""
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for _ in range(calls):
+            func()
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        'alloc_peak_kb': round((peak - before) / 1024, 1),
+        'retained_bytes_per_call': round((after - before) / calls, 1),
+    }
+
+
+def build_cases(workdir):
+    """Набір (назва, функція) для вимірювання"""
+    from monitor import get_system_data
+    from json_data import JsonDataManager
+    from ai import SimpleAI
+    from live_chart import LiveChart
+    from downsample import DownsampleCache
+
+    cases = [("get_system_data", get_system_data)]
+
+    for size in HISTORY_SIZES:
+        dm = JsonDataManager.__new__(JsonDataManager)
+        dm.data_file = os.path.join(workdir, f"bench_{size}.json")
+        dm.data = {'user_stats': {'total_points': 0, 'level': 1}, 'achievements': [],
+                   'system_history': _history(size), 'settings': {}}
+        snapshot = get_system_data()
+
+        def save(dm=dm, snapshot=snapshot, size=size):
+            dm.save_system_data(snapshot)
+            # повертаємо історію до потрібного розміру, щоб кожен замір був однаковим
+            del dm.data['system_history'][:-size]
+
+        cases.append((f"save_system_data[{size}]", save))
+
+    dm = JsonDataManager.__new__(JsonDataManager)
+    dm.data_file = os.path.join(workdir, "bench_ai.json")
+    dm.data = {'system_history': _history(100), 'settings': {}}
+    ai = SimpleAI(dm, probes=False)
+    base = get_system_data()
+    counter = [0]
+
+    def predict():
+        # кожен виклик — новий знімок, інакше спрацює кеш
+        counter[0] += 1
+        return ai.predict_system_health(dict(base, seq=-counter[0]))
+
+    cases.append(("predict_system_health", predict))
+    cases.append(("get_current_metrics", dm.get_current_metrics))
+    # тренд на вкладці AI: LiveChart.load -> DownsampleCache.get -> decimate;
+    # кеш очищається, щоб кожен виклик справді проріджував історію
+    history = _history(100)
+    chart = LiveChart(master=None)
+    trend_cache = DownsampleCache()
+
+    def trend():
+        trend_cache.clear()
+        chart.load(history, 600, cache=trend_cache)
+
+    cases.append(("live_chart_load", trend))
+    return cases
+
+
+def run_suite(runner=None, real_psutil=False):
+    install_fake_backends(real_psutil)
+    runner = runner or BenchmarkRunner(warmup=3, min_reps=15, max_reps=300, max_seconds=2.0, target_rel_ci=0.03)
+    results = {}
+    # налагоджувальні print у гарячих шляхах теж коштують часу, але не засмічують вивід
+    with tempfile.TemporaryDirectory(prefix="techcare_selfbench_") as workdir, \
+            open(os.devnull, 'w', encoding='utf-8') as devnull, \
+            contextlib.redirect_stdout(devnull):
+        for name, func in build_cases(workdir):
+            res = runner.run(name, func)
+            stats = res['stats']
+            sorted_samples = sorted(res['samples'])
+            p99 = sorted_samples[min(len(sorted_samples) - 1, int(len(sorted_samples) * 0.99))]
+            entry = {
+                'ops_per_sec': round(1e9 / stats['median'], 1) if stats['median'] else None,
+                'p50_us': round(stats['median'] / 1000, 2),
+                'p99_us': round(p99 / 1000, 2),
+                'n': stats['n'],
+            }
+            entry.update(_allocations(func))
+            results[name] = entry
+    return results
+
+
+def compare_with_baseline(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Список регресій: (назва, базове p50, поточне p50)"""
+    regressions = []
+    for name, entry in results.items():
+        base = baseline.get('results', {}).get(name)
+        if base and base['p50_us'] and entry['p50_us'] > base['p50_us'] * (1 + tolerance):
+            regressions.append((name, base['p50_us'], entry['p50_us']))
+    return regressions
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Бенчмарк гарячих шляхів TechCare")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="файл базової лінії")
+    parser.add_argument("--save-baseline", action="store_true", help="зберегти результат як базову лінію")
+    parser.add_argument("--check", action="store_true", help="код виходу 1, якщо є регресії")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--real-psutil", action="store_true", help="вимірювати зі справжнім psutil")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    results = run_suite(real_psutil=args.real_psutil)
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        print(f"{'шлях':28s} {'оп/с':>10s} {'p50 мкс':>10s} {'p99 мкс':>10s} {'пік КБ':>8s} {'залиш. Б':>9s}")
+        for name, e in results.items():
+            print(f"{name:28s} {e['ops_per_sec']:10.1f} {e['p50_us']:10.2f} {e['p99_us']:10.2f} "
+                  f"{e['alloc_peak_kb']:8.1f} {e['retained_bytes_per_call']:9.1f}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({'environment': environment(), 'results': results}, f, ensure_ascii=False, indent=2)
+        print(f"Базову лінію збережено у {args.baseline}")
+        return 0
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_with_baseline(results, baseline, args.tolerance)
+        for name, before, after in regressions:
+            print(f"РЕГРЕСІЯ {name}: p50 {before} → {after} мкс")
+        if regressions and args.check:
+            return 1
+    elif args.check:
+        print(f"Немає базової лінії {args.baseline}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
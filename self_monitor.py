@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+Самоконтроль TechCare: скільки ресурсів споживає сам застосунок
+(CPU, RSS, потоки, дескриптори, запис у файли) і лічильники власних операцій
+"""
+
+import os
+import threading
+import time
+
+# бюджет накладних витрат за замовчуванням; перевизначається налаштуванням 'overhead_budget'
+DEFAULT_BUDGET = {
+    'cpu_percent': 5.0,     # % одного ядра
+    'rss_mb': 200.0,
+    'threads': 40,
+    'write_kb_s': 64.0,     # середня швидкість запису власних файлів
+}
+
+
+class Counters:
+    """Потокобезпечні лічильники подій"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def add(self, name, amount=1):
+        with self._lock:
+            self._values[name] = self._values.get(name, 0) + amount
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._values)
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+
+# лічильники: json_bytes_written, json_saves, get_system_data_calls, disk_test_runs
+COUNTERS = Counters()
+
+
+class SelfMonitor:
+    """Знімок споживання ресурсів поточним процесом"""
+
+    def __init__(self, counters=None, clock=time.monotonic):
+        self.counters = counters or COUNTERS
+        self.clock = clock
+        self.started = clock()
+        self._process = None
+        self._lock = threading.Lock()
+
+    def _get_process(self):
+        if self._process is None:
+            import psutil
+            self._process = psutil.Process(os.getpid())
+            self._process.cpu_percent(None)  # перший виклик лише запускає відлік
+        return self._process
+
+    def sample(self):
+        """CPU%, RSS, потоки, дескриптори, запис у файли та лічильники операцій"""
+        counters = self.counters.snapshot()
+        elapsed = max(self.clock() - self.started, 1e-9)
+        result = {
+            'uptime_s': round(elapsed, 1),
+            'counters': counters,
+            'write_kb_s': round(counters.get('json_bytes_written', 0) / 1024 / elapsed, 3),
+        }
+        try:
+            with self._lock:
+                proc = self._get_process()
+                with proc.oneshot():
+                    result['cpu_percent'] = proc.cpu_percent(None)
+                    result['rss_mb'] = round(proc.memory_info().rss / 1024 ** 2, 1)
+                    result['threads'] = proc.num_threads()
+                    if hasattr(proc, 'num_handles'):
+                        result['handles'] = proc.num_handles()
+                    elif hasattr(proc, 'num_fds'):
+                        result['handles'] = proc.num_fds()
+                    if hasattr(proc, 'io_counters'):
+                        io = proc.io_counters()
+                        result['io_write_mb'] = round(io.write_bytes / 1024 ** 2, 2)
+                        result['io_read_mb'] = round(io.read_bytes / 1024 ** 2, 2)
+        except Exception as e:
+            result['error'] = str(e)
+        return result
+
+
+def check_budget(sample, budget=None):
+    """Список порушень бюджету: (метрика, значення, межа)"""
+    budget = dict(DEFAULT_BUDGET, **(budget or {}))
+    violations = []
+    for key, limit in budget.items():
+        value = sample.get(key)
+        if value is not None and limit is not None and value > limit:
+            violations.append((key, value, limit))
+    return violations
+
+
+SELF_MONITOR = SelfMonitor()
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+Бенчмарк запуску TechCare: час імпорту модулів і час до інтерактивності
+(перший показ вікна, перший вільний цикл подій) з бюджетом для перевірки
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from self_monitor import check_budget
+
+# мілісекунди від старту інтерпретатора
+STARTUP_BUDGET = {
+    'import_ms': 1200.0,
+    'first_paint_ms': 2000.0,
+    'interactive_ms': 2500.0,
+    'wall_interactive_ms': 3500.0,   # разом із запуском самого Python
+}
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def parse_importtime(stderr, top=10):
+    """Найдорожчі модулі з виводу -X importtime: (модуль, self мс, cumulative мс)"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = [part.strip() for part in line[len("import time:"):].split("|")]
+            rows.append((name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000))
+        except ValueError:
+            continue
+    rows.sort(key=lambda row: row[1], reverse=True)
+    return [(name, round(self_ms, 1), round(cum_ms, 1)) for name, self_ms, cum_ms in rows[:top]]
+
+
+def measure_imports(module="main", runs=3):
+    """Час імпорту модуля в окремому процесі (медіана) і найдорожчі залежності"""
+    code = ("import time; t = time.perf_counter(); import {0}; "
+            "print((time.perf_counter() - t) * 1000)").format(module)
+    times = []
+    heaviest = []
+    for _ in range(runs):
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                              cwd=HERE, capture_output=True, text=True, timeout=120)
+        if proc.returncode != 0:
+            error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "помилка"
+            return {'module': module, 'error': error}
+        times.append(float(proc.stdout.strip().splitlines()[-1]))
+        heaviest = parse_importtime(proc.stderr)
+    return {'module': module, 'import_ms': round(statistics.median(times), 1), 'heaviest': heaviest}
+
+
+def measure_startup(runs=3, timeout=60):
+    """Запускає main.py --startup-report і збирає позначки часу (медіани)"""
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        proc = subprocess.Popen([sys.executable, "main.py", "--startup-report"], cwd=HERE,
+                                stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        marks = None
+        try:
+            for line in proc.stdout:
+                if line.startswith("STARTUP "):
+                    marks = json.loads(line[len("STARTUP "):])
+                    marks['wall_interactive_ms'] = round((time.perf_counter() - t0) * 1000, 1)
+                    break
+                if time.perf_counter() - t0 > timeout:
+                    break
+        finally:
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+        if marks is None:
+            return {'error': f"main.py не дійшов до інтерактивного стану (код {proc.returncode})"}
+        samples.append(marks)
+    return {key: round(statistics.median(sample[key] for sample in samples), 1) for key in samples[0]}
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Бенчмарк запуску TechCare")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--imports-only", action="store_true", help="лише час імпорту (без GUI)")
+    parser.add_argument("--budget", action="append", default=[], metavar="КЛЮЧ=МС",
+                        help="перевизначити межу бюджету, напр. interactive_ms=2000")
+    parser.add_argument("--check", action="store_true", help="код виходу 1, якщо бюджет перевищено")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    budget = dict(STARTUP_BUDGET)
+    for item in args.budget:
+        key, _, value = item.partition("=")
+        budget[key] = float(value)
+
+    report = {'imports': measure_imports(runs=args.runs)}
+    if not args.imports_only:
+        report['startup'] = measure_startup(runs=args.runs)
+    sample = dict(report['startup']) if 'startup' in report else {}
+    sample.setdefault('import_ms', report['imports'].get('import_ms'))
+    violations = check_budget(sample, budget)
+    report['violations'] = violations
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        imports = report['imports']
+        if 'error' in imports:
+            print(f"Імпорт {imports['module']}: {imports['error']}")
+        else:
+            print(f"Імпорт {imports['module']}: {imports['import_ms']} мс")
+            for name, self_ms, cum_ms in imports['heaviest']:
+                print(f"  {self_ms:8.1f} мс (разом {cum_ms:8.1f})  {name}")
+        for key, value in report.get('startup', {}).items():
+            print(f"{key:22s} {value}")
+        for key, value, limit in violations:
+            print(f"ПОНАД БЮДЖЕТ {key}: {value} > {limit} мс")
+
+    errors = 'error' in report['imports'] or 'error' in report.get('startup', {})
+    if args.check and (violations or errors):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
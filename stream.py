@@ -0,0 +1,430 @@
+# -*- coding: utf-8 -*-
+"""
+Локальний потік метрик (pub/sub): кожен новий знімок розсилається підписникам
+через Unix-сокет (на системах без AF_UNIX — через TCP на 127.0.0.1).
+
+Протокол: клієнт після підключення надсилає один рядок JSON
+    {"format": "ndjson" | "lp", "metrics": ["cpu_percent", ...]}
+і далі отримує кадри: ndjson — рядок JSON на знімок, lp — 4 байти довжини
+(big-endian) і компактний JSON. Повільні клієнти, чия черга переповнилась,
+відключаються
+"""
+
+import json
+import os
+import selectors
+import socket
+import struct
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+
+DEFAULT_TCP = ("127.0.0.1", 9465)
+DEFAULT_QUEUE = 64
+MAX_REQUEST = 4096
+FORMATS = ("ndjson", "lp")
+_LENGTH = struct.Struct(">I")
+
+
+def default_address():
+    if hasattr(socket, "AF_UNIX"):
+        return os.path.join(tempfile.gettempdir(), "techcare.sock")
+    return DEFAULT_TCP
+
+
+def _family(address):
+    return socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+
+
+def select_metrics(snapshot, metrics=None):
+    """Плоский словник зі знімка: всі числові поля або тільки вибрані"""
+    frame = {'seq': snapshot.get('seq'), 'timestamp': snapshot.get('timestamp')}
+    if metrics:
+        for key in metrics:
+            if key in snapshot:
+                frame[key] = snapshot[key]
+    else:
+        for key, value in snapshot.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                frame[key] = value
+    return frame
+
+
+def encode_frame(payload, fmt):
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    if fmt == "lp":
+        return _LENGTH.pack(len(body)) + body
+    return body + b"\n"
+
+
+class _Client:
+    __slots__ = ('sock', 'fd', 'request', 'fmt', 'metrics', 'queue', 'buffer', 'sent')
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.fd = sock.fileno()
+        self.request = b""
+        self.fmt = None          # None — ще не надіслав підписку
+        self.metrics = None
+        self.queue = deque()
+        self.buffer = b""        # недописаний кадр
+        self.sent = 0
+
+
+class StreamServer:
+    """Сервер розсилки знімків з одним потоком вводу-виводу (selectors)"""
+
+    def __init__(self, address=None, max_queue=DEFAULT_QUEUE):
+        self.address = address or default_address()
+        self.max_queue = max_queue
+        self.stats = {'published': 0, 'frames_sent': 0, 'clients': 0, 'dropped_clients': 0}
+        self._clients = {}
+        self._lock = threading.Lock()
+        self._selector = selectors.DefaultSelector()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._listener = None
+        self._thread = None
+        self.running = False
+
+    # ---------- запуск ----------
+    def start(self):
+        family = _family(self.address)
+        if family == socket.AF_UNIX and os.path.exists(self.address):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.address)
+            except (ConnectionRefusedError, FileNotFoundError):
+                os.unlink(self.address)  # сокет від попереднього запуску, ніхто не слухає
+            else:
+                raise OSError(f"Потік метрик уже обслуговує інший процес: {self.address}")
+            finally:
+                probe.close()
+        listener = socket.socket(family, socket.SOCK_STREAM)
+        if family != socket.AF_UNIX:
+            listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        listener.bind(self.address)
+        listener.listen(128)
+        listener.setblocking(False)
+        if family != socket.AF_UNIX:
+            self.address = listener.getsockname()
+        self._listener = listener
+        self._wake_r.setblocking(False)
+        self._selector.register(listener, selectors.EVENT_READ, "accept")
+        self._selector.register(self._wake_r, selectors.EVENT_READ, "wake")
+        self.running = True
+        self._thread = threading.Thread(target=self._loop, name="metric-stream", daemon=True)
+        self._thread.start()
+        return self.address
+
+    def stop(self):
+        self.running = False
+        self._wake()
+        if self._thread:
+            self._thread.join(timeout=2)
+        for client in list(self._clients.values()):
+            self._drop(client, count=False)
+        self._selector.close()
+        self._listener.close()
+        self._wake_r.close()
+        self._wake_w.close()
+        if _family(self.address) == socket.AF_UNIX:
+            try:
+                os.unlink(self.address)
+            except OSError:
+                pass
+
+    # ---------- публікація ----------
+    def publish(self, snapshot):
+        """Ставить знімок у черги всіх підписників; повертає кількість адресатів"""
+        encoded = {}
+        delivered = 0
+        with self._lock:
+            self.stats['published'] += 1
+            for client in list(self._clients.values()):
+                if client.fmt is None or client.queue is None:
+                    continue  # ще без підписки або вже позначений на відключення
+                key = (client.fmt, client.metrics)
+                frame = encoded.get(key)
+                if frame is None:
+                    # однакові підписки отримують одні й ті самі байти
+                    frame = encoded[key] = encode_frame(select_metrics(snapshot, client.metrics), client.fmt)
+                if len(client.queue) >= self.max_queue:
+                    client.queue = None  # позначка: відключити в потоці вводу-виводу
+                    continue
+                client.queue.append(frame)
+                delivered += 1
+        self._wake()
+        return delivered
+
+    def _wake(self):
+        try:
+            self._wake_w.send(b"\0")
+        except (BlockingIOError, OSError):
+            pass
+
+    # ---------- потік вводу-виводу ----------
+    def _loop(self):
+        while self.running:
+            self._update_interest()
+            for key, events in self._selector.select(timeout=1.0):
+                if key.data == "accept":
+                    self._accept()
+                elif key.data == "wake":
+                    try:
+                        while self._wake_r.recv(4096):
+                            pass
+                    except (BlockingIOError, OSError):
+                        pass
+                else:
+                    client = key.data
+                    if events & selectors.EVENT_READ:
+                        self._read(client)
+                    if events & selectors.EVENT_WRITE and client.fd in self._clients:
+                        self._write(client)
+
+    def _update_interest(self):
+        with self._lock:
+            clients = list(self._clients.values())
+        for client in clients:
+            if client.queue is None:
+                self._drop(client)
+                continue
+            events = selectors.EVENT_READ
+            if client.buffer or client.queue:
+                events |= selectors.EVENT_WRITE
+            try:
+                self._selector.modify(client.sock, events, client)
+            except (KeyError, ValueError):
+                pass
+
+    def _accept(self):
+        try:
+            sock, _ = self._listener.accept()
+        except (BlockingIOError, OSError):
+            return
+        sock.setblocking(False)
+        client = _Client(sock)
+        with self._lock:
+            self._clients[client.fd] = client
+            self.stats['clients'] = len(self._clients)
+        self._selector.register(sock, selectors.EVENT_READ, client)
+
+    def _read(self, client):
+        try:
+            data = client.sock.recv(MAX_REQUEST)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            data = b""
+        if not data:
+            self._drop(client, count=False)
+            return
+        if client.fmt is not None:
+            return  # після підписки вхідні дані ігноруються
+        client.request += data
+        if b"\n" not in client.request:
+            if len(client.request) > MAX_REQUEST:
+                self._drop(client, count=False)
+            return
+        line = client.request.split(b"\n", 1)[0]
+        try:
+            request = json.loads(line.decode("utf-8") or "{}")
+            fmt = request.get("format", "ndjson")
+            metrics = request.get("metrics")
+            if fmt not in FORMATS:
+                raise ValueError(fmt)
+        except (ValueError, AttributeError):
+            self._drop(client, count=False)
+            return
+        with self._lock:
+            client.metrics = tuple(metrics) if metrics else None
+            client.fmt = fmt
+
+    def _write(self, client):
+        with self._lock:
+            if client.queue is None:
+                return
+            if not client.buffer and client.queue:
+                # кілька кадрів одним send
+                client.buffer = b"".join(client.queue)
+                client.sent += len(client.queue)
+                self.stats['frames_sent'] += len(client.queue)
+                client.queue.clear()
+        if not client.buffer:
+            return
+        try:
+            written = client.sock.send(client.buffer)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            self._drop(client, count=False)
+            return
+        client.buffer = client.buffer[written:]
+
+    def _drop(self, client, count=True):
+        with self._lock:
+            if self._clients.pop(client.fd, None) is None:
+                return
+            self.stats['clients'] = len(self._clients)
+            if count:
+                self.stats['dropped_clients'] += 1
+        try:
+            self._selector.unregister(client.sock)
+        except (KeyError, ValueError):
+            pass
+        client.sock.close()
+
+
+def subscribe(address=None, metrics=None, fmt="ndjson"):
+    """Клієнт: генератор словників-кадрів"""
+    address = address or default_address()
+    sock = socket.socket(_family(address), socket.SOCK_STREAM)
+    sock.connect(address)
+    request = {'format': fmt}
+    if metrics:
+        request['metrics'] = list(metrics)
+    sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+    buffer = b""
+    try:
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                return
+            buffer += chunk
+            while True:
+                if fmt == "lp":
+                    if len(buffer) < 4:
+                        break
+                    size = _LENGTH.unpack_from(buffer)[0]
+                    if len(buffer) < 4 + size:
+                        break
+                    body, buffer = buffer[4:4 + size], buffer[4 + size:]
+                else:
+                    if b"\n" not in buffer:
+                        break
+                    body, buffer = buffer.split(b"\n", 1)
+                yield json.loads(body)
+    finally:
+        sock.close()
+
+
+def run_benchmark(subscribers=200, messages=2000, fmt="lp", address=None):
+    """Пропускна здатність: один видавець, subscribers читачів в одному потоці"""
+    if address is None:
+        address = os.path.join(tempfile.gettempdir(), f"techcare_bench_{os.getpid()}.sock") \
+            if hasattr(socket, "AF_UNIX") else ("127.0.0.1", 0)
+    server = StreamServer(address, max_queue=max(DEFAULT_QUEUE, messages))
+    address = server.start()
+
+    sockets = []
+    for _ in range(subscribers):
+        s = socket.socket(_family(address), socket.SOCK_STREAM)
+        s.connect(address)
+        s.sendall(json.dumps({'format': fmt, 'metrics': ['cpu_percent', 'ram_percent', 'disk_percent']}).encode() + b"\n")
+        s.setblocking(False)
+        sockets.append(s)
+    deadline = time.time() + 5
+    while time.time() < deadline:
+        with server._lock:
+            if sum(c.fmt is not None for c in server._clients.values()) == subscribers:
+                break
+        time.sleep(0.01)
+
+    metrics = ('cpu_percent', 'ram_percent', 'disk_percent')
+    now = time.time()
+    samples = [{'seq': i, 'timestamp': now + i, 'cpu_percent': 12.5, 'ram_percent': 48.0,
+                'disk_percent': 61.2, 'system_info': {}} for i in range(messages)]
+    total_bytes = sum(len(encode_frame(select_metrics(s, metrics), fmt)) for s in samples)
+    expected = subscribers * total_bytes
+    received = [0]
+
+    def reader():
+        sel = selectors.DefaultSelector()
+        for s in sockets:
+            sel.register(s, selectors.EVENT_READ)
+        while received[0] < expected:
+            events = sel.select(timeout=2.0)
+            if not events:
+                break
+            for key, _ in events:
+                try:
+                    chunk = key.fileobj.recv(1 << 20)
+                except BlockingIOError:
+                    continue
+                if not chunk:
+                    sel.unregister(key.fileobj)
+                    continue
+                received[0] += len(chunk)
+        sel.close()
+
+    reader_thread = threading.Thread(target=reader, daemon=True)
+    reader_thread.start()
+    start = time.perf_counter()
+    publish_ns = []
+    for sample in samples:
+        t = time.perf_counter_ns()
+        server.publish(sample)
+        publish_ns.append(time.perf_counter_ns() - t)
+    reader_thread.join(timeout=30)
+    elapsed = time.perf_counter() - start
+    stats = dict(server.stats)
+    for s in sockets:
+        s.close()
+    server.stop()
+
+    publish_ns.sort()
+    frame_size = total_bytes / messages
+    frames = round(received[0] / frame_size) if frame_size else 0
+    return {
+        'subscribers': subscribers,
+        'messages': messages,
+        'format': fmt,
+        'frame_bytes': round(frame_size, 1),
+        'frames_delivered': frames,
+        'complete': received[0] >= expected,
+        'seconds': round(elapsed, 3),
+        'frames_per_sec': round(frames / elapsed, 1) if elapsed else 0.0,
+        'mb_per_sec': round(received[0] / elapsed / 1024 ** 2, 2) if elapsed else 0.0,
+        'publish_p50_us': round(publish_ns[len(publish_ns) // 2] / 1000, 1),
+        'publish_p99_us': round(publish_ns[int(len(publish_ns) * 0.99)] / 1000, 1),
+        'dropped_clients': stats['dropped_clients'],
+    }
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Потік метрик TechCare")
+    parser.add_argument("--address", help="шлях до Unix-сокета або host:port")
+    parser.add_argument("--metrics", help="метрики через кому (за замовчуванням усі числові)")
+    parser.add_argument("--format", choices=FORMATS, default="ndjson")
+    parser.add_argument("--bench", action="store_true", help="тест пропускної здатності")
+    parser.add_argument("--subscribers", type=int, default=200)
+    parser.add_argument("--messages", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    address = args.address
+    if address and ":" in address and os.path.sep not in address:
+        host, port = address.rsplit(":", 1)
+        address = (host, int(port))
+
+    if args.bench:
+        print(json.dumps(run_benchmark(args.subscribers, args.messages, args.format, address),
+                         ensure_ascii=False, indent=2))
+        return 0
+
+    metrics = args.metrics.split(",") if args.metrics else None
+    try:
+        for frame in subscribe(address, metrics, args.format):
+            print(json.dumps(frame, ensure_ascii=False), flush=True)
+    except (ConnectionError, FileNotFoundError) as e:
+        print(f"Немає з'єднання з TechCare: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+Фонові завдання для GUI: обмежений пул потоків, результати повертаються
+в потік Tk через чергу, яку розбирає один цикл root.after.
+Повторні запити з тим самим ключем об'єднуються або замінюють попередні
+"""
+
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+COALESCE = "coalesce"   # поки завдання з ключем виконується, нові запити чекають його результату
+LATEST = "latest"       # результат отримує лише найновіший запит, старі відкидаються
+
+_POST = object()
+
+
+class TaskHandle:
+    """Дескриптор завдання: скасування і стан"""
+
+    __slots__ = ('key', 'callbacks', 'errbacks', 'cancelled', 'superseded', 'done')
+
+    def __init__(self, key, on_done=None, on_error=None):
+        self.key = key
+        self.callbacks = [on_done] if on_done else []
+        self.errbacks = [on_error] if on_error else []
+        self.cancelled = False
+        self.superseded = False
+        self.done = False
+
+    def cancel(self):
+        """Результат не буде доставлено; ще не почате завдання не виконуватиметься"""
+        self.cancelled = True
+
+
+class GuiTaskRunner:
+    """Пул для блокуючої роботи з доставкою результатів у потік Tk
+
+    submit/cancel викликаються з потоку Tk, post — з будь-якого потоку
+    """
+
+    def __init__(self, root, max_workers=4, busy_ms=15, idle_ms=200):
+        self.root = root
+        self.busy_ms = busy_ms
+        self.idle_ms = idle_ms
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gui-task")
+        self._results = queue.SimpleQueue()
+        self._inflight = {}
+        self._pending = {}
+        self._active = 0
+        self._closed = False
+        self.root.after(self.idle_ms, self._pump)
+
+    # ---------- API ----------
+    def submit(self, func, *args, key=None, on_done=None, on_error=None, policy=COALESCE):
+        """Виконує func(*args) у пулі; on_done(результат) / on_error(виняток) — у потоці Tk"""
+        if key is not None:
+            current = self._inflight.get(key)
+            if current is not None and not current.cancelled:
+                if policy == COALESCE:
+                    if on_done:
+                        current.callbacks.append(on_done)
+                    if on_error:
+                        current.errbacks.append(on_error)
+                    return current
+                # LATEST: поточний результат уже застарів, запускаємо найновіший після нього
+                current.superseded = True
+                previous = self._pending.get(key)
+                if previous:
+                    previous[0].cancelled = True
+                handle = TaskHandle(key, on_done, on_error)
+                self._pending[key] = (handle, func, args)
+                return handle
+        handle = TaskHandle(key, on_done, on_error)
+        self._start(handle, func, args)
+        return handle
+
+    def cancel(self, key):
+        """Скасовує завдання з ключем (і те, що чекає черги)"""
+        for handle in (self._inflight.get(key), (self._pending.pop(key, None) or (None,))[0]):
+            if handle:
+                handle.cancel()
+
+    def post(self, func, *args):
+        """Виконати func(*args) у потоці Tk (безпечно з будь-якого потоку)"""
+        self._results.put((_POST, func, args))
+
+    def busy(self, key):
+        return key in self._inflight
+
+    def shutdown(self):
+        self._closed = True
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # ---------- виконання ----------
+    def _start(self, handle, func, args):
+        if handle.key is not None:
+            self._inflight[handle.key] = handle
+        self._active += 1
+        self._executor.submit(self._run, handle, func, args)
+
+    def _run(self, handle, func, args):
+        if handle.cancelled:
+            self._results.put((handle, None, None))
+            return
+        try:
+            self._results.put((handle, func(*args), None))
+        except Exception as e:
+            self._results.put((handle, None, e))
+
+    def _pump(self):
+        """Розбирає готові результати; частіше, поки є активні завдання"""
+        while True:
+            try:
+                item = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if item[0] is _POST:
+                self._call(item[1], *item[2])
+            else:
+                self._finish(*item)
+        if not self._closed:
+            self.root.after(self.busy_ms if self._active else self.idle_ms, self._pump)
+
+    def _finish(self, handle, value, error):
+        self._active -= 1
+        handle.done = True
+        key = handle.key
+        if key is not None and self._inflight.get(key) is handle:
+            del self._inflight[key]
+            waiting = self._pending.pop(key, None)
+            if waiting and not waiting[0].cancelled:
+                self._start(*waiting)
+        if handle.cancelled or handle.superseded:
+            return
+        if error is not None:
+            if not handle.errbacks:
+                print(f"Помилка фонового завдання {key or ''}: {error}")
+            for callback in handle.errbacks:
+                self._call(callback, error)
+        else:
+            for callback in handle.callbacks:
+                self._call(callback, value)
+
+    @staticmethod
+    def _call(func, *args):
+        try:
+            func(*args)
+        except Exception as e:
+            print(f"Помилка оновлення інтерфейсу: {e}")
@@ -5,11 +5,37 @@
 """
 
 import time
-import random
+
+from benchmark import BenchmarkRunner
+from self_monitor import COUNTERS
+
+# медіанний час навантаження на еталонній машині (скор 100), наносекунди
+CPU_REFERENCE_NS = 10_000_000
+# пропускна здатність пам'яті еталонної машини (скор 100), ГБ/с: однопотоковий
+# triad (24 байти на елемент, mem_bench.stream) на DDR4-3200 у двоканальному режимі
+RAM_REFERENCE_GBS = 20.0
+
+
+def cpu_workload():
+    """Навантаження для тесту процесора"""
+    result = 0
+    for i in range(100000):
+        result += i ** 0.5
+    return result
+
+
+def score_from_median(median_ns, reference_ns):
+    """Скор 0-100: у скільки разів повільніше за еталон"""
+    if not median_ns:
+        return 0
+    return min(100, 100 * reference_ns / median_ns)
+
 
 class SimpleTests:
-    def __init__(self, data_manager):
+    def __init__(self, data_manager, runner=None):
         self.data_manager = data_manager
+        self.runner = runner or BenchmarkRunner()
+        self.last_results = {}
     
     def run_benchmark(self):
         """Запускає тест швидкості"""
@@ -25,123 +51,107 @@ class SimpleTests:
         results = {
             'cpu_score': cpu_score,
             'ram_score': ram_score,
-            'overall_score': overall_score
+            'overall_score': overall_score,
+            'details': dict(self.last_results)
         }
+
+        # зберігаємо в історію і порівнюємо з базовою лінією цієї машини
+        if self.data_manager is not None and hasattr(self.data_manager, 'save_benchmark_run'):
+            try:
+                from bench_history import BenchmarkHistory
+                results['comparison'] = BenchmarkHistory(self.data_manager).record(self.benchmark_metrics())
+                results['regressions'] = [
+                    name for name, c in results['comparison'].items() if c['regression']
+                ]
+            except Exception as e:
+                print(f"Помилка збереження бенчмарку: {e}")
         
         return results
+
+    def benchmark_metrics(self):
+        """Метрики останнього запуску у форматі історії бенчмарків"""
+        metrics = {}
+        cpu = self.last_results.get('cpu')
+        if cpu:
+            metrics['cpu_ms'] = {
+                'value': cpu['stats']['median'] / 1e6,
+                'samples': [v / 1e6 for v in cpu['samples']],
+                'unit': 'ms',
+                'higher_is_better': False
+            }
+        ram = self.last_results.get('ram')
+        if ram:
+            for kernel, bw in ram['stream'].items():
+                metrics[f'ram_{kernel}_gbs'] = {
+                    'value': bw['gbs'],
+                    'samples': bw.get('samples', []),
+                    'unit': 'GB/s',
+                    'higher_is_better': True
+                }
+        return metrics
     
     def test_cpu(self):
         """Тест процесора"""
-        start_time = time.time()
-        
-        # робимо складні обчислення
-        result = 0
-        for i in range(100000):
-            result += i ** 0.5
-        
-        end_time = time.time()
-        execution_time = end_time - start_time
-        
-        # рахуємо скор (чим швидше, тим краще)
-        score = max(0, 100 - (execution_time * 50))
-        return min(score, 100)
+        result = self.runner.run('cpu', cpu_workload)
+        self.last_results['cpu'] = result
+        return score_from_median(result['stats']['median'], CPU_REFERENCE_NS)
     
     def test_ram(self):
-        """Тест пам'яті"""
-        start_time = time.time()
-        
-        # створюємо великий список
-        big_list = [random.randint(1, 1000) for _ in range(50000)]
-        big_list.sort()
-        
-        end_time = time.time()
-        execution_time = end_time - start_time
-        
-        score = max(0, 100 - (execution_time * 30))
-        return min(score, 100)
+        """Тест пам'яті (triad-пропускна здатність на буферах більших за кеш)"""
+        from mem_bench import MemoryBenchmark
+        bench = MemoryBenchmark()
+        stream = bench.stream(bench.stream_size, kernels=('copy', 'triad'))
+        self.last_results['ram'] = {'name': 'ram', 'unit': 'GB/s', 'stream': stream}
+        gbs = stream.get('triad', stream['copy'])['gbs']
+        return min(100, 100 * gbs / RAM_REFERENCE_GBS)
+
+    def start_cpu_scaling(self, on_done, progress=None, max_workers=None):
+        """Багатоядерний тест у фоні; повертає об'єкт з методом cancel()"""
+        from cpu_scaling import CpuScalingBenchmark
+        return CpuScalingBenchmark(max_workers).start(on_done, progress)
     
     def run_disk_test(self):
-        """Тест швидкості читання/запису диска"""
+        """Тест швидкості читання/запису диска (читання в обхід кешу ОС)
+
+        При збої повертає ok=False і disk_score=None — без вигаданих чисел
+        """
+        from disk_bench import quick_disk_probe, DiskBenchmarkError
+        COUNTERS.add('disk_test_runs')
         try:
-            import psutil
-            import tempfile
-            import os
-            
-            # Створюємо тимчасовий файл для тесту
-            test_data = b'0' * (1024 * 100)  # 100KB даних для тесту
-            
-            # Тест запису
-            write_start = time.time()
-            try:
-                with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-                    temp_filename = temp_file.name
-                    for _ in range(10):
-                        temp_file.write(test_data)
-                        temp_file.flush()
-                        os.fsync(temp_file.fileno())  # Форсуємо запис на диск
-                write_time = time.time() - write_start
-                
-                # Тест читання
-                read_start = time.time()
-                with open(temp_filename, 'rb') as temp_file:
-                    for _ in range(10):
-                        temp_file.seek(0)
-                        temp_file.read()
-                read_time = time.time() - read_start
-                
-                # Видаляємо тимчасовий файл
-                os.unlink(temp_filename)
-                
-            except Exception:
-                # Fallback до симуляції, якщо не можемо писати файли
-                write_time = 0.1
-                read_time = 0.05
-            
-            # Розрахунок швидкості
-            data_size_mb = (len(test_data) * 10) / (1024 * 1024)  # MB
-            
-            if write_time > 0:
-                write_speed = data_size_mb / write_time  # MB/s
-            else:
-                write_speed = 50.0
-                
-            if read_time > 0:
-                read_speed = data_size_mb / read_time  # MB/s
-            else:
-                read_speed = 100.0
-            
-            # Розрахунок скору (0-100)
-            # Типові швидкості: HDD ~100MB/s, SSD ~500MB/s
-            avg_speed = (read_speed + write_speed) / 2
-            
-            if avg_speed >= 400:
-                score = 95
-            elif avg_speed >= 200:
-                score = 85
-            elif avg_speed >= 100:
-                score = 75
-            elif avg_speed >= 50:
-                score = 65
-            elif avg_speed >= 25:
-                score = 55
-            else:
-                score = 45
-            
-            return {
-                'disk_score': max(20, min(100, int(score))),
-                'read_speed': max(0, read_speed),
-                'write_speed': max(0, write_speed),
-                'read_time': read_time,
-                'write_time': write_time
-            }
-            
-        except Exception as e:
+            probe = quick_disk_probe()
+        except DiskBenchmarkError as e:
             print(f"Помилка тесту диска: {e}")
-            # Повертаємо реалістичні значення при помилці
-            return {
-                'disk_score': 60,
-                'read_speed': 85.5,
-                'write_speed': 75.2,
-                'read_time': 0.12,
-                'write_time': 0.15
-            }
\ No newline at end of file
+            return {'ok': False, 'error': str(e), 'disk_score': None}
+
+        write_speed = probe['write']['mbs']
+        read_speed = probe['read']['mbs']
+        # Розрахунок скору (0-100)
+        # Типові швидкості: HDD ~100MB/s, SSD ~500MB/s
+        if probe['cache_bypassed']:
+            avg_speed = (read_speed + write_speed) / 2
+        else:
+            # читання з кешу ОС (Windows) міряє пам'ять, а не диск — скор лише за записом
+            avg_speed = write_speed
+
+        if avg_speed >= 400:
+            score = 95
+        elif avg_speed >= 200:
+            score = 85
+        elif avg_speed >= 100:
+            score = 75
+        elif avg_speed >= 50:
+            score = 65
+        elif avg_speed >= 25:
+            score = 55
+        else:
+            score = 45
+
+        return {
+            'ok': True,
+            'disk_score': max(20, min(100, int(score))),
+            'read_speed': read_speed,
+            'write_speed': write_speed,
+            'read_time': probe['read']['seconds'],
+            'write_time': probe['write']['seconds'],
+            'cache_bypassed': probe['cache_bypassed']
+        }
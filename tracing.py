@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+"""
+Легкий трасувальник: спани в кільцевому буфері в пам'яті, гістограми затримок
+на кожну мітку (як HDR), асинхронний запис пачками у файл з ротацією.
+Вимкнений трасувальник майже нічого не коштує.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+
+# 16 лінійних під-кошиків на кожен степінь двійки — похибка перцентилів до ~3%
+# (половина ширини кошика відносно його нижньої межі: 1/32)
+SUB_BUCKET_BITS = 4
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+
+TRACE_FILE = "techcare_trace.log"
+
+
+class LatencyHistogram:
+    """Лог-лінійна гістограма затримок у наносекундах"""
+
+    __slots__ = ('counts', 'count', 'total', 'min', 'max')
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    @staticmethod
+    def bucket_of(value):
+        if value < 2 * SUB_BUCKETS:
+            return (0, int(value))
+        # зсув лишає SUB_BUCKET_BITS+1 старших бітів: sub у [SUB_BUCKETS, 2*SUB_BUCKETS)
+        exponent = value.bit_length() - SUB_BUCKET_BITS - 1
+        return (exponent, value >> exponent)
+
+    @staticmethod
+    def bucket_value(bucket):
+        """Середина кошика в наносекундах"""
+        exponent, sub = bucket
+        if exponent == 0:
+            return sub
+        return (sub << exponent) + (1 << (exponent - 1))
+
+    def record(self, value):
+        value = int(value)
+        key = self.bucket_of(value)
+        self.counts[key] = self.counts.get(key, 0) + 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, q):
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for key in sorted(self.counts):
+            seen += self.counts[key]
+            if seen >= rank:
+                return min(self.bucket_value(key), self.max)
+        return self.max
+
+    def merge(self, other):
+        for key, n in other.counts.items():
+            self.counts[key] = self.counts.get(key, 0) + n
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        self.max = max(self.max, other.max)
+
+    def summary(self):
+        ms = lambda v: round(v / 1e6, 4) if v is not None else None
+        return {
+            'count': self.count,
+            'mean_ms': ms(self.total / self.count) if self.count else None,
+            'p50_ms': ms(self.percentile(0.50)),
+            'p90_ms': ms(self.percentile(0.90)),
+            'p99_ms': ms(self.percentile(0.99)),
+            'max_ms': ms(self.max),
+        }
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class _Span:
+    __slots__ = ('tracer', 'label', 'start')
+
+    def __init__(self, tracer, label):
+        self.tracer = tracer
+        self.label = label
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.record(self.label, time.perf_counter_ns() - self.start)
+        return False
+
+
+class _RotatingWriter:
+    """Дописує рядки у файл; при перевищенні розміру зсуває file.1 … file.N"""
+
+    def __init__(self, path, max_bytes=1024 * 1024, backups=3):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+
+    def write_lines(self, lines):
+        data = "".join(lines)
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            size = 0
+        if size + len(data) > self.max_bytes:
+            self._rotate()
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(data)
+
+    def _rotate(self):
+        for i in range(self.backups - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        if os.path.exists(self.path):
+            os.replace(self.path, f"{self.path}.1")
+
+
+class Tracer:
+    """Потокобезпечний збирач спанів"""
+
+    def __init__(self, capacity=4096, path=TRACE_FILE, flush_interval=5.0, enabled=True):
+        self.enabled = False
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.recent = deque(maxlen=capacity)     # останні спани для діагностики
+        self._pending = deque(maxlen=capacity)   # ще не записані у файл
+        self.histograms = {}
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._writer = _RotatingWriter(path) if path else None
+        self._flusher = None
+        self._wake = threading.Event()
+        if enabled:
+            self.enable()
+
+    def enable(self):
+        self.enabled = True
+        if self._writer and (self._flusher is None or not self._flusher.is_alive()):
+            self._flusher = threading.Thread(target=self._flush_loop, name="trace-flush", daemon=True)
+            self._flusher.start()
+
+    def disable(self):
+        self.enabled = False
+
+    def span(self, label):
+        """with tracer.span("мітка"): ..."""
+        if not self.enabled:
+            return _NOOP_SPAN
+        return _Span(self, label)
+
+    def record(self, label, duration_ns):
+        entry = (time.time(), label, duration_ns, threading.get_ident())
+        with self._lock:
+            hist = self.histograms.get(label)
+            if hist is None:
+                hist = self.histograms[label] = LatencyHistogram()
+            hist.record(duration_ns)
+            self.recent.append(entry)
+            if len(self._pending) == self.capacity:
+                self.dropped += 1
+            self._pending.append(entry)
+
+    def stats(self):
+        """{мітка: підсумок гістограми}"""
+        with self._lock:
+            return {label: hist.summary() for label, hist in self.histograms.items()}
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self.recent.clear()
+
+    def flush(self):
+        """Записує накопичені спани у файл (викликається з фонового потоку і при виході)"""
+        if not self._writer:
+            return 0
+        with self._lock:
+            batch = list(self._pending)
+            self._pending.clear()
+        if not batch:
+            return 0
+        lines = [
+            f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(ts))} {thread} {label}: {dur / 1e9:.4f} секунд\n"
+            for ts, label, dur, thread in batch
+        ]
+        try:
+            self._writer.write_lines(lines)
+        except OSError as e:
+            print(f"Помилка запису трасування: {e}")
+        return len(batch)
+
+    def _flush_loop(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+
+# Глобальний трасувальник застосунку; TECHCARE_TRACE=0 вимикає його при запуску
+TRACER = Tracer(enabled=os.environ.get("TECHCARE_TRACE", "1") != "0")
+
+
+def measure_time(label, func):
+    """Виконує func у спані label і повертає її результат"""
+    if not TRACER.enabled:
+        return func()
+    start = time.perf_counter_ns()
+    try:
+        return func()
+    finally:
+        TRACER.record(label, time.perf_counter_ns() - start)
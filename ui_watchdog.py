@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""
+Сторож циклу подій Tk: серцебиття через root.after, затримка обробки подій,
+стек головного потоку під час зависань і рейтинг місць, що блокують вікно
+"""
+
+import os
+import sys
+import threading
+import time
+import traceback
+
+from tracing import TRACER, LatencyHistogram
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+# скільки різних місць зависання пам'ятаємо
+MAX_SITES = 50
+
+
+def _call_site(stack):
+    """Найглибший кадр з коду TechCare (а не з бібліотек) — місце, яке блокує цикл"""
+    for frame in reversed(stack):
+        if os.path.dirname(os.path.abspath(frame.filename)) == APP_DIR \
+                and os.path.basename(frame.filename) != "ui_watchdog.py":
+            return f"{os.path.basename(frame.filename)}:{frame.lineno} {frame.name}"
+    frame = stack[-1]
+    return f"{os.path.basename(frame.filename)}:{frame.lineno} {frame.name}"
+
+
+class UiWatchdog:
+    """Вимірює затримку циклу подій Tk і ловить стеки зависань
+
+    interval  — період серцебиття, секунди
+    threshold — затримка, після якої цикл вважається зависшим
+    visible   — функція без аргументів (напр. VisibilityManager.window_visible);
+                поки вікно сховане, серцебиття і перевірки йдуть раз на hidden_interval
+    """
+
+    def __init__(self, root, interval=0.1, threshold=0.25, check_interval=0.05,
+                 visible=None, hidden_interval=1.0):
+        self.root = root
+        self.interval = interval
+        self.threshold = threshold
+        self.check_interval = check_interval
+        self.visible = visible
+        self.hidden_interval = hidden_interval
+        self._hidden = False
+        self.lag = LatencyHistogram()
+        self.stalls = 0
+        self.sites = {}
+        self.running = False
+        self._lock = threading.Lock()
+        self._main_ident = threading.main_thread().ident
+        self._expected = None
+        self._last_beat = None
+        self._stall_start = None
+        self._stall_sites = set()
+        self._thread = None
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self._main_ident = threading.get_ident()  # викликається з потоку Tk
+        self._last_beat = time.perf_counter()
+        interval = self._beat_interval()
+        self._expected = self._last_beat + interval
+        self.root.after(int(interval * 1000), self._beat)
+        self._thread = threading.Thread(target=self._watch, name="ui-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self.running = False
+
+    # ---------- головний потік ----------
+    def _beat_interval(self):
+        """Період наступного серцебиття: у треї чи згорнутому вікні — рідше"""
+        if self.visible is not None:
+            try:
+                self._hidden = not self.visible()
+            except Exception:
+                self._hidden = False
+        return self.hidden_interval if self._hidden else self.interval
+
+    def _beat(self):
+        now = time.perf_counter()
+        lag_ns = max(0, int((now - self._expected) * 1e9))
+        with self._lock:
+            self.lag.record(lag_ns)
+            self._last_beat = now
+            self._finish_stall(now)
+        if lag_ns >= self.threshold * 1e9:
+            TRACER.record("UI stall", lag_ns)
+        if self.running:
+            interval = self._beat_interval()
+            self._expected = now + interval
+            self.root.after(int(interval * 1000), self._beat)
+
+    # ---------- сторожовий потік ----------
+    def _watch(self):
+        while self.running:
+            time.sleep(self.hidden_interval / 2 if self._hidden else self.check_interval)
+            now = time.perf_counter()
+            with self._lock:
+                overdue = now - self._expected
+                if overdue < self.threshold:
+                    continue
+                if self._stall_start is None:
+                    # перший замір зависання отримує весь час від очікуваного серцебиття
+                    self._stall_start = self._expected
+                    self.stalls += 1
+                    weight = overdue
+                else:
+                    weight = self.check_interval
+            frame = sys._current_frames().get(self._main_ident)
+            if frame is None:
+                continue
+            stack = traceback.extract_stack(frame)
+            del frame
+            with self._lock:
+                if self._stall_start is not None:
+                    self._sample(stack, weight)
+
+    def _sample(self, stack, weight):
+        """Зараховує час зависання місцю виклику (під self._lock)"""
+        site = _call_site(stack)
+        entry = self.sites.get(site)
+        if entry is None:
+            if len(self.sites) >= MAX_SITES:
+                # витісняємо найменш значуще місце
+                weakest = min(self.sites, key=lambda k: self.sites[k]['stalled_s'])
+                del self.sites[weakest]
+            entry = self.sites[site] = {
+                'stalls': 0,
+                'stalled_s': 0.0,
+                'worst_s': 0.0,
+                'stack': traceback.format_list(stack[-12:]),
+            }
+        entry['stalled_s'] += weight
+        if site not in self._stall_sites:
+            entry['stalls'] += 1
+            self._stall_sites.add(site)
+
+    def _finish_stall(self, now):
+        if self._stall_start is None:
+            return
+        duration = now - self._stall_start
+        for site in self._stall_sites:
+            entry = self.sites.get(site)
+            if entry:
+                entry['worst_s'] = max(entry['worst_s'], duration)
+        self._stall_start = None
+        self._stall_sites = set()
+
+    # ---------- звіт ----------
+    def report(self, top=10):
+        """Гістограма затримки циклу і найгірші місця виклику"""
+        with self._lock:
+            sites = sorted(self.sites.items(), key=lambda kv: kv[1]['stalled_s'], reverse=True)[:top]
+            return {
+                'lag': self.lag.summary(),
+                'stalls': self.stalls,
+                'threshold_ms': round(self.threshold * 1000),
+                'top_sites': [
+                    {
+                        'site': site,
+                        'stalls': e['stalls'],
+                        'stalled_s': round(e['stalled_s'], 2),
+                        'worst_s': round(e['worst_s'], 2),
+                        'stack': list(e['stack']),
+                    }
+                    for site, e in sites
+                ],
+            }
+
+    def reset(self):
+        with self._lock:
+            self.lag = LatencyHistogram()
+            self.stalls = 0
+            self.sites.clear()
@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+"""Версія TechCare (записується разом з результатами бенчмарків)"""
+
+__version__ = "2025.1"
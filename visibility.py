@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+Облік видимості частин інтерфейсу: вибрана вкладка, згорнуте вікно, режим трею.
+Кожен вид оголошує вартість оновлення, і періодичні оновлення
+невидимих видів призупиняються або рідшають. Фоновий збір і сповіщення
+в main.py працюють за власним розкладом і сюди не входять
+"""
+
+import time
+import tkinter as tk
+
+# вартість оновлення виду
+COST_LOW = "low"         # дешево: оновлюється завжди з базовим інтервалом
+COST_MEDIUM = "medium"   # прихований — оновлюється у HIDDEN_SLOWDOWN разів рідше
+COST_HIGH = "high"       # прихований — не оновлюється; при показі оновлюється одразу, якщо дані застаріли
+
+HIDDEN_SLOWDOWN = 5
+
+
+class _View:
+    __slots__ = ('name', 'tab', 'cost', 'on_show', 'on_hide', 'visible',
+                 'callback', 'interval_ms', 'after_id', 'last_run')
+
+    def __init__(self, name, tab, cost, on_show, on_hide):
+        self.name = name
+        self.tab = tab
+        self.cost = cost
+        self.on_show = on_show
+        self.on_hide = on_hide
+        self.visible = False
+        self.callback = None
+        self.interval_ms = None
+        self.after_id = None
+        self.last_run = None
+
+
+class VisibilityManager:
+    """Стежить за <<NotebookTabChanged>>, <Map>/<Unmap> кореневого вікна і станом трею"""
+
+    def __init__(self, root, notebook=None):
+        self.root = root
+        self.notebook = notebook
+        self.in_tray = False
+        self._views = {}
+        root.bind("<Map>", self._on_window_event, add="+")
+        root.bind("<Unmap>", self._on_window_event, add="+")
+        if notebook is not None:
+            notebook.bind("<<NotebookTabChanged>>", lambda event: self.refresh(), add="+")
+
+    # ---------- реєстрація ----------
+    def register(self, name, tab=None, cost=COST_LOW, on_show=None, on_hide=None):
+        """Вид name; tab — фрейм вкладки notebook (None — видимий разом із вікном)"""
+        view = _View(name, tab, cost, on_show, on_hide)
+        view.visible = self._compute(view)
+        self._views[name] = view
+        return view
+
+    def every(self, name, interval_ms, callback):
+        """Періодично викликає callback() для виду name з урахуванням його видимості"""
+        view = self._views[name]
+        view.callback = callback
+        view.interval_ms = interval_ms
+        self._cancel(view)
+        self._schedule(view, self._interval(view))
+
+    # ---------- стан ----------
+    @property
+    def window_visible(self):
+        if self.in_tray:
+            return False
+        try:
+            return self.root.winfo_viewable() and self.root.state() not in ("iconic", "withdrawn")
+        except tk.TclError:
+            return False
+
+    def is_visible(self, name):
+        view = self._views.get(name)
+        return view.visible if view else self.window_visible
+
+    def set_tray(self, in_tray):
+        """Вікно сховане в трей (True) або повернуте (False)"""
+        self.in_tray = in_tray
+        self.refresh()
+
+    def _compute(self, view):
+        if not self.window_visible:
+            return False
+        if view.tab is None or self.notebook is None:
+            return True
+        try:
+            return self.notebook.select() == str(view.tab)
+        except tk.TclError:
+            return False
+
+    def _on_window_event(self, event):
+        if event.widget is self.root:
+            self.refresh()
+
+    def refresh(self):
+        """Перераховує видимість усіх видів і повідомляє ті, що змінилися"""
+        for view in self._views.values():
+            visible = self._compute(view)
+            if visible == view.visible:
+                continue
+            view.visible = visible
+            handler = view.on_show if visible else view.on_hide
+            if handler:
+                handler()
+            if view.callback is None:
+                continue
+            if visible:
+                stale = view.last_run is None or \
+                    (time.monotonic() - view.last_run) * 1000 >= view.interval_ms
+                self._cancel(view)
+                if stale:
+                    self._run(view)
+                else:
+                    self._schedule(view, view.interval_ms)
+            elif view.cost != COST_LOW:
+                # прихований вид переходить на рідший розклад (або зупиняється)
+                self._cancel(view)
+                self._schedule(view, self._interval(view))
+
+    # ---------- розклад ----------
+    def _interval(self, view):
+        if view.visible or view.cost == COST_LOW:
+            return view.interval_ms
+        if view.cost == COST_MEDIUM:
+            return view.interval_ms * HIDDEN_SLOWDOWN
+        return None
+
+    def _schedule(self, view, delay_ms):
+        if delay_ms is not None:
+            view.after_id = self.root.after(delay_ms, self._run, view)
+
+    def _cancel(self, view):
+        if view.after_id is not None:
+            try:
+                self.root.after_cancel(view.after_id)
+            except tk.TclError:
+                pass
+            view.after_id = None
+
+    def _run(self, view):
+        view.after_id = None
+        interval = self._interval(view)
+        if interval is None:
+            return
+        view.last_run = time.monotonic()
+        try:
+            view.callback()
+        except Exception as e:
+            print(f"Помилка оновлення {view.name}: {e}")
+        self._schedule(view, interval)
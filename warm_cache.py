@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+Кеш теплого старту: останні метрики, індекс здоров'я, прогнози і склад ПК
+у маленькому бінарному файлі. При запуску читається одним read() і
+показується одразу (як застарілі дані), доки не прийде перший живий знімок
+"""
+
+import json
+import os
+import struct
+import sys
+import time
+import zlib
+
+from self_monitor import COUNTERS
+
+WARM_CACHE_FILE = "techcare_warm.bin"
+WARM_CACHE_VERSION = 1
+# як часто фоновий збирач оновлює кеш, секунди
+WARM_SAVE_INTERVAL = 60
+
+_MAGIC = b"TCWC"
+# магія, версія, резерв, довжина даних, crc32 даних
+_HEADER = struct.Struct("<4sHHII")
+
+# які поля знімка потрапляють у кеш
+METRIC_KEYS = ('cpu_percent', 'ram_percent', 'disk_percent', 'gpu_load',
+               'window_count', 'uptime_hours', 'uptime_minutes', 'uptime_str')
+MAX_MESSAGES = 5
+
+
+def build_state(data, health=None, hardware=None):
+    """Компактний стан для кешу зі знімка, прогнозу та складу ПК"""
+    state = {
+        'saved_at': time.time(),
+        'metrics': {key: data[key] for key in METRIC_KEYS if data.get(key) is not None},
+    }
+    if health and health.get('health_score') is not None:
+        state['health'] = {
+            'health_score': health['health_score'],
+            'warnings': list(health.get('warnings', []))[:MAX_MESSAGES],
+            'predictions': list(health.get('predictions', []))[:MAX_MESSAGES],
+        }
+    if hardware:
+        state['hardware'] = [list(item) for item in hardware]
+    return state
+
+
+class WarmCache:
+    """Читання/запис файлу кешу; будь-яка невідповідність — просто немає кешу"""
+
+    def __init__(self, path=WARM_CACHE_FILE):
+        self.path = path
+        self.last_saved = 0.0
+
+    def save(self, state):
+        payload = json.dumps(state, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        blob = _HEADER.pack(_MAGIC, WARM_CACHE_VERSION, 0, len(payload), zlib.crc32(payload)) + payload
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(blob)
+            os.replace(tmp, self.path)  # атомарно: читач не побачить половину файлу
+        except OSError as e:
+            print(f"Не вдалося зберегти кеш теплого старту: {e}")
+            return False
+        self.last_saved = time.time()
+        COUNTERS.add('warm_cache_saves')
+        COUNTERS.add('json_bytes_written', len(blob))
+        return True
+
+    def save_if_due(self, state_factory, interval=WARM_SAVE_INTERVAL):
+        """Зберігає state_factory(), якщо з попереднього запису минуло interval секунд"""
+        if time.time() - self.last_saved < interval:
+            return False
+        return self.save(state_factory())
+
+    def load(self):
+        """Стан з файлу або None (немає файлу, інша версія, пошкоджені дані)"""
+        try:
+            with open(self.path, "rb") as f:
+                blob = f.read()
+        except OSError:
+            return None
+        if len(blob) < _HEADER.size:
+            return None
+        magic, version, _, length, crc = _HEADER.unpack_from(blob)
+        if magic != _MAGIC or version != WARM_CACHE_VERSION:
+            return None
+        payload = blob[_HEADER.size:_HEADER.size + length]
+        if len(payload) != length or zlib.crc32(payload) != crc:
+            return None
+        try:
+            return json.loads(payload)
+        except ValueError:
+            return None
+
+
+def format_age(saved_at, now=None):
+    """Скільки часу тому збережено стан, коротко"""
+    seconds = max(0, (now or time.time()) - saved_at)
+    if seconds < 90:
+        return f"{int(seconds)} с тому"
+    if seconds < 5400:
+        return f"{int(seconds / 60)} хв тому"
+    if seconds < 2 * 86400:
+        return f"{int(seconds / 3600)} год тому"
+    return f"{int(seconds / 86400)} дн тому"
+
+
+def run_benchmark():
+    """Час читання і запису кешу (мкс) на типовому стані"""
+    import tempfile
+    from benchmark import BenchmarkRunner
+
+    data = {'cpu_percent': 23.5, 'ram_percent': 61.2, 'disk_percent': 74.9, 'gpu_load': 12.0,
+            'window_count': 14, 'uptime_hours': 5, 'uptime_minutes': 42, 'uptime_str': "5 год 42 хв"}
+    health = {'health_score': 82,
+              'warnings': ["Диск заповнений на 75%"],
+              'predictions': ["Диск заповниться приблизно через 41 день", "Навантаження CPU стабільне"]}
+    hardware = [("Процесор", "Intel64 Family 6 Model 154"), ("Система", "Windows 11"),
+                ("Архітектура", "AMD64"), ("Відеокарта", "NVIDIA GeForce RTX 3060"),
+                ("ОЗП", "31.7 GB"), ("Ім'я ПК", "DESKTOP-TECHCARE")]
+    runner = BenchmarkRunner(warmup=20, min_reps=200, max_reps=5000, max_seconds=2.0, target_rel_ci=0.02)
+    with tempfile.TemporaryDirectory(prefix="techcare_warm_") as workdir:
+        cache = WarmCache(os.path.join(workdir, WARM_CACHE_FILE))
+        state = build_state(data, health, hardware)
+        cache.save(state)
+        size = os.path.getsize(cache.path)
+        load = runner.run("load", cache.load)['stats']
+        save = runner.run("save", lambda: cache.save(state))['stats']
+        assert cache.load() == state
+    return {
+        'file_bytes': size,
+        'load_p50_us': round(load['median'] / 1000, 1),
+        'save_p50_us': round(save['median'] / 1000, 1),
+    }
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Кеш теплого старту TechCare")
+    parser.add_argument("--bench", action="store_true", help="виміряти читання/запис кешу")
+    parser.add_argument("--show", action="store_true", help="показати вміст кешу")
+    parser.add_argument("--path", default=WARM_CACHE_FILE)
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        print(json.dumps(run_benchmark(), ensure_ascii=False, indent=2))
+        return 0
+    state = WarmCache(args.path).load()
+    if state is None:
+        print(f"Кешу немає або він недійсний: {args.path}")
+        return 1
+    if args.show:
+        print(json.dumps(state, ensure_ascii=False, indent=2))
+    else:
+        print(f"Кеш {args.path}: збережено {format_age(state['saved_at'])}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())